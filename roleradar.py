@@ -4,7 +4,8 @@
 import argparse
 import sys
 from src.roleradar.database import db_service
-from src.roleradar.services import TavilySearchService, ProcessingService
+from src.roleradar.services import ProcessingService, SearchProcessPipeline
+from src.roleradar.services.simulation import API_MODES, create_services
 from src.roleradar.dashboard import create_app
 from src.roleradar.config import config
 
@@ -16,22 +17,32 @@ def init_database():
     print("Database initialized successfully!")
 
 
-def run_search():
+def run_search(pipeline=False):
     """Run daily search for opportunities."""
     print("Running daily search...")
+    db_service.create_tables()
+    tavily, groq = create_services()
+    
+    if pipeline or config.PIPELINE_MODE:
+        try:
+            processor = ProcessingService(tavily=tavily, groq=groq)
+            SearchProcessPipeline(processor=processor).run(backlog_limit=100)
+        except Exception as e:
+            print(f"Error during search: {e}")
+            sys.exit(1)
+        return
     
     try:
-        tavily = TavilySearchService()
         results = tavily.daily_search()
         
         total_results = sum(len(r) for r in results.values())
-        print(f"\nSearch completed! Found {total_results} results across {len(results)} queries.")
+        print(f"\nSearch completed! Found {total_results} new results across {len(results)} queries.")
         
         for query, query_results in results.items():
-            print(f"  - {query}: {len(query_results)} results")
+            print(f"  - {query}: {len(query_results)} new results")
         
         print("\nProcessing results...")
-        processor = ProcessingService()
+        processor = ProcessingService(tavily=tavily, groq=groq)
         processor.process_unprocessed_results(limit=100)
         print("Processing completed!")
         
@@ -40,22 +51,76 @@ def run_search():
         sys.exit(1)
 
 
-def run_processing():
+def run_processing(workers=None):
     """Process unprocessed search results."""
     print("Processing unprocessed results...")
+    db_service.create_tables()
+    tavily, groq = create_services()
     
     try:
-        processor = ProcessingService()
-        processor.process_unprocessed_results(limit=100)
+        processor = ProcessingService(tavily=tavily, groq=groq)
+        processor.process_unprocessed_results(limit=100, workers=workers)
         print("Processing completed!")
     except Exception as e:
         print(f"Error during processing: {e}")
         sys.exit(1)
 
 
+def run_summarize(force=False):
+    """Regenerate the dashboard's executive summary."""
+    db_service.create_tables()
+    tavily, groq = create_services()
+    processor = ProcessingService(tavily=tavily, groq=groq)
+    stored = processor.refresh_summary(force=force)
+    processor.groq.save_call_log()
+    
+    if not stored["regenerated"]:
+        print(f"Executive summary is current (data version {stored['data_version'][:12]}, "
+              f"generated {stored['generated_at']}). Use --force to regenerate.")
+    print(f"\n{stored['summary']}")
+
+
+def run_rescore(all_companies=False):
+    """Recompute company scores."""
+    from datetime import datetime, timedelta, timezone
+    
+    db_service.create_tables()
+    tavily, groq = create_services()
+    processor = ProcessingService(tavily=tavily, groq=groq)
+    if all_companies:
+        print("Rescoring all companies...")
+        rescored = processor.rescore_companies()
+    else:
+        print("Rescoring companies not scored in the last day...")
+        rescored = processor.rescore_companies(updated_before=datetime.now(timezone.utc) - timedelta(days=1))
+    print(f"Rescored {rescored} companies")
+    if rescored:
+        processor.refresh_summary()
+        processor.groq.save_call_log()
+
+
+def run_compact():
+    """Compress stored page text and report the database size."""
+    print("Compressing stored text columns...")
+    db_service.create_tables()
+    report = db_service.compact_text_columns()
+    
+    for column, count in report["rewritten"].items():
+        print(f"  {column}: {count} rows compressed")
+    
+    before, after = report["size_before"], report["size_after"]
+    if before < 0:
+        print("Database size reporting is not supported for this backend.")
+        return
+    saved = (1 - after / before) * 100 if before else 0.0
+    print(f"\nDatabase size: {before / 1024 / 1024:.2f} MB -> {after / 1024 / 1024:.2f} MB "
+          f"({saved:.1f}% smaller)")
+
+
 def run_dashboard():
     """Run the web dashboard."""
     print(f"Starting dashboard on http://{config.FLASK_HOST}:{config.FLASK_PORT}")
+    db_service.create_tables()
     app = create_app()
     app.run(
         host=config.FLASK_HOST,
@@ -66,9 +131,10 @@ def run_dashboard():
 
 def show_stats():
     """Show statistics about the database."""
-    from src.roleradar.models import Company, Opportunity, HiringSignal
+    from src.roleradar.models import Company, Opportunity, HiringSignal, SearchResult
     
     print("\n=== RoleRadar Statistics ===\n")
+    db_service.create_tables()
     
     with db_service.get_session() as session:
         total_companies = session.query(Company).count()
@@ -79,6 +145,10 @@ def show_stats():
         print(f"Active opportunities: {total_opps}")
         print(f"Hiring signals: {total_signals}")
         
+        skipped = session.query(SearchResult).filter_by(skip_reason="irrelevant").count()
+        total_results = session.query(SearchResult).count()
+        print(f"Search results skipped as irrelevant: {skipped} of {total_results}")
+        
         if total_companies > 0:
             print("\nTop 5 Companies by Score:")
             top_companies = session.query(Company).order_by(
@@ -87,6 +157,58 @@ def show_stats():
             
             for i, company in enumerate(top_companies, 1):
                 print(f"  {i}. {company.name}: {company.score:.1f}")
+    
+    show_llm_usage()
+    show_cache_stats()
+
+
+def show_llm_usage(days=30):
+    """Show persisted LLM call statistics."""
+    from src.roleradar.services.llm_metrics import usage_report
+    
+    try:
+        usage = usage_report(days=days)
+    except Exception as e:
+        print(f"\nLLM usage unavailable: {e}")
+        return
+    totals = usage["totals"]
+    if not totals["calls"]:
+        return
+    
+    print(f"\nLLM calls (last {days} days):")
+    print(f"  Calls: {totals['calls']} ({totals['retries']} retries, {totals['failed']} failed, "
+          f"{totals['parse_errors']} parse errors)")
+    print(f"  Tokens: {totals['prompt_tokens']} sent, {totals['completion_tokens']} received")
+    print(f"  Estimated cost: ${totals['cost_usd']:.4f}")
+    for row in usage["by_method"]:
+        print(f"  {row['method']} ({row['model']}): {row['calls']} calls, "
+              f"{row['average_latency']:.2f}s average latency, ${row['cost_usd']:.4f}")
+    
+    latest = usage["recent_runs"][0]
+    print(f"  Latest run {latest['run_id']} ({latest['started_at'][:19]}): {latest['calls']} calls, "
+          f"${latest['cost_usd']:.4f}")
+
+
+def show_cache_stats():
+    """Show response cache statistics."""
+    from src.roleradar.services.cache import DiskCache
+    
+    caches = [
+        ("Search cache", "tavily", config.SEARCH_CACHE_TTL, config.SEARCH_CACHE_MAX_ENTRIES),
+        ("LLM cache", "llm", config.LLM_CACHE_TTL, config.LLM_CACHE_MAX_ENTRIES),
+    ]
+    for label, namespace, ttl, max_entries in caches:
+        cache = DiskCache(config.CACHE_PATH, namespace=namespace, ttl_seconds=ttl, max_entries=max_entries)
+        if not cache.enabled:
+            continue
+        
+        stats = cache.stats()
+        total = stats["total"]
+        print(f"\n{label}:")
+        print(f"  Entries: {stats['entries']}")
+        print(f"  Hits: {total['hits']}  Misses: {total['misses']}  "
+              f"Hit rate: {total['hit_rate']:.0%}")
+        print(f"  API time saved: ~{total['saved_seconds']:.1f}s")
 
 
 def main():
@@ -95,16 +217,61 @@ def main():
         description="RoleRadar - Security & Compliance Opportunity Tracker"
     )
     
+    parser.add_argument(
+        '--api-mode',
+        choices=API_MODES,
+        help='Use live APIs, record them, replay recordings, or synthesize responses offline'
+    )
+    parser.add_argument(
+        '--recordings',
+        help='Directory for recorded API exchanges (default: API_RECORDINGS_DIR)'
+    )
+    parser.add_argument(
+        '--backend',
+        choices=['groq', 'local'],
+        help='Analyze with Groq or with the offline rule-based extractor (default: ANALYSIS_BACKEND)'
+    )
+    
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Init command
     subparsers.add_parser('init', help='Initialize database')
     
     # Search command
-    subparsers.add_parser('search', help='Run daily search for opportunities')
+    search_parser = subparsers.add_parser('search', help='Run daily search for opportunities')
+    search_parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Stream results into processing while searches are still running'
+    )
     
     # Process command
-    subparsers.add_parser('process', help='Process unprocessed search results')
+    process_parser = subparsers.add_parser('process', help='Process unprocessed search results')
+    process_parser.add_argument(
+        '--workers',
+        type=int,
+        help='Worker threads analyzing and storing results (default: PROCESS_WORKERS)'
+    )
+    
+    # Summarize command
+    summarize_parser = subparsers.add_parser('summarize', help='Regenerate the dashboard executive summary')
+    summarize_parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Regenerate even if the top companies have not changed'
+    )
+    
+    # Rescore command
+    rescore_parser = subparsers.add_parser('rescore', help='Recompute company scores')
+    rescore_parser.add_argument(
+        '--all',
+        action='store_true',
+        dest='all_companies',
+        help='Rescore every company (default: only companies not scored in the last day)'
+    )
+    
+    # Compact command
+    subparsers.add_parser('compact', help='Compress stored page text and report database size')
     
     # Dashboard command
     subparsers.add_parser('dashboard', help='Run web dashboard')
@@ -118,12 +285,25 @@ def main():
         parser.print_help()
         sys.exit(1)
     
+    if args.api_mode:
+        config.API_MODE = args.api_mode
+    if args.recordings:
+        config.API_RECORDINGS_DIR = args.recordings
+    if args.backend:
+        config.ANALYSIS_BACKEND = args.backend
+    
     if args.command == 'init':
         init_database()
     elif args.command == 'search':
-        run_search()
+        run_search(pipeline=args.pipeline)
     elif args.command == 'process':
-        run_processing()
+        run_processing(workers=args.workers)
+    elif args.command == 'summarize':
+        run_summarize(force=args.force)
+    elif args.command == 'rescore':
+        run_rescore(all_companies=args.all_companies)
+    elif args.command == 'compact':
+        run_compact()
     elif args.command == 'dashboard':
         run_dashboard()
     elif args.command == 'stats':
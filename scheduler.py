@@ -4,7 +4,8 @@
 import schedule
 import time
 from datetime import datetime
-from src.roleradar.services import TavilySearchService, ProcessingService
+from src.roleradar.services import ProcessingService, SearchProcessPipeline
+from src.roleradar.services.simulation import create_services
 from src.roleradar.database import db_service
 from src.roleradar.config import config
 
@@ -19,18 +20,25 @@ def run_daily_job():
     try:
         # Initialize database if needed
         db_service.create_tables()
+        tavily, groq = create_services()
+        
+        if config.PIPELINE_MODE:
+            print("Running searches and processing as a pipeline...")
+            processor = ProcessingService(tavily=tavily, groq=groq)
+            SearchProcessPipeline(processor=processor).run(backlog_limit=100)
+            print("\nSearch job completed successfully!")
+            return
         
         # Run search
         print("Running searches...")
-        tavily = TavilySearchService()
         results = tavily.daily_search()
         
         total_results = sum(len(r) for r in results.values())
-        print(f"Found {total_results} results across {len(results)} queries")
+        print(f"Found {total_results} new results across {len(results)} queries")
         
         # Process results
         print("\nProcessing results...")
-        processor = ProcessingService()
+        processor = ProcessingService(tavily=tavily, groq=groq)
         processor.process_unprocessed_results(limit=100)
         
         print("\nSearch job completed successfully!")
@@ -79,6 +79,9 @@ class Config:
             "company_growth": 0.2,
             "recent_activity": 0.1,
         })
+        
+        # Performance tuning
+        self._load_tuning(self._get_store_value)
     
     def _load_from_env(self):
         """Load configuration from environment variables (legacy/fallback)."""
@@ -126,6 +129,122 @@ class Config:
             "company_growth": 0.2,
             "recent_activity": 0.1,
         }
+        
+        # Performance tuning
+        self._load_tuning(self._get_env_value)
+    
+    def _get_env_value(self, key: str, default):
+        """Read an environment variable, coerced to the type of the default."""
+        return self._coerce(os.getenv(key), default)
+    
+    def _get_store_value(self, key: str, default):
+        """Read a secure store value, coerced to the type of the default."""
+        return self._coerce(self._secure_store.get(key), default)
+    
+    @staticmethod
+    def _coerce(raw, default):
+        """
+        Convert a configured value to the type of its default.
+        
+        Strings are parsed ("false", "0", "no" and "off" are False for
+        boolean settings); missing, empty or unparseable values give the
+        default.
+        """
+        if raw is None or raw == "":
+            return default
+        try:
+            if isinstance(default, bool):
+                if isinstance(raw, str):
+                    return raw.strip().lower() in ("1", "true", "yes", "on")
+                return bool(raw)
+            if isinstance(default, int):
+                return int(raw)
+            if isinstance(default, float):
+                return float(raw)
+            if isinstance(default, (list, dict)) and isinstance(raw, str):
+                return json.loads(raw)
+        except (TypeError, ValueError, json.JSONDecodeError):
+            return default
+        return raw
+    
+    def _load_tuning(self, get):
+        """
+        Load performance tuning settings.
+        
+        Args:
+            get: Callable taking (key, default) and returning the configured
+                value converted to the type of the default
+        """
+        # Search concurrency and rate limiting
+        self.SEARCH_CONCURRENCY = get("SEARCH_CONCURRENCY", 4)
+        self.SEARCH_RATE_LIMIT = get("SEARCH_RATE_LIMIT", 2.0)  # requests per second
+        self.SEARCH_RATE_BURST = get("SEARCH_RATE_BURST", 4)
+        
+        # Adaptive query planner (budget 0 = no cap on queries per run)
+        self.QUERY_PLANNER = get("QUERY_PLANNER", True)
+        self.QUERY_BUDGET = get("QUERY_BUDGET", 0)
+        self.QUERY_EXPLORATION_RATE = get("QUERY_EXPLORATION_RATE", 0.2)
+        self.QUERY_LOW_YIELD_THRESHOLD = get("QUERY_LOW_YIELD_THRESHOLD", 0.5)
+        self.QUERY_MIN_RUNS = get("QUERY_MIN_RUNS", 3)
+        
+        # Streaming search -> process pipeline
+        self.PIPELINE_MODE = get("PIPELINE_MODE", False)
+        self.PIPELINE_WORKERS = get("PIPELINE_WORKERS", 4)
+        self.PIPELINE_QUEUE_SIZE = get("PIPELINE_QUEUE_SIZE", 100)
+        
+        # Worker threads for 'process' (they share GROQ_MAX_IN_FLIGHT)
+        self.PROCESS_WORKERS = get("PROCESS_WORKERS", 1)
+        self.PROCESS_COMMIT_SIZE = get("PROCESS_COMMIT_SIZE", 50)  # results per transaction
+        self.PROCESS_LEASE_SECONDS = get("PROCESS_LEASE_SECONDS", 900)  # claim expiry for crashed processors
+        
+        # Batched LLM analysis (documents per call, estimated prompt tokens per call)
+        self.LLM_BATCH_SIZE = get("LLM_BATCH_SIZE", 8)
+        self.LLM_BATCH_TOKEN_BUDGET = get("LLM_BATCH_TOKEN_BUDGET", 6000)
+        self.LLM_INPUT_TOKEN_BUDGET = get("LLM_INPUT_TOKEN_BUDGET", 1500)  # per document, 0 = no limit
+        
+        # Keyword relevance pre-filter (results scoring below the threshold skip the LLM)
+        self.RELEVANCE_FILTER = get("RELEVANCE_FILTER", True)
+        self.RELEVANCE_THRESHOLD = get("RELEVANCE_THRESHOLD", 2.0)
+        
+        # Analysis backend: "groq" (LLM) or "local" (rule-based, for bulk backfills)
+        self.ANALYSIS_BACKEND = get("ANALYSIS_BACKEND", "groq")
+        self.COMPANY_GAZETTEER_PATH = get("COMPANY_GAZETTEER_PATH", "")  # one company name per line
+        
+        # Groq models: with MODEL_CASCADE the fast model analyzes first and the
+        # large one only redoes invalid, company-less or low-confidence answers
+        self.GROQ_MODEL = get("GROQ_MODEL", "llama-3.1-70b-versatile")
+        self.GROQ_FAST_MODEL = get("GROQ_FAST_MODEL", "llama-3.1-8b-instant")
+        self.MODEL_CASCADE = get("MODEL_CASCADE", False)
+        self.CASCADE_CONFIDENCE_THRESHOLD = get("CASCADE_CONFIDENCE_THRESHOLD", 0.6)
+        
+        # Groq admission control (match your account's limits; 0 disables) and retries
+        self.GROQ_RPM = get("GROQ_RPM", 30)
+        self.GROQ_TPM = get("GROQ_TPM", 30000)
+        self.GROQ_MAX_IN_FLIGHT = get("GROQ_MAX_IN_FLIGHT", 4)
+        self.GROQ_MAX_RETRIES = get("GROQ_MAX_RETRIES", 5)
+        self.GROQ_RETRY_BASE_DELAY = get("GROQ_RETRY_BASE_DELAY", 1.0)  # seconds
+        self.GROQ_RETRY_MAX_DELAY = get("GROQ_RETRY_MAX_DELAY", 60.0)  # seconds
+        
+        # API mode: live, record, replay or synthetic (offline benchmarking)
+        self.API_MODE = get("API_MODE", "live")
+        self.API_RECORDINGS_DIR = get("API_RECORDINGS_DIR", "recordings")
+        self.SIM_LATENCY = get("SIM_LATENCY", 0.0)
+        self.SIM_ERROR_RATE = get("SIM_ERROR_RATE", 0.0)
+        self.SIM_RATE_LIMIT_RPM = get("SIM_RATE_LIMIT_RPM", 0)
+        
+        # Local response caches (TTL in seconds; 0 disables)
+        self.CACHE_PATH = get("CACHE_PATH", str(Path.home() / ".roleradar" / "cache.db"))
+        self.SEARCH_CACHE_TTL = get("SEARCH_CACHE_TTL", 3600)
+        self.SEARCH_CACHE_MAX_ENTRIES = get("SEARCH_CACHE_MAX_ENTRIES", 5000)
+        self.LLM_CACHE_TTL = get("LLM_CACHE_TTL", 30 * 24 * 3600)
+        self.LLM_CACHE_MAX_ENTRIES = get("LLM_CACHE_MAX_ENTRIES", 50000)
+        
+        # Incremental search: drop results at or below each query's watermark
+        self.INCREMENTAL_SEARCH = get("INCREMENTAL_SEARCH", True)
+        self.WATERMARK_RECENT_URLS = get("WATERMARK_RECENT_URLS", 500)
+        
+        # Near-duplicate detection (max differing SimHash bits; above 3 is best-effort)
+        self.DEDUP_MAX_DISTANCE = get("DEDUP_MAX_DISTANCE", 3)
     
     def _get_default_roles(self):
         """Get default search roles."""
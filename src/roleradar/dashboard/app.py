@@ -6,6 +6,33 @@ from ..database import db_service
 from ..config import config
 
 
+class InvalidParameter(ValueError):
+    """A query parameter has an invalid value."""
+
+
+def _int_arg(name: str, default: int, allow_all: bool = False):
+    """
+    Read a non-negative integer query parameter.
+    
+    Args:
+        name: Parameter name
+        default: Value when the parameter is missing
+        allow_all: Accept "all" (returned as None)
+        
+    Raises:
+        InvalidParameter: If the value is not a non-negative integer
+    """
+    raw = request.args.get(name)
+    if raw is None or raw == '':
+        return default
+    if allow_all and raw == 'all':
+        return None
+    if not raw.isdigit():
+        expected = 'a non-negative integer or "all"' if allow_all else 'a non-negative integer'
+        raise InvalidParameter(f"'{name}' must be {expected}, got {raw!r}")
+    return int(raw)
+
+
 def create_app():
     """Create Flask application."""
     app = Flask(__name__)
@@ -16,6 +43,11 @@ def create_app():
     
     processing_service = ProcessingService()
     
+    @app.errorhandler(InvalidParameter)
+    def invalid_parameter(error):
+        """Answer bad query parameters with a 400 and the reason."""
+        return jsonify({"error": str(error)}), 400
+    
     @app.route('/')
     def index():
         """Dashboard home page."""
@@ -30,17 +62,41 @@ def create_app():
     @app.route('/api/companies')
     def get_companies():
         """Get top companies."""
-        limit = int(request.args.get('limit', 20))
+        limit = _int_arg('limit', 20)
         companies = processing_service.get_top_companies(limit=limit)
         return jsonify(companies)
     
     @app.route('/api/opportunities')
     def get_opportunities():
         """Get active opportunities."""
-        limit = int(request.args.get('limit', 50))
+        limit = _int_arg('limit', 50)
         opportunities = processing_service.get_active_opportunities(limit=limit)
         return jsonify(opportunities)
     
+    @app.route('/api/llm-usage')
+    def get_llm_usage():
+        """Get LLM call counts, latency, tokens, failures and cost."""
+        days = _int_arg('days', 30, allow_all=True)
+        run_id = request.args.get('run')
+        usage = processing_service.get_llm_usage(days=days, run_id=run_id)
+        return jsonify(usage)
+    
+    @app.route('/api/what-if')
+    def what_if():
+        """Re-rank companies under alternative scoring weights, e.g. ?hiring_signals=0.6."""
+        options = {'limit', 'refresh'}
+        weights = {key: value for key, value in request.args.items() if key not in options}
+        limit = _int_arg('limit', 20)
+        try:
+            ranking = processing_service.what_if(
+                weights,
+                limit=limit,
+                refresh=request.args.get('refresh') == '1'
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(ranking)
+    
     return app
 
 
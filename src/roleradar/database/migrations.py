@@ -0,0 +1,210 @@
+"""Lightweight, idempotent schema migrations for existing databases.
+
+``Base.metadata.create_all`` creates missing tables but never alters
+existing ones. Each migration here inspects the live schema and only
+applies the changes that are missing, so it is safe to run on every start.
+"""
+
+import os
+from typing import Dict
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+from ..models.types import COMPRESSED_PREFIX, compress_text, is_compressed
+from ..utils import chunked, normalize_url
+
+
+def _column_names(engine: Engine, table: str) -> set:
+    """Get the column names of a table."""
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+
+def _index_names(engine: Engine, table: str) -> set:
+    """Get the index names of a table."""
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def add_column(engine: Engine, table: str, column: str, ddl_type: str) -> bool:
+    """
+    Add a column to a table if it does not exist yet.
+    
+    Returns:
+        True if the column was added
+    """
+    if column in _column_names(engine, table):
+        return False
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+    return True
+
+
+def create_index(engine: Engine, table: str, name: str, columns: str, unique: bool = False) -> bool:
+    """
+    Create an index if it does not exist yet.
+    
+    Returns:
+        True if the index was created
+    """
+    if name in _index_names(engine, table):
+        return False
+    unique_sql = "UNIQUE " if unique else ""
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE {unique_sql}INDEX {name} ON {table} ({columns})"))
+    return True
+
+
+def migrate_search_result_url_key(engine: Engine):
+    """Add and backfill the normalized ``search_results.url_key`` column."""
+    add_column(engine, "search_results", "url_key", "VARCHAR(512)")
+    
+    with engine.connect() as conn:
+        pending = conn.execute(
+            text("SELECT id, url FROM search_results WHERE url_key IS NULL ORDER BY id")
+        ).fetchall()
+    # Nothing to backfill is the common case on every start
+    if pending:
+        _backfill_url_keys(engine, pending)
+    
+    create_index(engine, "search_results", "ix_search_results_url_key", "url_key", unique=True)
+
+
+def _backfill_url_keys(engine: Engine, pending: list):
+    """Set ``url_key`` on (id, url) rows, leaving keys that are already taken NULL."""
+    keys = {row_id: normalize_url(url) for row_id, url in pending}
+    
+    with engine.begin() as conn:
+        # Keys are only compared against the rows that could collide with them
+        used = set()
+        for batch in chunked(sorted({key for key in keys.values() if key}), 500):
+            params = {f"k{i}": key for i, key in enumerate(batch)}
+            placeholders = ", ".join(f":{name}" for name in params)
+            used.update(
+                row[0] for row in conn.execute(
+                    text(f"SELECT url_key FROM search_results WHERE url_key IN ({placeholders})"),
+                    params
+                )
+            )
+        
+        # The oldest row keeps the key; later duplicates stay NULL
+        updates = []
+        for row_id, _ in pending:
+            key = keys[row_id]
+            if key and key not in used:
+                used.add(key)
+                updates.append({"id": row_id, "url_key": key})
+        
+        for batch in chunked(updates, 1000):
+            conn.execute(
+                text("UPDATE search_results SET url_key = :url_key WHERE id = :id"),
+                batch
+            )
+
+
+def migrate_search_result_fingerprints(engine: Engine):
+    """Add the near-duplicate columns to ``search_results``."""
+    add_column(engine, "search_results", "simhash", "VARCHAR(16)")
+    add_column(engine, "search_results", "duplicate_of_id", "INTEGER")
+
+
+def migrate_search_result_relevance(engine: Engine):
+    """Add the relevance pre-filter columns to ``search_results``."""
+    add_column(engine, "search_results", "relevance_score", "FLOAT")
+    add_column(engine, "search_results", "skip_reason", "VARCHAR(50)")
+
+
+def migrate_search_result_claims(engine: Engine):
+    """Add the processing lease columns to ``search_results``."""
+    add_column(engine, "search_results", "claimed_by", "VARCHAR(64)")
+    add_column(engine, "search_results", "claimed_at", "TIMESTAMP")
+    create_index(engine, "search_results", "ix_search_results_claimed_by", "claimed_by")
+
+
+MIGRATIONS = [
+    migrate_search_result_url_key,
+    migrate_search_result_fingerprints,
+    migrate_search_result_relevance,
+    migrate_search_result_claims,
+]
+
+
+def run_migrations(engine: Engine):
+    """Apply all migrations to the database."""
+    for migration in MIGRATIONS:
+        migration(engine)
+
+
+# Large text columns stored with CompressedText
+COMPRESSED_COLUMNS = [
+    ("search_results", "content"),
+    ("opportunities", "description"),
+]
+
+
+def compress_existing_text(engine: Engine, batch_size: int = 500, min_length: int = 1024) -> Dict[str, int]:
+    """
+    Compress large text values written before compression was enabled.
+    
+    Not part of ``MIGRATIONS`` because it rewrites every large row; run it
+    explicitly (``roleradar.py compact``).
+    
+    Returns:
+        Number of rows rewritten per "table.column"
+    """
+    rewritten = {}
+    for table, column in COMPRESSED_COLUMNS:
+        count = 0
+        last_id = 0
+        while True:
+            with engine.begin() as conn:
+                rows = conn.execute(
+                    text(
+                        f"SELECT id, {column} FROM {table} WHERE id > :last_id"
+                        f" AND {column} IS NOT NULL ORDER BY id LIMIT :limit"
+                    ),
+                    {"last_id": last_id, "limit": batch_size}
+                ).fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                
+                # Legacy text starting with the prefix is compressed too, whatever its length
+                updates = [
+                    {"id": row_id, "value": compress_text(value, min_length)}
+                    for row_id, value in rows
+                    if not is_compressed(value)
+                    and (len(value) >= min_length or value.startswith(COMPRESSED_PREFIX))
+                ]
+                if updates:
+                    conn.execute(
+                        text(f"UPDATE {table} SET {column} = :value WHERE id = :id"),
+                        updates
+                    )
+                    count += len(updates)
+        rewritten[f"{table}.{column}"] = count
+    return rewritten
+
+
+def database_size(engine: Engine) -> int:
+    """
+    Get the on-disk size of the database in bytes.
+    
+    Returns:
+        Size in bytes, or -1 if the backend is not supported
+    """
+    if engine.dialect.name == "sqlite":
+        path = engine.url.database
+        return os.path.getsize(path) if path and os.path.exists(path) else 0
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT pg_database_size(current_database())")).scalar()
+    return -1
+
+
+def reclaim_space(engine: Engine):
+    """Return freed pages to the filesystem after a large rewrite."""
+    if engine.dialect.name == "sqlite":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("VACUUM"))
+    elif engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table, _ in COMPRESSED_COLUMNS:
+                conn.execute(text(f"VACUUM FULL {table}"))
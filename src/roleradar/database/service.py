@@ -5,6 +5,7 @@ from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
 from ..models import Base
 from ..config import config
+from .migrations import run_migrations, compress_existing_text, database_size, reclaim_space
 
 
 class DatabaseService:
@@ -17,13 +18,30 @@ class DatabaseService:
         self.SessionLocal = sessionmaker(bind=self.engine)
     
     def create_tables(self):
-        """Create all database tables."""
+        """Create all database tables and bring existing ones up to date."""
         Base.metadata.create_all(bind=self.engine)
+        run_migrations(self.engine)
     
     def drop_tables(self):
         """Drop all database tables."""
         Base.metadata.drop_all(bind=self.engine)
     
+    def compact_text_columns(self) -> dict:
+        """
+        Compress existing large text values and reclaim the freed space.
+        
+        Returns:
+            Dictionary with database size before and after (bytes) and rows rewritten
+        """
+        size_before = database_size(self.engine)
+        rewritten = compress_existing_text(self.engine)
+        reclaim_space(self.engine)
+        return {
+            "size_before": size_before,
+            "size_after": database_size(self.engine),
+            "rewritten": rewritten,
+        }
+    
     @contextmanager
     def get_session(self) -> Session:
         """Get a database session with context manager."""
@@ -1,6 +1,17 @@
 """Initialize models package."""
 
-from .database import Base, Company, Opportunity, HiringSignal, SearchResult
+from .database import (
+    Base,
+    Company,
+    Opportunity,
+    HiringSignal,
+    SearchResult,
+    ContentFingerprint,
+    QueryWatermark,
+    QueryYield,
+    DashboardSummary,
+    LLMCall,
+)
 from .graph import GraphDatabase
 
 __all__ = [
@@ -9,5 +20,10 @@ __all__ = [
     "Opportunity",
     "HiringSignal",
     "SearchResult",
+    "ContentFingerprint",
+    "QueryWatermark",
+    "QueryYield",
+    "DashboardSummary",
+    "LLMCall",
     "GraphDatabase",
 ]
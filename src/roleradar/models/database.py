@@ -1,9 +1,10 @@
 """Database models for RoleRadar."""
 
 from datetime import datetime, timezone
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
+from .types import CompressedText
 
 Base = declarative_base()
 
@@ -46,7 +47,7 @@ class Opportunity(Base):
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
     title = Column(String(255), nullable=False)
     role_type = Column(String(100))  # security, compliance, GRC
-    description = Column(Text)
+    description = deferred(Column(CompressedText))
     url = Column(String(512))
     location = Column(String(255))
     is_active = Column(Boolean, default=True)
@@ -89,12 +90,115 @@ class SearchResult(Base):
     id = Column(Integer, primary_key=True)
     query = Column(String(255), nullable=False)
     title = Column(String(512))
-    content = Column(Text)
+    content = deferred(Column(CompressedText))
     url = Column(String(512))
+    url_key = Column(String(512), unique=True, index=True)  # normalized URL for dedup
     score = Column(Float)
     published_date = Column(String(100))
     retrieved_date = Column(DateTime, default=utc_now)
     processed = Column(Boolean, default=False)
+    simhash = Column(String(16))  # 64-bit SimHash of title + content, hex encoded
+    duplicate_of_id = Column(Integer, ForeignKey("search_results.id"))
+    relevance_score = Column(Float)  # keyword pre-filter score, set when the result is skipped
+    skip_reason = Column(String(50))  # why a processed result never reached the LLM
+    claimed_by = Column(String(64), index=True)  # processor currently holding the result
+    claimed_at = Column(DateTime)  # start of the claim's lease
     
     def __repr__(self):
         return f"<SearchResult(title='{self.title}', query='{self.query}')>"
+
+
+class ContentFingerprint(Base):
+    """SimHash band index used to find near-duplicate search results."""
+    
+    __tablename__ = "content_fingerprints"
+    __table_args__ = (
+        Index("ix_content_fingerprints_band", "band", "band_value"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    search_result_id = Column(Integer, ForeignKey("search_results.id"), nullable=False)
+    band = Column(Integer, nullable=False)
+    band_value = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<ContentFingerprint(result={self.search_result_id}, band={self.band})>"
+
+
+class QueryWatermark(Base):
+    """Per-query high-water mark used for incremental searching."""
+    
+    __tablename__ = "query_watermarks"
+    
+    id = Column(Integer, primary_key=True)
+    query = Column(String(255), nullable=False, unique=True)
+    latest_published_date = Column(DateTime)
+    first_run_at = Column(DateTime, default=utc_now)
+    last_run_at = Column(DateTime, default=utc_now)
+    run_count = Column(Integer, default=0)
+    recent_url_keys = Column(Text)  # JSON list, most recent first
+    
+    def __repr__(self):
+        return f"<QueryWatermark(query='{self.query}', latest='{self.latest_published_date}')>"
+
+
+class QueryYield(Base):
+    """Novel yield of one search query in one run, used by the query planner."""
+    
+    __tablename__ = "query_yields"
+    __table_args__ = (
+        Index("ix_query_yields_query", "query", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    run_id = Column(String(32), nullable=False)
+    query = Column(String(255), nullable=False)
+    ran = Column(Boolean, default=True)
+    reason = Column(String(100))
+    results = Column(Integer, default=0)
+    new_urls = Column(Integer, default=0)
+    new_companies = Column(Integer, default=0)
+    new_opportunities = Column(Integer, default=0)
+    created_at = Column(DateTime, default=utc_now)
+    
+    def __repr__(self):
+        return f"<QueryYield(query='{self.query}', new_urls={self.new_urls})>"
+
+
+class DashboardSummary(Base):
+    """Executive summary generated after a processing run, served by the dashboard."""
+    
+    __tablename__ = "dashboard_summaries"
+    
+    id = Column(Integer, primary_key=True)
+    data_version = Column(String(64), nullable=False, index=True)  # hash of the top companies summarized
+    summary = Column(Text, nullable=False)
+    generated_at = Column(DateTime, default=utc_now)
+    
+    def __repr__(self):
+        return f"<DashboardSummary(data_version='{self.data_version}')>"
+
+
+class LLMCall(Base):
+    """One chat completion sent to the LLM, with its latency, token usage and outcome."""
+    
+    __tablename__ = "llm_calls"
+    __table_args__ = (
+        Index("ix_llm_calls_created_at", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    run_id = Column(String(32), nullable=False, index=True)
+    method = Column(String(50), nullable=False)  # analyze, analyze_batch, analyze_fallback, summarize
+    model = Column(String(100), nullable=False)
+    status = Column(String(20), nullable=False)  # ok, parse_error, failed
+    latency_seconds = Column(Float)  # successful (or last) attempt
+    wall_seconds = Column(Float)  # including admission waits and retries
+    retries = Column(Integer, default=0)
+    prompt_tokens = Column(Integer, default=0)
+    completion_tokens = Column(Integer, default=0)
+    cost_usd = Column(Float, default=0.0)
+    created_at = Column(DateTime, default=utc_now)
+    
+    def __repr__(self):
+        return f"<LLMCall(method='{self.method}', model='{self.model}', status='{self.status}')>"
@@ -3,6 +3,8 @@
 import networkx as nx
 import pickle
 import os
+import threading
+from contextlib import contextmanager
 
 
 class GraphDatabase:
@@ -12,6 +14,10 @@ class GraphDatabase:
         """Initialize graph database."""
         self.filepath = filepath
         self.graph = nx.DiGraph()
+        # Guards the graph and its file when several workers add nodes
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
         self.load()
     
     def load(self):
@@ -25,29 +31,50 @@ class GraphDatabase:
                 self.graph = nx.DiGraph()
     
     def save(self):
-        """Save graph to file."""
+        """Save graph to file (deferred to the end of a ``batch`` block)."""
+        with self._lock:
+            if self._batch_depth:
+                self._dirty = True
+                return
         try:
-            with open(self.filepath, 'wb') as f:
+            with self._lock, open(self.filepath, 'wb') as f:
                 pickle.dump(self.graph, f)
         except Exception as e:
             print(f"Error saving graph: {e}")
     
+    @contextmanager
+    def batch(self):
+        """Save the graph once at the end of the block instead of after every change."""
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth and self._dirty:
+                    self._dirty = False
+                    self.save()
+    
     def add_company(self, company_id, **attributes):
         """Add a company node."""
-        self.graph.add_node(f"company:{company_id}", type="company", **attributes)
-        self.save()
+        with self._lock:
+            self.graph.add_node(f"company:{company_id}", type="company", **attributes)
+            self.save()
     
     def add_opportunity(self, opportunity_id, company_id, **attributes):
         """Add an opportunity node and link to company."""
-        self.graph.add_node(f"opportunity:{opportunity_id}", type="opportunity", **attributes)
-        self.graph.add_edge(f"company:{company_id}", f"opportunity:{opportunity_id}", relation="has_opening")
-        self.save()
+        with self._lock:
+            self.graph.add_node(f"opportunity:{opportunity_id}", type="opportunity", **attributes)
+            self.graph.add_edge(f"company:{company_id}", f"opportunity:{opportunity_id}", relation="has_opening")
+            self.save()
     
     def add_signal(self, signal_id, company_id, signal_type, **attributes):
         """Add a hiring signal and link to company."""
-        self.graph.add_node(f"signal:{signal_id}", type="signal", signal_type=signal_type, **attributes)
-        self.graph.add_edge(f"company:{company_id}", f"signal:{signal_id}", relation="shows_signal")
-        self.save()
+        with self._lock:
+            self.graph.add_node(f"signal:{signal_id}", type="signal", signal_type=signal_type, **attributes)
+            self.graph.add_edge(f"company:{company_id}", f"signal:{signal_id}", relation="shows_signal")
+            self.save()
     
     def get_company_connections(self, company_id):
         """Get all connections for a company."""
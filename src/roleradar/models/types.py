@@ -0,0 +1,80 @@
+"""Custom column types for RoleRadar models."""
+
+import base64
+import zlib
+from typing import Optional
+from sqlalchemy.types import Text, TypeDecorator
+
+COMPRESSED_PREFIX = "zlib:"
+
+
+def compress_text(value: str, min_length: int = 1024) -> str:
+    """
+    Compress a text value for storage if it is long enough to benefit.
+    
+    Values that already look compressed are always compressed again so
+    they round-trip unchanged.
+    
+    Args:
+        value: Text to store
+        min_length: Shorter values are stored as-is
+        
+    Returns:
+        Stored representation
+    """
+    if value is None:
+        return None
+    if len(value) < min_length and not value.startswith(COMPRESSED_PREFIX):
+        return value
+    packed = base64.b64encode(zlib.compress(value.encode("utf-8"), 6)).decode("ascii")
+    return COMPRESSED_PREFIX + packed
+
+
+def decompress_text(value: str) -> str:
+    """
+    Reverse ``compress_text``.
+    
+    Legacy text that merely starts with the prefix is returned as stored.
+    """
+    if value is None:
+        return value
+    unpacked = _unpack(value)
+    return value if unpacked is None else unpacked
+
+
+def is_compressed(value: str) -> bool:
+    """Whether a stored value was written by ``compress_text``."""
+    return value is not None and _unpack(value) is not None
+
+
+def _unpack(value: str) -> Optional[str]:
+    """Decode a compressed value, or None if it is not one."""
+    if not value.startswith(COMPRESSED_PREFIX):
+        return None
+    try:
+        packed = base64.b64decode(value[len(COMPRESSED_PREFIX):], validate=True)
+        return zlib.decompress(packed).decode("utf-8")
+    except (ValueError, zlib.error):
+        return None
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column stored zlib-compressed (base64 encoded) when large.
+    
+    The column stays a plain TEXT column on every backend, so existing
+    uncompressed rows keep loading and can be migrated in place.
+    """
+    
+    impl = Text
+    cache_ok = True
+    
+    def __init__(self, min_length: int = 1024, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.min_length = min_length
+    
+    def process_bind_param(self, value, dialect):
+        return compress_text(value, self.min_length)
+    
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
@@ -2,10 +2,14 @@
 
 from .tavily_service import TavilySearchService
 from .groq_service import GroqAnalysisService
+from .local_extractor import LocalAnalysisService
 from .processing_service import ProcessingService
+from .pipeline import SearchProcessPipeline
 
 __all__ = [
     "TavilySearchService",
     "GroqAnalysisService",
+    "LocalAnalysisService",
     "ProcessingService",
+    "SearchProcessPipeline",
 ]
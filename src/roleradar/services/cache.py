@@ -0,0 +1,188 @@
+"""Persistent on-disk response cache backed by SQLite."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Size-bounded TTL cache stored in a local SQLite file.
+    
+    Entries are namespaced so several services can share one file. Each
+    entry records how long the original call took, so hits can report the
+    latency they saved. Hit/miss counters are persisted per namespace and
+    survive restarts.
+    """
+    
+    def __init__(self, path: str, namespace: str, ttl_seconds: float, max_entries: int):
+        """
+        Initialize disk cache.
+        
+        Args:
+            path: SQLite file path
+            namespace: Logical cache name (e.g. "tavily")
+            ttl_seconds: Entry lifetime (0 or less disables the cache)
+            max_entries: Maximum entries kept in this namespace (least recently used evicted first)
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = ttl_seconds > 0 and max_entries > 0
+        self.run_stats = {"hits": 0, "misses": 0, "saved_seconds": 0.0}
+        self._lock = threading.Lock()
+        self._conn = None
+        
+        if self.enabled:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+                " cost REAL NOT NULL DEFAULT 0, created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_cache_entries_accessed"
+                " ON cache_entries (namespace, accessed_at)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_counters ("
+                " namespace TEXT PRIMARY KEY, hits INTEGER NOT NULL DEFAULT 0,"
+                " misses INTEGER NOT NULL DEFAULT 0, saved_seconds REAL NOT NULL DEFAULT 0)"
+            )
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+        
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, cost, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            
+            if row is None or now - row[2] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    )
+                self._count(misses=1)
+                return None
+            
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key)
+            )
+            self._count(hits=1, saved_seconds=row[1])
+            return json.loads(row[0])
+    
+    def set(self, key: str, value: Any, cost: float = 0.0):
+        """
+        Store a value.
+        
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            cost: Seconds the uncached call took
+        """
+        if not self.enabled:
+            return
+        
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (namespace, key, value, cost, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), cost, now, now)
+            )
+            self._evict(now)
+    
+    def _evict(self, now: float):
+        """Drop expired entries and trim the namespace to ``max_entries``."""
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+            (self.namespace, now - self.ttl_seconds)
+        )
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache_entries WHERE namespace = ?"
+            " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries)
+        )
+    
+    def _count(self, hits: int = 0, misses: int = 0, saved_seconds: float = 0.0):
+        """Update in-memory and persisted counters."""
+        self.run_stats["hits"] += hits
+        self.run_stats["misses"] += misses
+        self.run_stats["saved_seconds"] += saved_seconds
+        self._conn.execute(
+            "INSERT INTO cache_counters (namespace, hits, misses, saved_seconds)"
+            " VALUES (?, ?, ?, ?) ON CONFLICT(namespace) DO UPDATE SET"
+            " hits = hits + excluded.hits, misses = misses + excluded.misses,"
+            " saved_seconds = saved_seconds + excluded.saved_seconds",
+            (self.namespace, hits, misses, saved_seconds)
+        )
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with counters for this process ("run") and all time ("total")
+        """
+        total = {"hits": 0, "misses": 0, "saved_seconds": 0.0}
+        entries = 0
+        if self.enabled:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT hits, misses, saved_seconds FROM cache_counters WHERE namespace = ?",
+                    (self.namespace,)
+                ).fetchone()
+                if row:
+                    total = {"hits": row[0], "misses": row[1], "saved_seconds": row[2]}
+                entries = self._conn.execute(
+                    "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+                    (self.namespace,)
+                ).fetchone()[0]
+        
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "run": dict(self.run_stats, hit_rate=_hit_rate(self.run_stats)),
+            "total": dict(total, hit_rate=_hit_rate(total)),
+        }
+    
+    def clear(self):
+        """Remove all entries in this namespace."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+
+def _hit_rate(counters: Dict[str, Any]) -> float:
+    """Compute the hit rate from hit/miss counters."""
+    lookups = counters["hits"] + counters["misses"]
+    return counters["hits"] / lookups if lookups else 0.0
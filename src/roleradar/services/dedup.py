@@ -0,0 +1,231 @@
+"""Near-duplicate detection for search results using SimHash."""
+
+import hashlib
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from ..models import ContentFingerprint, SearchResult
+from ..utils import chunked
+
+SIMHASH_BITS = 64
+BANDS = 4
+BAND_BITS = SIMHASH_BITS // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def simhash(text: str, shingle_size: int = 2, min_tokens: int = 8) -> Optional[int]:
+    """
+    Compute a 64-bit SimHash over word shingles of a text.
+    
+    Args:
+        text: Text to fingerprint
+        shingle_size: Number of words per shingle
+        min_tokens: Texts with fewer words are too short to fingerprint
+    
+    Returns:
+        Fingerprint as an unsigned integer, or None for short texts
+    """
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    if len(tokens) < min_tokens:
+        return None
+    
+    shingles = Counter(
+        " ".join(tokens[i:i + shingle_size])
+        for i in range(len(tokens) - shingle_size + 1)
+    )
+    
+    weights = [0] * SIMHASH_BITS
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += count if (value >> bit) & 1 else -count
+    
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Count the differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+def fingerprint_bands(fingerprint: int) -> List[int]:
+    """Split a fingerprint into its band values."""
+    return [(fingerprint >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)]
+
+
+class NearDuplicateIndex:
+    """
+    Persistent SimHash index over search result title and content.
+    
+    Fingerprints are split into ``BANDS`` bands stored in the
+    ``content_fingerprints`` table. Two fingerprints within ``BANDS - 1``
+    bits of each other always share at least one band, so candidate lookup
+    is a single indexed query per batch. Larger ``max_distance`` values are
+    best-effort: pairs are only found when they happen to share a band.
+    """
+    
+    def __init__(self, max_distance: int = 3):
+        """Initialize index with the largest Hamming distance counted as a duplicate."""
+        self.max_distance = max_distance
+    
+    def insert_rows(self, session, rows: List[Dict[str, Any]]) -> Tuple[List[int], int, int]:
+        """
+        Insert new search result rows, marking near-duplicates as processed.
+        
+        Rows matching an indexed result, or an earlier row in the same batch,
+        get ``duplicate_of_id`` set and ``processed=True`` so they never reach
+        LLM processing. Only originals are added to the index. Rows whose
+        ``url_key`` was stored meanwhile by a concurrent ingest are skipped
+        (``ON CONFLICT DO NOTHING``) instead of failing the batch.
+        
+        Args:
+            session: Active database session
+            rows: Column dictionaries for new ``SearchResult`` rows, each
+                with a ``url_key``
+        
+        Returns:
+            Tuple of (ids of inserted rows still pending processing,
+            number of rows inserted as near-duplicates, number of rows
+            skipped because their URL already existed)
+        """
+        fingerprints = []
+        for row in rows:
+            fingerprint = simhash(f"{row.get('title', '')}\n{row.get('content', '')}")
+            row["simhash"] = format(fingerprint, "016x") if fingerprint is not None else None
+            row["duplicate_of_id"] = None
+            fingerprints.append(fingerprint)
+        
+        indexed = self._find_candidates(session, [fp for fp in fingerprints if fp is not None])
+        
+        originals = []
+        batch_duplicates = []
+        accepted = []  # (fingerprint, position in originals) of this batch's originals
+        for row, fingerprint in zip(rows, fingerprints):
+            if fingerprint is None:
+                originals.append((row, None))
+                continue
+            
+            match = self._closest(fingerprint, indexed)
+            if match is not None:
+                row["duplicate_of_id"] = match
+                row["processed"] = True
+                originals.append((row, None))
+                continue
+            
+            batch_match = self._closest(fingerprint, accepted)
+            if batch_match is not None:
+                batch_duplicates.append((row, batch_match))
+                continue
+            
+            accepted.append((fingerprint, len(originals)))
+            originals.append((row, fingerprint))
+        
+        if not originals:
+            return [], len(batch_duplicates), 0
+        
+        inserted = _insert_new(session, [row for row, _ in originals])
+        conflicts = len(originals) - len(inserted)
+        ids = [inserted.get(row["url_key"]) for row, _ in originals]
+        
+        duplicates = {}
+        if batch_duplicates:
+            # An original that lost a race still exists under the other ingest's id
+            lost = [row["url_key"] for (row, _), result_id in zip(originals, ids) if result_id is None]
+            existing = _ids_by_url_key(session, lost) if lost else {}
+            for row, position in batch_duplicates:
+                original = originals[position][0]
+                row["duplicate_of_id"] = ids[position] or existing.get(original["url_key"])
+                row["processed"] = True
+            duplicates = _insert_new(session, [row for row, _ in batch_duplicates])
+            conflicts += len(batch_duplicates) - len(duplicates)
+        
+        fingerprint_rows = [
+            {"search_result_id": result_id, "band": band, "band_value": value}
+            for result_id, (_, fingerprint) in zip(ids, originals)
+            if result_id is not None and fingerprint is not None
+            for band, value in enumerate(fingerprint_bands(fingerprint))
+        ]
+        if fingerprint_rows:
+            session.execute(insert(ContentFingerprint), fingerprint_rows)
+        
+        pending_ids = [
+            result_id for result_id, (row, _) in zip(ids, originals)
+            if result_id is not None and row["duplicate_of_id"] is None
+        ]
+        marked = len(inserted) - len(pending_ids)
+        return pending_ids, marked + len(duplicates), conflicts
+    
+    def _find_candidates(self, session, fingerprints: List[int]) -> List[tuple]:
+        """Load (fingerprint, result id) pairs sharing a band with any given fingerprint."""
+        if not fingerprints:
+            return []
+        
+        candidates = {}
+        for batch in chunked(fingerprints, 100):
+            band_values = [set() for _ in range(BANDS)]
+            for fingerprint in batch:
+                for band, value in enumerate(fingerprint_bands(fingerprint)):
+                    band_values[band].add(value)
+            
+            rows = session.query(SearchResult.id, SearchResult.simhash).join(
+                ContentFingerprint, ContentFingerprint.search_result_id == SearchResult.id
+            ).filter(
+                or_(*[
+                    and_(ContentFingerprint.band == band, ContentFingerprint.band_value.in_(values))
+                    for band, values in enumerate(band_values)
+                ])
+            ).distinct()
+            
+            for result_id, hex_fingerprint in rows:
+                if hex_fingerprint:
+                    candidates[result_id] = int(hex_fingerprint, 16)
+        
+        return [(fingerprint, result_id) for result_id, fingerprint in sorted(candidates.items())]
+    
+    def _closest(self, fingerprint: int, candidates: List[tuple]) -> Optional[Any]:
+        """Return the id of the nearest candidate within ``max_distance``, if any."""
+        best = None
+        best_distance = self.max_distance + 1
+        for candidate, candidate_id in candidates:
+            distance = hamming_distance(fingerprint, candidate)
+            if distance < best_distance:
+                best, best_distance = candidate_id, distance
+        return best
+
+
+def _insert_new(session, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Insert search result rows, skipping URLs that already exist.
+    
+    Returns:
+        Ids of the inserted rows by ``url_key``
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        statement = sqlite_insert(SearchResult).on_conflict_do_nothing(index_elements=["url_key"])
+    elif dialect == "postgresql":
+        statement = postgresql_insert(SearchResult).on_conflict_do_nothing(index_elements=["url_key"])
+    else:
+        statement = insert(SearchResult)
+    returned = session.execute(statement.returning(SearchResult.url_key, SearchResult.id), rows)
+    return dict(returned.all())
+
+
+def _ids_by_url_key(session, url_keys: List[str]) -> Dict[str, int]:
+    """Look up existing search result ids by ``url_key``."""
+    ids = {}
+    for batch in chunked(url_keys, 500):
+        ids.update(
+            session.query(SearchResult.url_key, SearchResult.id).filter(SearchResult.url_key.in_(batch))
+        )
+    return ids
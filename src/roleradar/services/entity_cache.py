@@ -0,0 +1,114 @@
+"""Run-scoped identity map of companies, opportunities and signals for processing runs."""
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Set, Tuple
+from ..database import db_service
+from ..models import Company, HiringSignal, Opportunity
+
+
+def normalize_company_name(name: str) -> str:
+    """Key a company name case- and whitespace-insensitively."""
+    return " ".join((name or "").lower().split())
+
+
+class _Entities:
+    """Company ids and dedup keys of opportunities and signals."""
+    
+    def __init__(self):
+        """Initialize empty lookups."""
+        self.companies: Dict[str, int] = {}
+        self.opportunities: Set[Tuple[int, str]] = set()
+        self.signals: Set[Tuple[int, Optional[str], Optional[str]]] = set()
+
+
+class EntityCache(_Entities):
+    """
+    Write-through cache of what processing needs to deduplicate.
+    
+    Maps normalized company names to ids and remembers the (company_id,
+    title) of active opportunities and the (company_id, signal_type,
+    source_url) of signals, so persisting a result checks dictionaries
+    instead of issuing three lookups. ``load`` fills it in bulk at the
+    start of a run. Inserts are staged in a ``transaction`` and only
+    become visible once the database transaction they belong to commits.
+    """
+    
+    def __init__(self):
+        """Initialize an empty cache; call ``load`` before use."""
+        super().__init__()
+        self.loaded = False
+        self._lock = threading.Lock()
+    
+    def load(self):
+        """Load all companies, active opportunities and signals in bulk."""
+        entities = _Entities()
+        with db_service.get_session() as session:
+            for company_id, name in session.query(Company.id, Company.name).order_by(Company.id):
+                entities.companies.setdefault(normalize_company_name(name), company_id)
+            entities.opportunities.update(
+                session.query(Opportunity.company_id, Opportunity.title).filter_by(is_active=True)
+            )
+            entities.signals.update(
+                session.query(HiringSignal.company_id, HiringSignal.signal_type, HiringSignal.source_url)
+            )
+        
+        with self._lock:
+            self.companies = entities.companies
+            self.opportunities = {tuple(key) for key in entities.opportunities}
+            self.signals = {tuple(key) for key in entities.signals}
+            self.loaded = True
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Stage inserts for one database transaction.
+        
+        Yields a view whose lookups see committed and staged entries. The
+        staged entries are merged when the block exits normally (after the
+        session inside it committed) and dropped if it raises.
+        """
+        if not self.loaded:
+            self.load()
+        staged = _StagedEntities(self)
+        yield staged
+        with self._lock:
+            self.companies.update(staged.companies)
+            self.opportunities.update(staged.opportunities)
+            self.signals.update(staged.signals)
+
+
+class _StagedEntities(_Entities):
+    """Entries inserted by an open transaction, layered over the committed cache."""
+    
+    def __init__(self, cache: EntityCache):
+        """Initialize staging over the committed ``cache``."""
+        super().__init__()
+        self._cache = cache
+    
+    def company_id(self, name: str) -> Optional[int]:
+        """Get the id of a known company, or None."""
+        key = normalize_company_name(name)
+        return self.companies.get(key) or self._cache.companies.get(key)
+    
+    def add_company(self, name: str, company_id: int):
+        """Remember a company."""
+        self.companies[normalize_company_name(name)] = company_id
+    
+    def has_opportunity(self, company_id: int, title: str) -> bool:
+        """Check whether a company already has an active opportunity with this title."""
+        key = (company_id, title)
+        return key in self.opportunities or key in self._cache.opportunities
+    
+    def add_opportunity(self, company_id: int, title: str):
+        """Remember an active opportunity."""
+        self.opportunities.add((company_id, title))
+    
+    def has_signal(self, company_id: int, signal_type: str, source_url: str) -> bool:
+        """Check whether a signal of this type from this source is already recorded."""
+        key = (company_id, signal_type, source_url)
+        return key in self.signals or key in self._cache.signals
+    
+    def add_signal(self, company_id: int, signal_type: str, source_url: str):
+        """Remember a signal."""
+        self.signals.add((company_id, signal_type, source_url))
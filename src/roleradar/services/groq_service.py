@@ -1,95 +1,570 @@
 """Groq service for entity extraction, scoring, and analysis."""
 
+import asyncio
+import hashlib
 import json
-from typing import Dict, Any, List
-from groq import Groq
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+from groq import APIConnectionError, AsyncGroq, Groq
 from ..config import config
+from ..models.database import utc_now
+from ..utils import estimate_tokens
+from .cache import DiskCache, make_cache_key
+from .llm_metrics import call_cost, save_calls
+from .rate_limiter import DualTokenBucket
+
+# Bump whenever the analysis prompt or its output format changes, so cached
+# answers to the old prompt are no longer used
+ANALYSIS_PROMPT_VERSION = "analysis-v1"
+
+ANALYSIS_SYSTEM_PROMPT = (
+    "You are a helpful assistant that extracts structured data from job postings "
+    "and company news and returns valid JSON."
+)
+
+ANALYSIS_INSTRUCTIONS = """1. Extract entities:
+- company_name: Name of the company (if mentioned)
+- job_title: Job title or role
+- role_type: Classify as "security", "compliance", or "GRC"
+- location: Job location
+- keywords: List of relevant keywords (e.g., "CISO", "data protection", "risk management")
+
+2. Identify hiring signals suggesting the company may need security or compliance leadership, such as:
+- Company expansion or growth
+- Recent funding rounds
+- Security breaches or incidents
+- New compliance requirements
+- Regulatory changes affecting the company
+- Product launches requiring security expertise
+"""
+
+ANALYSIS_FORMAT = """- "entities": object with company_name, job_title, role_type, location, keywords (use null if a field is not found)
+- "signals": object with
+  - has_signal: boolean indicating if hiring signals were detected
+  - signal_type: one of ["expansion", "funding", "breach", "compliance_news", "regulatory", "product_launch", "none"]
+  - confidence: float between 0 and 1
+  - description: brief description of the signal
+"""
+
+# Completion tokens reserved per analyzed document, and per batched call
+ANALYSIS_MAX_TOKENS = 700
+ANALYSIS_ITEM_TOKENS = 350
+ANALYSIS_BATCH_MAX_OUTPUT = 4096
+
+# Completed calls kept in GroqAnalysisService.call_log
+CALL_LOG_SIZE = 1000
+
+# Why the fast model's answer was not trusted
+ESCALATION_REASONS = ("invalid_json", "missing_company", "low_confidence")
+
+# HTTP statuses worth retrying besides 5xx
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+# HTTP statuses rejecting the request itself (rather than the account or model)
+REJECTED_STATUS_CODES = {400, 413, 422}
+
+
+def empty_entities() -> Dict[str, Any]:
+    """Entities returned when nothing could be extracted."""
+    return {
+        "company_name": None,
+        "job_title": None,
+        "role_type": None,
+        "location": None,
+        "keywords": []
+    }
+
+
+def empty_signals() -> Dict[str, Any]:
+    """Signals returned when nothing could be detected."""
+    return {
+        "has_signal": False,
+        "signal_type": "none",
+        "confidence": 0.0,
+        "description": ""
+    }
+
+
+def normalize_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill missing entity and signal fields with their empty defaults."""
+    return {
+        "entities": {**empty_entities(), **(analysis.get("entities") or {})},
+        "signals": {**empty_signals(), **(analysis.get("signals") or {})},
+    }
+
+
+def parse_json_response(result_text: str) -> Any:
+    """Parse JSON from an LLM response, tolerating Markdown code fences."""
+    if "```json" in result_text:
+        result_text = result_text.split("```json")[1].split("```")[0].strip()
+    elif "```" in result_text:
+        result_text = result_text.split("```")[1].split("```")[0].strip()
+    
+    return json.loads(result_text)
+
+
+class GroqUnavailableError(Exception):
+    """A Groq call still failed after all retries; the work should be retried later."""
+
+
+class GroqRequestError(Exception):
+    """Groq rejected a request as invalid; sending it again unchanged would fail again."""
+
+
+def retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Decide whether and when to retry a failed Groq call.
+    
+    Rate limits (429), timeouts/conflicts (408/409), server errors (5xx)
+    and connection errors are retried with exponential backoff and jitter,
+    honouring the provider's retry-after when it is longer.
+    
+    Args:
+        error: Exception raised by the call
+        attempt: Number of retries already made
+        
+    Returns:
+        Seconds to wait before retrying, or None if the error is not retryable
+    """
+    status = getattr(error, "status_code", None)
+    if status is None and not isinstance(error, APIConnectionError):
+        return None
+    if status is not None and status not in RETRYABLE_STATUS_CODES and status < 500:
+        return None
+    
+    backoff = min(config.GROQ_RETRY_MAX_DELAY, config.GROQ_RETRY_BASE_DELAY * 2 ** attempt)
+    backoff *= random.uniform(0.5, 1.0)
+    
+    retry_after = getattr(error, "retry_after", None)
+    response = getattr(error, "response", None)
+    if retry_after is None and response is not None:
+        try:
+            retry_after = float(response.headers.get("retry-after"))
+        except (TypeError, ValueError):
+            retry_after = None
+    
+    return max(backoff, retry_after or 0.0)
 
 
 class GroqAnalysisService:
     """Service for analyzing search results using Groq API."""
     
-    def __init__(self, api_key=None):
-        """Initialize Groq analysis service."""
+    def __init__(self, api_key=None, client=None):
+        """
+        Initialize Groq analysis service.
+        
+        Args:
+            api_key: Groq API key (uses config if not provided)
+            client: Object exposing ``chat.completions.create`` to use instead
+                of a real ``Groq`` client (e.g. a recording or simulated client)
+        """
         self.api_key = api_key or config.GROQ_API_KEY
+        self._owns_client = False
+        self.client = self._create_client(client)
+        self.model = config.GROQ_MODEL
+        self.fast_model = config.GROQ_FAST_MODEL
+        self.cascade = config.MODEL_CASCADE and self.fast_model not in ("", self.model)
+        # Recorded, replayed and synthetic runs neither read nor fill the live cache
+        self.cache = DiskCache(
+            config.CACHE_PATH,
+            namespace="llm",
+            ttl_seconds=config.LLM_CACHE_TTL if config.API_MODE == "live" else 0,
+            max_entries=config.LLM_CACHE_MAX_ENTRIES
+        )
+        self.limiter = DualTokenBucket(config.GROQ_RPM, config.GROQ_TPM)
+        self._init_call_stats()
+    
+    def _create_client(self, client=None):
+        """Use an injected client, or create a ``Groq`` client from the API key (None without one)."""
+        if client is not None:
+            return client
         if not self.api_key:
             print("Warning: Groq API key not configured. Analysis functionality will be limited.")
-            self.client = None
-        else:
-            self.client = Groq(api_key=self.api_key)
-        self.model = "llama-3.1-70b-versatile"
+            return None
+        # Retries are handled here, in step with admission control
+        self._owns_client = True
+        return Groq(api_key=self.api_key, max_retries=0)
     
-    def extract_entities(self, text: str) -> Dict[str, Any]:
+    def analyze_result(self, text: str, company_name: str = None) -> Dict[str, Any]:
         """
-        Extract entities from text including companies, job titles, and locations.
+        Extract entities and detect hiring signals in a single LLM call.
+        
+        Answers are cached by (model, prompt version, text hash), so reruns
+        and identical syndicated postings do not call Groq again. A response
+        that is not valid JSON yields the empty analysis; a call that keeps
+        failing raises ``GroqUnavailableError`` instead, so the result is
+        not marked processed with nothing extracted. Blocking wrapper around
+        ``analyze_result_async``.
         
         Args:
             text: Text to analyze
+            company_name: Company the text is about, if already known
             
         Returns:
-            Dictionary with extracted entities
+            Dictionary with "entities" and "signals" sub-dictionaries
+        """
+        return asyncio.run(self.analyze_result_async(text, company_name))
+    
+    async def analyze_result_async(self, text: str, company_name: str = None, client=None) -> Dict[str, Any]:
+        """
+        Analyze one document, escalating through the model tiers if needed.
+        
+        With MODEL_CASCADE enabled the fast model answers first; the large
+        model is only called when that answer is invalid JSON, has no
+        company, or reports a signal below CASCADE_CONFIDENCE_THRESHOLD.
+        
+        Args:
+            text: Text to analyze
+            company_name: Company the text is about, if already known
+            client: ``AsyncGroq`` client to use (the sync client runs in a thread if not provided)
+            
+        Returns:
+            Dictionary with "entities" and "signals" sub-dictionaries
+        """
+        return await self._analyze_single_async(text, company_name, client, self._tiers())
+    
+    async def _analyze_single_async(
+        self,
+        text: str,
+        company_name: str,
+        client,
+        tiers: List[str],
+        lookup: bool = True,
+        method: str = "analyze"
+    ) -> Dict[str, Any]:
+        """
+        Analyze one document, trying each model in ``tiers`` until an answer is trusted.
+        
+        ``lookup=False`` skips the cache lookup for callers that already missed;
+        ``method`` labels the calls in the call log.
         """
         if not self.client:
-            print("Warning: Groq client not initialized. Returning empty entities.")
-            return {
-                "company_name": None,
-                "job_title": None,
-                "role_type": None,
-                "location": None,
-                "keywords": []
-            }
-        
-        prompt = f"""Analyze the following text and extract structured information about job opportunities in security, compliance, or GRC roles.
-
-Extract:
-- company_name: Name of the company (if mentioned)
-- job_title: Job title or role
-- role_type: Classify as "security", "compliance", or "GRC"
-- location: Job location
-- keywords: List of relevant keywords (e.g., "CISO", "data protection", "risk management")
+            print("Warning: Groq client not initialized. Returning empty analysis.")
+            return {"entities": empty_entities(), "signals": empty_signals()}
+        
+        cache_key = self._analysis_cache_key(text, company_name)
+        cached = self.cache.get(cache_key) if lookup else None
+        if cached is not None:
+            return cached
+        
+        start = time.perf_counter()
+        analysis = None
+        for model in tiers:
+            try:
+                answer = await self._chat_json_async(
+                    client,
+                    system=ANALYSIS_SYSTEM_PROMPT,
+                    prompt=self._single_prompt(text, company_name),
+                    temperature=0.1,
+                    max_tokens=ANALYSIS_MAX_TOKENS,
+                    model=model,
+                    method=method
+                )
+                analysis = normalize_analysis(answer) if isinstance(answer, dict) else None
+            except ValueError:
+                analysis = None
+            
+            if not self._needs_escalation(model, analysis):
+                break
+        
+        if analysis is None:
+            print("Error analyzing text: response was not a valid JSON object")
+            return {"entities": empty_entities(), "signals": empty_signals()}
+        
+        self.cache.set(cache_key, analysis, cost=time.perf_counter() - start)
+        return analysis
+    
+    def analyze_batch(
+        self,
+        items: List[Tuple[Any, str]],
+        token_budget: int = None,
+        batch_size: int = None,
+        max_in_flight: int = None,
+        rejected: Dict[Any, str] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Analyze several documents, packing them into concurrent LLM calls.
+        
+        Blocking wrapper around ``analyze_batch_async``.
+        
+        Args:
+            items: (id, text) pairs
+            token_budget: Estimated prompt tokens per call (uses LLM_BATCH_TOKEN_BUDGET if not provided)
+            batch_size: Documents per call (uses LLM_BATCH_SIZE if not provided)
+            max_in_flight: Concurrent calls (uses GROQ_MAX_IN_FLIGHT if not provided)
+            rejected: Filled with the ids Groq rejected even on their own, and the error
+            
+        Returns:
+            Dictionary mapping ids to analyses (ids whose calls kept failing are left out)
+        """
+        return asyncio.run(self.analyze_batch_async(items, token_budget, batch_size, max_in_flight, rejected))
+    
+    async def analyze_batch_async(
+        self,
+        items: List[Tuple[Any, str]],
+        token_budget: int = None,
+        batch_size: int = None,
+        max_in_flight: int = None,
+        rejected: Dict[Any, str] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Analyze several documents per LLM call, with several calls in flight.
+        
+        Documents are tagged with their id and packed into prompts up to
+        ``token_budget`` estimated prompt tokens. The model answers with a
+        JSON array keyed by id; items missing from the answer fall back to
+        single calls. Calls are admitted under the GROQ_RPM/GROQ_TPM limits
+        and retried on 429/5xx. Items whose calls still fail are left out
+        of the result so the caller can retry them later; a failing batch
+        never discards the answers of the others. A packed call Groq
+        rejects as invalid falls back to single calls, and items rejected
+        on their own are reported in ``rejected`` so the caller can stop
+        retrying them.
+        
+        Args:
+            items: (id, text) pairs
+            token_budget: Estimated prompt tokens per call (uses LLM_BATCH_TOKEN_BUDGET if not provided)
+            batch_size: Documents per call (uses LLM_BATCH_SIZE if not provided)
+            max_in_flight: Concurrent calls (uses GROQ_MAX_IN_FLIGHT if not provided)
+            rejected: Filled with the ids Groq rejected even on their own, and the error
+            
+        Returns:
+            Dictionary mapping ids to analyses
+        """
+        if token_budget is None:
+            token_budget = config.LLM_BATCH_TOKEN_BUDGET
+        
+        analyses = {}
+        pending = []
+        for item_id, text in items:
+            cached = self.cache.get(self._analysis_cache_key(text)) if self.client else None
+            if cached is not None:
+                analyses[item_id] = cached
+            else:
+                pending.append((item_id, text))
+        
+        if not pending:
+            return analyses
+        if not self.client:
+            for item_id, text in pending:
+                analyses[item_id] = await self.analyze_result_async(text)
+            return analyses
+        
+        semaphore = asyncio.Semaphore(max(1, max_in_flight or config.GROQ_MAX_IN_FLIGHT))
+        client = self._create_async_client()
+        
+        if rejected is None:
+            rejected = {}
+        
+        async def run(batch):
+            async with semaphore:
+                return await self._analyze_batch_async(batch, client, rejected)
+        
+        try:
+            batches = self._pack_batches(pending, token_budget, batch_size)
+            outcomes = await asyncio.gather(*(run(batch) for batch in batches), return_exceptions=True)
+            for batch, outcome in zip(batches, outcomes):
+                if isinstance(outcome, Exception):
+                    print(f"Error analyzing batch of {len(batch)} documents, leaving them for the next run: {outcome}")
+                    continue
+                analyses.update(outcome)
+        finally:
+            if client is not None:
+                await client.close()
+        
+        return analyses
+    
+    def _pack_batches(
+        self,
+        items: List[Tuple[Any, str]],
+        token_budget: int,
+        batch_size: int = None
+    ) -> List[List[Tuple[Any, str]]]:
+        """Group items so each prompt stays within the token and output budgets."""
+        batch_size = batch_size or config.LLM_BATCH_SIZE
+        max_items = max(1, min(batch_size, ANALYSIS_BATCH_MAX_OUTPUT // ANALYSIS_ITEM_TOKENS))
+        
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for item_id, text in items:
+            tokens = estimate_tokens(text)
+            if batch and (batch_tokens + tokens > token_budget or len(batch) >= max_items):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append((item_id, text))
+            batch_tokens += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def _analyze_batch_async(
+        self,
+        batch: List[Tuple[Any, str]],
+        client,
+        rejected: Dict[Any, str]
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Analyze one packed batch through the model tiers.
+        
+        Answers the fast model was unsure of are re-analyzed together by
+        the large model. Items no packed call answered, including every
+        item of a packed call Groq rejected, fall back to single calls;
+        items rejected on their own are added to ``rejected``.
+        """
+        answered = {}
+        escalated = []
+        if len(batch) > 1:
+            first_tier = self._tiers()[0]
+            try:
+                start = time.perf_counter()
+                answered = await self._analyze_packed_async(batch, client, first_tier)
+                escalated = [
+                    (item_id, text) for item_id, text in batch
+                    if item_id in answered and self._needs_escalation(first_tier, answered[item_id])
+                ]
+                for item_id, _ in escalated:
+                    del answered[item_id]
+                if len(escalated) > 1:
+                    answered.update(await self._analyze_packed_async(escalated, client, self.model))
+                cost = (time.perf_counter() - start) / len(batch)
+            except GroqUnavailableError as e:
+                print(f"Groq unavailable, leaving {len(batch)} documents for the next run: {e}")
+                return {}
+            except GroqRequestError as e:
+                # Whatever was answered before the rejection is kept
+                print(f"Groq rejected a batch of {len(batch)} documents, falling back to single calls: {e}")
+                cost = (time.perf_counter() - start) / len(batch)
+            
+            texts = dict(batch)
+            for item_id, analysis in answered.items():
+                self.cache.set(self._analysis_cache_key(texts[item_id]), analysis, cost=cost)
+        
+        escalated_ids = {item_id for item_id, _ in escalated}
+        for item_id, text in batch:
+            if item_id in answered:
+                continue
+            if item_id in escalated_ids:
+                tiers, method = [self.model], "analyze"
+            elif len(batch) > 1:
+                # The packed call did not answer this item
+                tiers, method = self._tiers(), "analyze_fallback"
+                self._count(fallbacks=1)
+            else:
+                tiers, method = self._tiers(), "analyze"
+            try:
+                answered[item_id] = await self._analyze_single_async(
+                    text, None, client, tiers, lookup=False, method=method
+                )
+            except GroqUnavailableError as e:
+                print(f"Groq unavailable, leaving document {item_id} for the next run: {e}")
+            except GroqRequestError as e:
+                print(f"Groq rejected document {item_id}: {e}")
+                rejected[item_id] = str(e)
+        return answered
+    
+    async def _analyze_packed_async(self, batch: List[Tuple[Any, str]], client, model: str) -> Dict[Any, Dict[str, Any]]:
+        """Analyze one packed batch with ``model``; returns only the items it answered."""
+        ids_by_key = {str(item_id): item_id for item_id, _ in batch}
+        documents = "\n\n".join(f"[id={item_id}]\n{text}" for item_id, text in batch)
+        prompt = f"""Analyze each of the following {len(batch)} documents about job opportunities in security, compliance, or GRC roles. Each document starts with an [id=...] tag.
 
-Text: {text}
+{ANALYSIS_INSTRUCTIONS}
+Documents:
 
-Return ONLY a valid JSON object with these fields. If a field is not found, use null.
-"""
+{documents}
+
+Return ONLY a valid JSON array with one object per document. Each object has keys "id" (the document id), "entities" and "signals":
+{ANALYSIS_FORMAT}"""
         
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that extracts structured data from job postings and returns valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
+            answer = await self._chat_json_async(
+                client,
+                system=ANALYSIS_SYSTEM_PROMPT,
+                prompt=prompt,
                 temperature=0.1,
-                max_tokens=500
+                max_tokens=min(ANALYSIS_ITEM_TOKENS * len(batch), ANALYSIS_BATCH_MAX_OUTPUT),
+                model=model,
+                method="analyze_batch"
             )
+        except ValueError as e:
+            print(f"Error analyzing batch of {len(batch)} documents, falling back to single calls: {e}")
+            return {}
+        
+        if isinstance(answer, dict):
+            answer = answer.get("results") or answer.get("documents") or []
+        
+        answered = {}
+        for entry in answer if isinstance(answer, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            item_id = ids_by_key.get(str(entry.get("id")))
+            if item_id is not None and isinstance(entry.get("entities"), dict):
+                answered[item_id] = normalize_analysis(entry)
+        return answered
+    
+    @staticmethod
+    def _single_prompt(text: str, company_name: str = None) -> str:
+        """Build the analysis prompt for one document."""
+        company_hint = f" The text is about {company_name}." if company_name else ""
+        return f"""Analyze the following text about job opportunities in security, compliance, or GRC roles.{company_hint}
+
+{ANALYSIS_INSTRUCTIONS}
+Text: {text}
+
+Return ONLY a valid JSON object with two keys, "entities" and "signals":
+{ANALYSIS_FORMAT}"""
+    
+    def _analysis_cache_key(self, text: str, company_name: str = None) -> str:
+        """Cache key for an analysis: model tiers, prompt version and a hash of the input."""
+        text_hash = hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+        return make_cache_key("+".join(self._tiers()), ANALYSIS_PROMPT_VERSION, text_hash, company_name)
+    
+    def _tiers(self) -> List[str]:
+        """Models to try for an analysis, in order."""
+        return [self.fast_model, self.model] if self.cascade else [self.model]
+    
+    def _needs_escalation(self, model: str, analysis: Optional[Dict[str, Any]]) -> bool:
+        """
+        Check whether an answer from ``model`` should be redone by the large model.
+        
+        Only answers from the fast model in cascade mode are escalated; the
+        reason is counted in ``escalations``.
+        """
+        if not self.cascade or model != self.fast_model:
+            return False
+        
+        if analysis is None:
+            reason = "invalid_json"
+        elif not analysis["entities"].get("company_name"):
+            reason = "missing_company"
+        elif analysis["signals"].get("has_signal") and (
+            (analysis["signals"].get("confidence") or 0.0) < config.CASCADE_CONFIDENCE_THRESHOLD
+        ):
+            reason = "low_confidence"
+        else:
+            return False
+        
+        with self._stats_lock:
+            self.escalations[reason] += 1
+        return True
+    
+    def extract_entities(self, text: str) -> Dict[str, Any]:
+        """
+        Extract entities from text including companies, job titles, and locations.
+        
+        Args:
+            text: Text to analyze
             
-            result_text = response.choices[0].message.content.strip()
-            
-            # Try to extract JSON from the response
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
-            
-            entities = json.loads(result_text)
-            return entities
-            
-        except Exception as e:
-            print(f"Error extracting entities: {e}")
-            return {
-                "company_name": None,
-                "job_title": None,
-                "role_type": None,
-                "location": None,
-                "keywords": []
-            }
+        Returns:
+            Dictionary with extracted entities
+        """
+        return self.analyze_result(text)["entities"]
     
     def detect_hiring_signals(self, text: str, company_name: str) -> Dict[str, Any]:
         """
@@ -102,78 +577,278 @@ Return ONLY a valid JSON object with these fields. If a field is not found, use
         Returns:
             Dictionary with hiring signals
         """
-        if not self.client:
-            return {
-                "has_signal": False,
-                "signal_type": "none",
-                "confidence": 0.0,
-                "description": ""
-            }
+        return self.analyze_result(text, company_name)["signals"]
+    
+    def _request(self, system: str, prompt: str, temperature: float, max_tokens: int, model: str = None) -> Dict[str, Any]:
+        """Build chat completion arguments."""
+        return {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "model": model or self.model,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+    
+    def _chat(
+        self,
+        system: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        model: str = None,
+        method: str = "chat"
+    ) -> str:
+        """Send one chat completion under admission control and return the response text."""
+        return self._call(system, prompt, temperature, max_tokens, model, method)[0]
+    
+    def _call(
+        self,
+        system: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        model: str = None,
+        method: str = "chat"
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Send one chat completion; return the response text and its call record."""
+        request = self._request(system, prompt, temperature, max_tokens, model)
+        prompt_tokens = estimate_tokens(system + prompt)
+        estimated = prompt_tokens + max_tokens
+        record = self._start_call(method, request["model"], prompt_tokens)
         
-        prompt = f"""Analyze the following text about {company_name} and identify hiring signals that suggest they may need security or compliance leadership.
-
-Look for signals like:
-- Company expansion or growth
-- Recent funding rounds
-- Security breaches or incidents
-- New compliance requirements
-- Regulatory changes affecting the company
-- Product launches requiring security expertise
-
-Text: {text}
-
-Return ONLY a valid JSON object with:
-- has_signal: boolean indicating if hiring signals were detected
-- signal_type: one of ["expansion", "funding", "breach", "compliance_news", "regulatory", "product_launch", "none"]
-- confidence: float between 0 and 1
-- description: brief description of the signal
-
-Return valid JSON only.
-"""
+        attempt = 0
+        while True:
+            self.limiter.acquire(estimated)
+            start = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(**request)
+            except Exception as e:
+                record["latency_seconds"] = time.perf_counter() - start
+                time.sleep(self._retry_after_failure(e, attempt, record))
+                attempt += 1
+                continue
+            record["latency_seconds"] = time.perf_counter() - start
+            return self._response_text(response, record, estimated), record
+    
+    async def _call_async(
+        self,
+        client,
+        system: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        model: str = None,
+        method: str = "chat"
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Async version of ``_call`` (uses the sync client in a thread if ``client`` is None)."""
+        request = self._request(system, prompt, temperature, max_tokens, model)
+        prompt_tokens = estimate_tokens(system + prompt)
+        estimated = prompt_tokens + max_tokens
+        record = self._start_call(method, request["model"], prompt_tokens)
         
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async(estimated)
+            start = time.perf_counter()
+            try:
+                if client is not None:
+                    response = await client.chat.completions.create(**request)
+                else:
+                    response = await asyncio.to_thread(self.client.chat.completions.create, **request)
+            except Exception as e:
+                record["latency_seconds"] = time.perf_counter() - start
+                await asyncio.sleep(self._retry_after_failure(e, attempt, record))
+                attempt += 1
+                continue
+            record["latency_seconds"] = time.perf_counter() - start
+            return self._response_text(response, record, estimated), record
+    
+    def _chat_json(
+        self,
+        system: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        model: str = None,
+        method: str = "chat"
+    ) -> Any:
+        """Send one chat completion and parse the response as JSON."""
+        return self._parse_json(*self._call(system, prompt, temperature, max_tokens, model, method))
+    
+    async def _chat_json_async(
+        self,
+        client,
+        system: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: int,
+        model: str = None,
+        method: str = "chat"
+    ) -> Any:
+        """Async version of ``_chat_json``."""
+        return self._parse_json(
+            *await self._call_async(client, system, prompt, temperature, max_tokens, model, method)
+        )
+    
+    def _parse_json(self, text: str, record: Dict[str, Any]) -> Any:
+        """Parse a response as JSON, marking its call record on failure."""
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that analyzes company news for hiring signals and returns valid JSON."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
-                temperature=0.2,
-                max_tokens=300
-            )
-            
-            result_text = response.choices[0].message.content.strip()
-            
-            # Try to extract JSON from the response
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0].strip()
-            
-            signals = json.loads(result_text)
-            return signals
-            
+            return parse_json_response(text)
+        except ValueError:
+            with self._stats_lock:
+                record["status"] = "parse_error"
+                self.call_stats["parse_errors"] += 1
+            raise
+    
+    def _retry_after_failure(self, error: Exception, attempt: int, record: Dict[str, Any]) -> float:
+        """
+        Handle a failed call: return the backoff before the next attempt.
+        
+        Requests Groq rejects as invalid (400/413/422) raise
+        ``GroqRequestError``; other non-retryable errors (e.g. 401/404) are
+        re-raised; retryable ones raise ``GroqUnavailableError`` once
+        GROQ_MAX_RETRIES is used up. Either way the call is logged as
+        failed. A 429 pauses admission for every caller sharing this service
+        instead of sleeping only the failed caller.
+        """
+        delay = retry_delay(error, attempt)
+        if delay is None:
+            self._count(failed=1)
+            self._finish_call(record, "failed")
+            if getattr(error, "status_code", None) in REJECTED_STATUS_CODES:
+                raise GroqRequestError(str(error)) from error
+            raise error
+        if attempt >= config.GROQ_MAX_RETRIES:
+            self._count(failed=1)
+            self._finish_call(record, "failed")
+            raise GroqUnavailableError(f"{error} (after {attempt} retries)") from error
+        
+        rate_limited = getattr(error, "status_code", None) == 429
+        self._count(retries=1, rate_limited=int(rate_limited))
+        record["retries"] += 1
+        if rate_limited:
+            # Admission control holds back this and every other caller
+            self.limiter.pause(delay)
+            return 0.0
+        return delay
+    
+    def _response_text(self, response, record: Dict[str, Any], estimated: int) -> str:
+        """
+        Record a completed call and return its text.
+        
+        Token counts come from the response's usage report when present,
+        otherwise from the local estimate.
+        
+        Args:
+            response: Chat completion
+            record: Call record from ``_start_call``
+            estimated: Tokens charged to admission control (prompt plus max_tokens)
+        """
+        text = response.choices[0].message.content.strip()
+        usage = getattr(response, "usage", None)
+        sent = getattr(usage, "prompt_tokens", None) or record["estimated_prompt_tokens"]
+        received = getattr(usage, "completion_tokens", None) or estimate_tokens(text)
+        
+        self.limiter.settle(estimated, sent + received)
+        self._count(calls=1, prompt_tokens=sent, completion_tokens=received)
+        with self._stats_lock:
+            tier = self.tier_stats.setdefault(record["model"], {"calls": 0, "seconds": 0.0})
+            tier["calls"] += 1
+            tier["seconds"] += record["latency_seconds"]
+        record["prompt_tokens"] = sent
+        record["completion_tokens"] = received
+        self._finish_call(record, "ok")
+        return text
+    
+    def _start_call(self, method: str, model: str, prompt_tokens: int) -> Dict[str, Any]:
+        """Open a call record (added to ``call_log`` when the call finishes)."""
+        return {
+            "run_id": self.run_id,
+            "method": method,
+            "model": model,
+            "status": "pending",
+            "latency_seconds": 0.0,
+            "wall_seconds": 0.0,
+            "retries": 0,
+            "prompt_tokens": 0,
+            "estimated_prompt_tokens": prompt_tokens,
+            "completion_tokens": 0,
+            "cost_usd": 0.0,
+            "started": time.perf_counter(),
+        }
+    
+    def _finish_call(self, record: Dict[str, Any], status: str):
+        """Close a call record and queue it for ``save_call_log``."""
+        record["status"] = status
+        record["wall_seconds"] = time.perf_counter() - record.pop("started")
+        record["cost_usd"] = call_cost(record["model"], record["prompt_tokens"], record["completion_tokens"])
+        record["created_at"] = utc_now()
+        with self._stats_lock:
+            self.call_log.append(record)
+            self._unsaved_calls.append(record)
+    
+    def save_call_log(self) -> int:
+        """
+        Persist the calls made since the last save to the ``llm_calls`` table.
+        
+        Returns:
+            Number of calls saved
+        """
+        with self._stats_lock:
+            records, self._unsaved_calls = self._unsaved_calls, []
+        try:
+            return save_calls(records)
         except Exception as e:
-            print(f"Error detecting hiring signals: {e}")
-            return {
-                "has_signal": False,
-                "signal_type": "none",
-                "confidence": 0.0,
-                "description": ""
-            }
+            print(f"Warning: could not save LLM call log ({str(e).splitlines()[0]})")
+            return 0
+    
+    def _init_call_stats(self):
+        """Set up the run id, call counters, call log and escalation counts."""
+        self.call_stats = {
+            "calls": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failed": 0,
+            "parse_errors": 0,
+            "fallbacks": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+        self.run_id = uuid.uuid4().hex[:12]
+        self.call_log = deque(maxlen=CALL_LOG_SIZE)
+        self._unsaved_calls = []
+        self.tier_stats = {}
+        self.escalations = {reason: 0 for reason in ESCALATION_REASONS}
+        self._stats_lock = threading.Lock()
+    
+    def _count(self, **counts: int):
+        """Add to the call counters."""
+        with self._stats_lock:
+            for name, value in counts.items():
+                self.call_stats[name] += value
+    
+    def _create_async_client(self):
+        """Create an ``AsyncGroq`` client for a batch run (None for injected clients)."""
+        if not self._owns_client:
+            return None
+        return AsyncGroq(api_key=self.api_key, max_retries=0)
     
     def score_company(self, company_data: Dict[str, Any]) -> float:
         """
         Score a company based on job postings and hiring signals.
         
         Args:
-            company_data: Dictionary with company information including opportunities and signals
+            company_data: Dictionary with company information including opportunities and
+                signals; aggregated inputs may give "average_signal_confidence"
+                instead of the "signals" list
             
         Returns:
             Score between 0 and 100
@@ -188,8 +863,10 @@ Return valid JSON only.
         
         # Hiring signals (weight: 0.3)
         signals = company_data.get("signals", [])
-        if signals:
+        avg_confidence = company_data.get("average_signal_confidence")
+        if avg_confidence is None and signals:
             avg_confidence = sum(s.get("confidence", 0) for s in signals) / len(signals)
+        if avg_confidence:
             score += avg_confidence * 100 * weights["hiring_signals"]
         
         # Company growth indicators (weight: 0.2)
@@ -243,25 +920,14 @@ Keep it concise and actionable.
 """
         
         try:
-            response = self.client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that creates concise executive summaries."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                model=self.model,
+            return self._chat(
+                system="You are a helpful assistant that creates concise executive summaries.",
+                prompt=prompt,
                 temperature=0.3,
-                max_tokens=200
+                max_tokens=200,
+                method="summarize"
             )
             
-            summary = response.choices[0].message.content.strip()
-            return summary
-            
         except Exception as e:
             print(f"Error creating summary: {e}")
             return f"Found {len(results)} companies with opportunities."
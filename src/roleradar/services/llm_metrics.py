@@ -0,0 +1,168 @@
+"""Per-call LLM instrumentation: cost estimates, persistence and usage reports."""
+
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import case, desc, func
+from ..database import db_service
+from ..models import LLMCall
+from ..models.database import utc_now
+
+# USD per million (prompt, completion) tokens, from Groq's published pricing
+MODEL_PRICES = {
+    "llama-3.1-70b-versatile": (0.59, 0.79),
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "llama-3.1-8b-instant": (0.05, 0.08),
+    "llama3-70b-8192": (0.59, 0.79),
+    "llama3-8b-8192": (0.05, 0.08),
+    "mixtral-8x7b-32768": (0.24, 0.24),
+    "gemma2-9b-it": (0.20, 0.20),
+}
+
+# Runs listed in a usage report
+RECENT_RUNS = 10
+
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimate the cost of a call in USD (0 for models without a known price)."""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def summarize_calls(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate call records per (method, model).
+    
+    Args:
+        records: Call records as kept in ``GroqAnalysisService.call_log``
+    
+    Returns:
+        One row per method and model, in the shape ``usage_report`` uses
+    """
+    rows = {}
+    for record in records:
+        row = rows.get((record["method"], record["model"]))
+        if row is None:
+            row = rows[(record["method"], record["model"])] = _empty_row(record["method"], record["model"])
+        row["calls"] += 1
+        row["failed"] += record["status"] == "failed"
+        row["parse_errors"] += record["status"] == "parse_error"
+        row["retries"] += record["retries"]
+        row["latency_seconds"] += record["latency_seconds"]
+        row["prompt_tokens"] += record["prompt_tokens"]
+        row["completion_tokens"] += record["completion_tokens"]
+        row["cost_usd"] += record["cost_usd"]
+    return [_finish_row(row) for row in rows.values()]
+
+
+def save_calls(records: List[Dict[str, Any]]) -> int:
+    """
+    Persist call records to the ``llm_calls`` table.
+    
+    Args:
+        records: Call records as kept in ``GroqAnalysisService.call_log``
+    
+    Returns:
+        Number of records saved
+    """
+    if not records:
+        return 0
+    columns = {column.name for column in LLMCall.__table__.columns} - {"id"}
+    with db_service.get_session() as session:
+        session.bulk_insert_mappings(
+            LLMCall,
+            [{key: value for key, value in record.items() if key in columns} for record in records]
+        )
+    return len(records)
+
+
+def usage_report(days: Optional[int] = 30, run_id: str = None) -> Dict[str, Any]:
+    """
+    Aggregate persisted LLM calls.
+    
+    Args:
+        days: Only include calls from the last ``days`` days (all calls if None)
+        run_id: Only include calls from this run
+    
+    Returns:
+        Dictionary with "totals", "by_method" (one row per method and model)
+        and "recent_runs" (the latest runs with their totals)
+    """
+    with db_service.get_session() as session:
+        query = session.query(LLMCall)
+        if days is not None:
+            query = query.filter(LLMCall.created_at >= utc_now() - timedelta(days=days))
+        if run_id is not None:
+            query = query.filter(LLMCall.run_id == run_id)
+        filtered = query.subquery()
+        call = filtered.c
+        
+        aggregates = [
+            func.count(call.id),
+            func.sum(case((call.status == "failed", 1), else_=0)),
+            func.sum(case((call.status == "parse_error", 1), else_=0)),
+            func.coalesce(func.sum(call.retries), 0),
+            func.coalesce(func.sum(call.latency_seconds), 0.0),
+            func.coalesce(func.sum(call.prompt_tokens), 0),
+            func.coalesce(func.sum(call.completion_tokens), 0),
+            func.coalesce(func.sum(call.cost_usd), 0.0),
+        ]
+        by_method = [
+            _finish_row(_row(method, model, values))
+            for method, model, *values in session.query(call.method, call.model, *aggregates)
+            .group_by(call.method, call.model)
+            .order_by(call.method, call.model)
+        ]
+        recent_runs = [
+            dict(_totals_row(values), run_id=run, started_at=started.isoformat())
+            for run, started, *values in session.query(call.run_id, func.min(call.created_at), *aggregates)
+            .group_by(call.run_id)
+            .order_by(desc(func.min(call.created_at)))
+            .limit(RECENT_RUNS)
+        ]
+        totals = _totals_row(session.query(*aggregates).one())
+    
+    return {"days": days, "totals": totals, "by_method": by_method, "recent_runs": recent_runs}
+
+
+def _empty_row(method: Optional[str], model: Optional[str]) -> Dict[str, Any]:
+    """Zeroed aggregate row."""
+    return {
+        "method": method,
+        "model": model,
+        "calls": 0,
+        "failed": 0,
+        "parse_errors": 0,
+        "retries": 0,
+        "latency_seconds": 0.0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cost_usd": 0.0,
+    }
+
+
+def _row(method: Optional[str], model: Optional[str], values: List[Any]) -> Dict[str, Any]:
+    """Aggregate row from the values of a GROUP BY query."""
+    row = _empty_row(method, model)
+    for key, value in zip(
+        ("calls", "failed", "parse_errors", "retries", "latency_seconds",
+         "prompt_tokens", "completion_tokens", "cost_usd"),
+        values
+    ):
+        row[key] = type(row[key])(value or 0)
+    return row
+
+
+def _totals_row(values: List[Any]) -> Dict[str, Any]:
+    """Aggregate row without the method and model keys."""
+    row = _finish_row(_row(None, None, values))
+    del row["method"], row["model"]
+    return row
+
+
+def _finish_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace the latency sum with an average and round the cost."""
+    row = dict(row)
+    total_latency = row.pop("latency_seconds")
+    row["average_latency"] = round(total_latency / row["calls"], 3) if row["calls"] else 0.0
+    row["cost_usd"] = round(row["cost_usd"], 6)
+    return row
@@ -0,0 +1,339 @@
+"""Deterministic local extraction backend for bulk backfills without an LLM."""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..config import config
+from ..database import db_service
+from ..models import Company
+from ..utils import KeywordMatcher
+from .cache import DiskCache
+from .groq_service import GroqAnalysisService, empty_entities, empty_signals
+from .rate_limiter import DualTokenBucket
+from .relevance import DOMAIN_TERMS, role_keywords
+
+LOCAL_MODEL = "local-extractor"
+
+# Signal vocabulary per signal type, in tie-break order
+SIGNAL_TAXONOMY = {
+    "breach": [
+        "data breach", "breach", "breached", "ransomware", "cyberattack", "cyber attack",
+        "security incident", "hacked", "leaked", "compromised",
+    ],
+    "funding": [
+        "raises", "raised", "funding", "funding round", "series a", "series b", "series c", "series d",
+        "seed round", "venture funding", "investment led by", "valuation",
+    ],
+    "regulatory": [
+        "regulation", "regulatory", "regulator", "fined", "penalty", "gdpr", "nis2", "dora",
+        "sec rule", "hipaa", "ccpa", "enforcement action",
+    ],
+    "compliance_news": [
+        "soc 2", "iso 27001", "fedramp", "pci dss", "audit", "certification", "attestation",
+        "compliance program",
+    ],
+    "expansion": [
+        "expand", "expands", "expansion", "new office", "opens office", "headcount", "growing team",
+        "acquires", "acquired", "acquisition", "ipo", "goes public",
+    ],
+    "product_launch": [
+        "launches", "launched", "unveils", "introduces", "new product", "general availability",
+    ],
+}
+
+# Role taxonomy: words that classify a role title
+ROLE_TYPE_TERMS = {
+    "GRC": ["grc", "governance", "risk", "audit"],
+    "compliance": ["compliance", "privacy", "data protection", "dpo", "regulatory"],
+    "security": ["security", "cybersecurity", "infosec", "ciso", "cso", "soc", "appsec"],
+}
+
+# Sites whose names show up where an employer's name usually is
+NOT_COMPANIES = {
+    "linkedin", "indeed", "glassdoor", "ziprecruiter", "monster", "dice", "simplyhired",
+    "careerbuilder", "google", "google jobs", "remote", "hybrid", "usa", "us", "uk",
+    "the", "we", "our", "join", "about", "apply", "careers", "jobs", "new", "senior",
+}
+
+_NAME = r"[A-Z][\w&'.-]*(?:\s+(?:[A-Z][\w&'.-]*|&|of|and|de))*"
+_COMPANY_PATTERNS = [
+    re.compile(rf"\b(?:[Aa]t|[Jj]oin|[Ww]ith|[Ff]or)\s+({_NAME})\s*(?:[,.!;(|-]|$|\s(?:is|are|in|as)\b)"),
+    re.compile(rf"\b({_NAME})\s+(?:is|are)\s+(?:hiring|looking|seeking|recruiting|growing)\b"),
+    re.compile(rf"\b({_NAME})\s+(?:raises|raised|announces|announced|appoints|appointed|names|hires|"
+               rf"acquires|expands|launches|unveils|suffers|discloses|confirms)\b"),
+    re.compile(rf"^[^|\-–]+[|\-–]\s*({_NAME})\s*(?:[|\-–]|$)"),
+]
+_COMPANY_SUFFIX_RE = re.compile(
+    r"\b([A-Z][\w&'.-]*(?:\s+[A-Z][\w&'.-]*){0,3}\s+(?:Inc|LLC|Ltd|Corp|Corporation|GmbH|PLC|Co)\b\.?)"
+)
+
+_SENIORITY = r"(?:(?:Senior|Sr\.?|Junior|Jr\.?|Lead|Principal|Staff|Associate|Head of|Director of|VP of|Vice President of|Chief)\s+)?"
+_TITLE_NOUN = r"(?:Engineer|Analyst|Architect|Officer|Manager|Director|Specialist|Consultant|Lead|Auditor|Administrator|Advisor)"
+_TITLE_RE = re.compile(
+    rf"\b({_SENIORITY}(?:[A-Z][A-Za-z0-9&/-]*\s+){{0,3}}{_TITLE_NOUN}|"
+    rf"Chief [A-Z][a-z]+ (?:[A-Z][a-z]+ )?Officer|CISO|CSO|DPO|Head of [A-Z][A-Za-z ]+?(?=[,.;(]|\s(?:at|in|to)\b))"
+)
+_LOCATION_RE = re.compile(
+    r"\b(?:in|based in|located in|Location:)\s+"
+    r"([A-Z][a-zA-Z.]+(?:\s[A-Z][a-zA-Z.]+)*,\s*(?:[A-Z]{2}\b|[A-Z][a-z]+(?:\s[A-Z][a-z]+)*))"
+)
+_REMOTE_RE = re.compile(r"\bremote\b", re.IGNORECASE)
+_SENTENCE_RE = re.compile(r"[^.!?]*[.!?]?")
+
+
+class LocalExtractor:
+    """
+    Rule-based entity and signal extraction.
+    
+    Companies come from a gazetteer (known companies in the database plus
+    an optional file) and, failing that, from employer patterns such as
+    "X is hiring" or "Job Title at X". Titles are matched with seniority
+    and role-noun patterns and classified with a role taxonomy built from
+    SEARCH_ROLES. Signals are typed by the best-represented signal
+    vocabulary. All keyword lookups share one compiled ``KeywordMatcher``.
+    """
+    
+    def __init__(self, roles: List[str] = None, companies: Iterable[str] = None):
+        """
+        Initialize extractor.
+        
+        Args:
+            roles: Role titles for the taxonomy (uses SEARCH_ROLES if not provided)
+            companies: Gazetteer of known company names (loaded from the
+                database and COMPANY_GAZETTEER_PATH if not provided)
+        """
+        roles = config.SEARCH_ROLES if roles is None else roles
+        if companies is None:
+            companies = self._load_gazetteer()
+        
+        self._companies = {}
+        for name in companies:
+            key = " ".join(name.lower().split())
+            if key and key not in NOT_COMPANIES:
+                self._companies.setdefault(key, name.strip())
+        
+        self._roles = {}
+        for keyword in role_keywords(roles):
+            self._roles[" ".join(keyword.lower().split())] = keyword
+        
+        self._terms = {}
+        for keyword in DOMAIN_TERMS:
+            self._terms[keyword] = ("keyword", None)
+        for signal_type, keywords in SIGNAL_TAXONOMY.items():
+            for keyword in keywords:
+                self._terms.setdefault(keyword, ("signal", signal_type))
+        for keyword in self._roles:
+            self._terms[keyword] = ("role", None)
+        for keyword in self._companies:
+            self._terms.setdefault(keyword, ("company", None))
+        
+        self._matcher = KeywordMatcher(self._terms)
+    
+    @staticmethod
+    def _load_gazetteer() -> List[str]:
+        """Load known company names from the database and the gazetteer file."""
+        names = []
+        path = config.COMPANY_GAZETTEER_PATH
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    names.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+            except OSError as e:
+                print(f"Warning: could not read company gazetteer {path}: {e}")
+        
+        try:
+            with db_service.get_session() as session:
+                names.extend(name for (name,) in session.query(Company.name))
+        except Exception as e:
+            print(f"Warning: could not load known companies: {e}")
+        return names
+    
+    def analyze(self, text: str, company_name: str = None) -> Dict[str, Any]:
+        """
+        Extract entities and hiring signals from a text.
+        
+        Args:
+            text: Text to analyze
+            company_name: Company the text is about, if already known
+        
+        Returns:
+            Dictionary with "entities" and "signals", shaped like the LLM output
+        """
+        text = text or ""
+        matches = self._matcher.find(text)
+        
+        found = {"keyword": [], "role": [], "company": [], "signal": []}
+        signal_hits = {}
+        first_signal_at = None
+        for start, keyword in matches:
+            kind, signal_type = self._terms[keyword]
+            if keyword not in found[kind]:
+                found[kind].append(keyword)
+            if kind == "signal":
+                signal_hits.setdefault(signal_type, set()).add(keyword)
+                if first_signal_at is None:
+                    first_signal_at = start
+        
+        entities = empty_entities()
+        entities["company_name"] = company_name or self._company(text, found["company"])
+        entities["job_title"] = self._job_title(text, found["role"])
+        entities["role_type"] = self._role_type(entities["job_title"], found["role"] + found["keyword"])
+        entities["location"] = self._location(text)
+        entities["keywords"] = found["role"] + found["keyword"]
+        
+        return {"entities": entities, "signals": self._signals(text, signal_hits, first_signal_at)}
+    
+    def _company(self, text: str, gazetteer_hits: List[str]) -> Optional[str]:
+        """Pick the employer: the first gazetteer hit, else the first employer pattern match."""
+        if gazetteer_hits:
+            return self._companies[gazetteer_hits[0]]
+        
+        head = text[:600]
+        for pattern in _COMPANY_PATTERNS:
+            for line in head.splitlines() or [head]:
+                match = pattern.search(line)
+                if match and self._plausible_company(match.group(1)):
+                    return match.group(1).strip(" .-")
+        match = _COMPANY_SUFFIX_RE.search(text)
+        return match.group(1).strip() if match else None
+    
+    def _plausible_company(self, name: str) -> bool:
+        """Reject job boards, generic words and role titles caught by the patterns."""
+        key = " ".join(name.lower().strip(" .-").split())
+        if not key or key in NOT_COMPANIES or key in self._roles:
+            return False
+        return not _TITLE_RE.fullmatch(name.strip(" .-"))
+    
+    def _job_title(self, text: str, role_hits: List[str]) -> Optional[str]:
+        """Find a job title: a titled role pattern in the text, else the first taxonomy role."""
+        for match in _TITLE_RE.finditer(text[:1000]):
+            title = " ".join(match.group(1).split())
+            if any(term in title.lower() for terms in ROLE_TYPE_TERMS.values() for term in terms):
+                return title
+        if not role_hits:
+            return None
+        role = self._roles[role_hits[0]]
+        return role.title() if role.islower() else role
+    
+    @staticmethod
+    def _role_type(job_title: Optional[str], keywords: List[str]) -> Optional[str]:
+        """Classify a role as "security", "compliance" or "GRC"."""
+        for source in ([job_title.lower()] if job_title else []) + [" ".join(keywords)]:
+            for role_type, terms in ROLE_TYPE_TERMS.items():
+                if any(re.search(rf"\b{re.escape(term)}\b", source) for term in terms):
+                    return role_type
+        return None
+    
+    @staticmethod
+    def _location(text: str) -> Optional[str]:
+        """Find a "City, ST" style location, else "Remote"."""
+        match = _LOCATION_RE.search(text)
+        if match:
+            return match.group(1)
+        return "Remote" if _REMOTE_RE.search(text) else None
+    
+    @staticmethod
+    def _signals(text: str, signal_hits: Dict[str, set], first_signal_at: Optional[int]) -> Dict[str, Any]:
+        """Type the strongest signal and describe it with the sentence it appears in."""
+        signals = empty_signals()
+        if not signal_hits:
+            return signals
+        
+        order = list(SIGNAL_TAXONOMY)
+        signal_type = max(signal_hits, key=lambda t: (len(signal_hits[t]), -order.index(t)))
+        hits = len(signal_hits[signal_type])
+        
+        # Match offsets refer to the whitespace-collapsed text
+        normalized = " ".join(text.split())
+        previous_end = normalized.rfind(". ", 0, first_signal_at)
+        sentence_start = previous_end + 2 if previous_end >= 0 else 0
+        sentence = _SENTENCE_RE.match(normalized, sentence_start).group(0).strip()
+        
+        signals.update({
+            "has_signal": True,
+            "signal_type": signal_type,
+            "confidence": round(min(0.9, 0.45 + 0.15 * hits), 2),
+            "description": sentence[:200],
+        })
+        return signals
+
+
+class LocalAnalysisService(GroqAnalysisService):
+    """
+    Analysis backend that runs ``LocalExtractor`` instead of calling Groq.
+    
+    Exposes the ``GroqAnalysisService`` interface (single and batch
+    analysis, scoring, summaries) so the processing service and pipeline
+    can use either backend. Summaries fall back to the built-in text since
+    there is no LLM. Select it per run with ``--backend local``.
+    """
+    
+    def __init__(self, extractor: LocalExtractor = None):
+        """
+        Initialize local analysis service.
+        
+        Args:
+            extractor: Extractor to use (built from config and the database if not provided)
+        """
+        super().__init__()
+        self.model = LOCAL_MODEL
+        self.fast_model = LOCAL_MODEL
+        self.cascade = False
+        # Extraction is cheap and deterministic: no cache, no admission limits
+        self.cache = DiskCache(config.CACHE_PATH, namespace="llm", ttl_seconds=0, max_entries=0)
+        self.limiter = DualTokenBucket(0, 0)
+        self.extractor = extractor or LocalExtractor()
+    
+    def _create_client(self, client=None):
+        """There is no LLM client."""
+        return None
+    
+    def analyze_result(self, text: str, company_name: str = None) -> Dict[str, Any]:
+        """
+        Extract entities and detect hiring signals locally.
+        
+        Args:
+            text: Text to analyze
+            company_name: Company the text is about, if already known
+        
+        Returns:
+            Dictionary with "entities" and "signals" sub-dictionaries
+        """
+        return self.extractor.analyze(text, company_name)
+    
+    async def analyze_result_async(self, text: str, company_name: str = None, client=None) -> Dict[str, Any]:
+        """Async version of ``analyze_result`` (runs inline; extraction is CPU-bound and fast)."""
+        return self.extractor.analyze(text, company_name)
+    
+    def analyze_batch(
+        self,
+        items: List[Tuple[Any, str]],
+        token_budget: int = None,
+        batch_size: int = None,
+        max_in_flight: int = None,
+        rejected: Dict[Any, str] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """
+        Analyze several documents locally.
+        
+        Args:
+            items: (id, text) pairs
+            token_budget: Ignored (kept for interface compatibility)
+            batch_size: Ignored (kept for interface compatibility)
+            max_in_flight: Ignored (kept for interface compatibility)
+            rejected: Ignored (local extraction never rejects a document)
+        
+        Returns:
+            Dictionary mapping each id to its analysis
+        """
+        return {item_id: self.extractor.analyze(text) for item_id, text in items}
+    
+    async def analyze_batch_async(
+        self,
+        items: List[Tuple[Any, str]],
+        token_budget: int = None,
+        batch_size: int = None,
+        max_in_flight: int = None,
+        rejected: Dict[Any, str] = None
+    ) -> Dict[Any, Dict[str, Any]]:
+        """Async version of ``analyze_batch``."""
+        return self.analyze_batch(items)
@@ -0,0 +1,198 @@
+"""Streaming search -> analysis -> storage pipeline."""
+
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Tuple
+from ..config import config
+from ..models import SearchResult
+from .processing_service import ProcessingService
+from .tavily_service import TavilySearchService
+
+# Queue sentinel telling a stage to shut down
+_DONE = object()
+
+
+class SearchProcessPipeline:
+    """
+    Run searches and processing as overlapping stages.
+    
+    Search results flow as soon as they are stored through a bounded queue
+    to a pool of analysis workers, and from there to a single writer
+    thread that owns all database and graph writes. Each worker takes the
+    results waiting in the queue as a micro-batch and analyzes it through
+    the same packed, concurrent LLM calls as 'process'. LLM capacity is
+    used while searches are still running, and the bounded queues apply
+    backpressure to the faster stage. Results are claimed before they are
+    queued, so a concurrent 'process' run or pipeline never analyzes the
+    same result.
+    """
+    
+    def __init__(
+        self,
+        tavily: TavilySearchService = None,
+        processor: ProcessingService = None,
+        workers: int = None,
+        queue_size: int = None,
+        batch_size: int = None
+    ):
+        """
+        Initialize pipeline.
+        
+        Args:
+            tavily: Search service (created if not provided)
+            processor: Processing service (created if not provided)
+            workers: Number of analysis workers (uses PIPELINE_WORKERS if not provided)
+            queue_size: Capacity of each inter-stage queue (uses PIPELINE_QUEUE_SIZE if not provided)
+            batch_size: Results analyzed per LLM call (uses LLM_BATCH_SIZE if not provided)
+        """
+        self.processor = processor or ProcessingService(tavily=tavily)
+        self.tavily = tavily or self.processor.tavily
+        self.workers = workers or config.PIPELINE_WORKERS
+        self.queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+        self.batch_size = batch_size or config.LLM_BATCH_SIZE
+    
+    def run(self, queries: List[str] = None, backlog_limit: int = 100) -> Dict[str, Any]:
+        """
+        Search and process results in one streaming run.
+        
+        Args:
+            queries: Search queries (uses default if not provided)
+            backlog_limit: Previously stored unprocessed results to process as well
+        
+        Returns:
+            Run report with counts and timings
+        """
+        analysis_queue = queue.Queue(maxsize=self.queue_size)
+        write_queue = queue.Queue(maxsize=self.queue_size)
+        report = {
+            "searched_queries": 0,
+            "queued": 0,
+            "irrelevant": 0,
+            "processed": 0,
+            "errors": 0,
+            "time_to_first_processed": None,
+        }
+        start = time.perf_counter()
+        self.processor.entities.load()
+        
+        claimed_ids = []
+        
+        def enqueue(result_ids: List[int]):
+            # Results another processor holds are left to it
+            queue_results(self.tavily.claim_results(result_ids))
+        
+        def queue_results(results: List[SearchResult]):
+            claimed_ids.extend(result.id for result in results)
+            relevant = self.processor.filter_relevant(results)
+            report["irrelevant"] += len(results) - len(relevant)
+            for result in relevant:
+                analysis_queue.put(result)
+                report["queued"] += 1
+        
+        # Workers share the GROQ_MAX_IN_FLIGHT budget of concurrent LLM calls
+        max_in_flight = max(1, config.GROQ_MAX_IN_FLIGHT // self.workers)
+        micro_batch = self.batch_size * max_in_flight
+        
+        def analyze():
+            done = False
+            while not done:
+                batch, done = self._take(analysis_queue, micro_batch)
+                if not batch:
+                    continue
+                try:
+                    ready, _ = self.processor.analyze_chunk(batch, self.batch_size, max_in_flight)
+                except Exception as e:
+                    # Keep draining the queue so producers never block on it
+                    print(f"Error analyzing batch of {len(batch)} results: {e}")
+                    ready = []
+                write_queue.put((ready, len(batch) - len(ready)))
+        
+        def write():
+            while True:
+                item = write_queue.get()
+                if item is _DONE:
+                    break
+                ready, failed = item
+                report["errors"] += failed
+                if not ready:
+                    continue
+                try:
+                    stored = self.processor._persist_batch(ready)
+                except Exception as e:
+                    print(f"Error storing batch of {len(ready)} results: {e}")
+                    stored = 0
+                report["processed"] += stored
+                report["errors"] += len(ready) - stored
+                if stored and report["time_to_first_processed"] is None:
+                    report["time_to_first_processed"] = time.perf_counter() - start
+        
+        analyzers = [threading.Thread(target=analyze, daemon=True) for _ in range(self.workers)]
+        writer = threading.Thread(target=write, daemon=True)
+        for thread in analyzers + [writer]:
+            thread.start()
+        
+        try:
+            # Work left over from earlier runs goes first
+            backlog = self.tavily.get_unprocessed_results(limit=backlog_limit)
+            if backlog:
+                queue_results(backlog)
+            
+            results = self.tavily.daily_search(queries=queries, on_stored=enqueue)
+            report["searched_queries"] = len(results)
+        finally:
+            for _ in analyzers:
+                analysis_queue.put(_DONE)
+            for thread in analyzers:
+                thread.join()
+            write_queue.put(_DONE)
+            writer.join()
+            # Results that failed go back to the shared backlog
+            self.tavily.release_claims(claimed_ids)
+        
+        self.processor.rescore_dirty()
+        if report["processed"]:
+            self.processor.refresh_summary()
+        
+        report["wall_time"] = time.perf_counter() - start
+        report["results_per_second"] = (
+            report["processed"] / report["wall_time"] if report["wall_time"] else 0.0
+        )
+        self._print_report(report)
+        self.processor.report_llm_usage()
+        return report
+    
+    @staticmethod
+    def _take(source: queue.Queue, limit: int) -> Tuple[List[SearchResult], bool]:
+        """
+        Wait for one queued result, then take whatever else is already waiting.
+        
+        Returns:
+            Tuple of (up to ``limit`` results, whether the stop sentinel was reached)
+        """
+        item = source.get()
+        if item is _DONE:
+            return [], True
+        batch = [item]
+        while len(batch) < limit:
+            try:
+                item = source.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                return batch, True
+            batch.append(item)
+        return batch, False
+    
+    @staticmethod
+    def _print_report(report: Dict[str, Any]):
+        """Print a pipeline run report."""
+        first = report["time_to_first_processed"]
+        print("\nPipeline run:")
+        print(f"  Queries searched: {report['searched_queries']}")
+        print(f"  Results processed: {report['processed']} of {report['queued']} "
+              f"({report['errors']} errors, {report['irrelevant']} skipped as irrelevant)")
+        if first is not None:
+            print(f"  Time to first processed result: {first:.2f}s")
+        print(f"  Wall time: {report['wall_time']:.2f}s "
+              f"({report['results_per_second']:.1f} results/sec)")
@@ -1,55 +1,368 @@
 """Processing service for analyzing search results and updating database."""
 
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any
-from sqlalchemy import desc
-from ..models import Company, Opportunity, HiringSignal, SearchResult
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from sqlalchemy import desc, or_, update
+from ..models import Company, Opportunity, HiringSignal, SearchResult, DashboardSummary
 from ..models.graph import GraphDatabase
+from ..config import config
 from ..database import db_service
-from .tavily_service import TavilySearchService
+from ..utils import chunked, prepare_text
+from .tavily_service import ClaimLostError, TavilySearchService
+from .entity_cache import EntityCache, normalize_company_name
 from .groq_service import GroqAnalysisService
+from .llm_metrics import summarize_calls, usage_report
+from .query_planner import QueryPlanner
+from .relevance import RelevanceFilter
+from .scoring import FeatureTable, ScoringEngine, score_features
+
+# Companies included in the executive summary
+SUMMARY_COMPANIES = 10
+
+# Companies rescored per aggregate query and bulk update
+RESCORE_CHUNK = 500
 
 
 class ProcessingService:
     """Service for processing search results and updating database."""
     
-    def __init__(self):
+    def __init__(self, tavily: TavilySearchService = None, groq: GroqAnalysisService = None):
         """Initialize processing service."""
-        self.tavily = TavilySearchService()
-        self.groq = GroqAnalysisService()
+        self.tavily = tavily or TavilySearchService()
+        self.groq = groq or GroqAnalysisService()
         self.graph = GraphDatabase()
+        self.relevance = RelevanceFilter()
+        self.entities = EntityCache()
+        self._company_lock_table = {}
+        self._company_locks_guard = threading.Lock()
+        self._dirty_companies = set()
+        self._scoring_engine = None
     
-    def process_unprocessed_results(self, limit: int = 20):
-        """Process unprocessed search results."""
+    def process_unprocessed_results(self, limit: int = 20, batch_size: int = None, workers: int = None):
+        """
+        Process unprocessed search results.
+        
+        Results that fail the keyword relevance filter are marked processed
+        without an LLM call. Several packed LLM calls run concurrently
+        (GROQ_MAX_IN_FLIGHT). With more than one worker, chunks of results
+        are analyzed and persisted by a thread pool; writes for the same
+        company are serialized. The executive summary is refreshed
+        afterwards if anything was processed.
+        Results are claimed for this processor for PROCESS_LEASE_SECONDS, so
+        concurrent runs share the backlog without analyzing a result twice.
+        Results whose analysis could not be obtained stay unprocessed, their
+        claim is released, and they are picked up again by the next run.
+        
+        Args:
+            limit: Maximum number of results to process
+            batch_size: Results analyzed per LLM call (uses LLM_BATCH_SIZE if not provided)
+            workers: Worker threads (uses PROCESS_WORKERS if not provided)
+        """
+        if batch_size is None:
+            batch_size = config.LLM_BATCH_SIZE
+        workers = max(1, workers or config.PROCESS_WORKERS)
+        
         results = self.tavily.get_unprocessed_results(limit=limit)
+        claimed_ids = [result.id for result in results]
         
         print(f"Processing {len(results)} unprocessed results...")
+        start = time.perf_counter()
+        try:
+            results = self.filter_relevant(results)
+            if results:
+                self.entities.load()
+            
+            # Workers share the GROQ_MAX_IN_FLIGHT budget of concurrent LLM calls
+            max_in_flight = max(1, config.GROQ_MAX_IN_FLIGHT // workers)
+            chunks = list(chunked(results, max(batch_size, 1) * max_in_flight))
+            
+            def process(chunk):
+                return self._process_chunk(chunk, batch_size, max_in_flight)
+            
+            if workers > 1 and len(chunks) > 1:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    outcomes = list(executor.map(process, chunks))
+            else:
+                outcomes = [process(chunk) for chunk in chunks]
+        finally:
+            # Deferred results go back to the shared backlog
+            self.tavily.release_claims(claimed_ids)
+        processed = sum(done for done, _ in outcomes)
+        deferred = sum(left for _, left in outcomes)
+        
+        elapsed = time.perf_counter() - start
+        if results:
+            print(f"Processed {processed} results in {elapsed:.2f}s "
+                  f"({processed / elapsed if elapsed else 0.0:.1f} results/sec, "
+                  f"{workers} worker{'s' if workers > 1 else ''})")
+        
+        rescored = self.rescore_dirty()
+        if rescored:
+            print(f"Rescored {rescored} companies")
+        
+        if processed:
+            self.refresh_summary()
+        
+        if deferred:
+            print(f"{deferred} results left unprocessed for the next run")
+        
+        self.report_llm_usage()
+    
+    def report_llm_usage(self):
+        """
+        Print the LLM usage of this run and persist its call log.
+        
+        Covers call counts, retries and failures, tokens, per-model latency,
+        cascade escalations, per-method parse errors, fallbacks and
+        estimated cost, and LLM cache hits.
+        """
+        calls = self.groq.call_stats
+        if calls["calls"] or calls["failed"]:
+            print(f"Groq calls: {calls['calls']} ({calls['retries']} retries, "
+                  f"{calls['rate_limited']} rate limited, {calls['failed']} failed)")
+        if calls["calls"]:
+            print(f"Groq tokens: {calls['prompt_tokens']} sent, {calls['completion_tokens']} received "
+                  f"({calls['prompt_tokens'] // calls['calls']} sent per call)")
+        for model, tier in self.groq.tier_stats.items():
+            print(f"  {model}: {tier['calls']} calls, "
+                  f"{tier['seconds'] / tier['calls']:.2f}s average latency")
+        escalated = sum(self.groq.escalations.values())
+        if escalated:
+            reasons = ", ".join(f"{count} {reason.replace('_', ' ')}"
+                                for reason, count in self.groq.escalations.items() if count)
+            print(f"  Escalated to {self.groq.model}: {escalated} ({reasons})")
+        for row in summarize_calls(self.groq.call_log):
+            print(f"  {row['method']} ({row['model']}): {row['calls']} calls, "
+                  f"{row['parse_errors']} parse errors, {row['failed']} failed, ${row['cost_usd']:.4f}")
+        if calls["fallbacks"]:
+            print(f"  Batch fallbacks to single calls: {calls['fallbacks']}")
+        
+        cache = self.groq.cache.stats()["run"]
+        if self.groq.cache.enabled and (cache["hits"] or cache["misses"]):
+            print(f"LLM cache: {cache['hits']} hits, {cache['misses']} misses "
+                  f"({cache['hit_rate']:.0%} hit rate)")
+        
+        self.groq.save_call_log()
+    
+    def filter_relevant(self, results: List[SearchResult]) -> List[SearchResult]:
+        """
+        Drop results the keyword relevance filter scores below threshold.
+        
+        Dropped results are marked processed (skip reason "irrelevant") so
+        they never reach the LLM.
+        
+        Returns:
+            The relevant results
+        """
+        if not results or not self.relevance.enabled:
+            return results
+        
+        relevant_ids, irrelevant = self.relevance.split(
+            (result.id, self._result_text(result)) for result in results
+        )
+        self.tavily.mark_as_skipped(irrelevant, reason="irrelevant")
+        
+        if irrelevant:
+            print(f"Relevance filter: skipped {len(irrelevant)} of {len(results)} results "
+                  f"(threshold {self.relevance.threshold:g})")
+        relevant = set(relevant_ids)
+        return [result for result in results if result.id in relevant]
+    
+    def _process_chunk(self, chunk: List[SearchResult], batch_size: int, max_in_flight: int = None) -> Tuple[int, int]:
+        """
+        Analyze and persist a chunk of results.
+        
+        Returns:
+            Tuple of (results processed, results left for the next run)
+        """
+        ready, left = self.analyze_chunk(chunk, batch_size, max_in_flight)
+        return self._persist_batch(ready), left
+    
+    def analyze_chunk(
+        self,
+        chunk: List[SearchResult],
+        batch_size: int = None,
+        max_in_flight: int = None
+    ) -> Tuple[List[Tuple[SearchResult, Dict[str, Any]]], int]:
+        """
+        Analyze a chunk of claimed results without writing the analyses.
+        
+        Results are packed into shared, concurrent LLM calls. Results Groq
+        rejects even on their own are marked failed so they are not retried.
+        
+        Args:
+            chunk: Claimed search results
+            batch_size: Results analyzed per LLM call (uses LLM_BATCH_SIZE if not provided)
+            max_in_flight: Concurrent LLM calls (uses GROQ_MAX_IN_FLIGHT if not provided)
+            
+        Returns:
+            Tuple of ((search result, analysis) pairs ready to persist,
+            results left for the next run)
+        """
+        # The lease started when the run claimed its results; restart it per chunk
+        held = set(self.tavily.renew_claims([result.id for result in chunk]))
+        if len(held) < len(chunk):
+            # Their lease expired and another processor took them over
+            print(f"Dropped {len(chunk) - len(held)} results another processor now holds")
+            chunk = [result for result in chunk if result.id in held]
+        rejected = {}
+        try:
+            analyses = self._analyze_results(chunk, batch_size, max_in_flight, rejected)
+        except Exception as e:
+            print(f"Error analyzing batch: {e}")
+            return [], len(chunk)
+        
+        if rejected:
+            # Groq refuses these even on their own; retrying would only bill them again
+            self.tavily.mark_as_skipped({result_id: None for result_id in rejected}, reason="analysis_rejected")
+            print(f"Marked {len(rejected)} results Groq rejected as failed")
+        
+        ready = [(result, analyses[result.id]) for result in chunk if result.id in analyses]
+        return ready, len(chunk) - len(ready) - len(rejected)
+    
+    def _analyze_results(
+        self,
+        results: List[SearchResult],
+        batch_size: int = None,
+        max_in_flight: int = None,
+        rejected: Dict[int, str] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Analyze several search results, packing them into shared, concurrent LLM calls.
+        
+        Ids of results Groq rejects as invalid requests are added to ``rejected``.
+        """
+        return self.groq.analyze_batch(
+            [(result.id, self._result_text(result)) for result in results],
+            batch_size=batch_size,
+            max_in_flight=max_in_flight,
+            rejected=rejected
+        )
+    
+    @staticmethod
+    def _result_text(result: SearchResult) -> str:
+        """
+        Combine title and content for analysis.
         
-        for result in results:
+        The text is compacted (boilerplate and repeated sentences removed)
+        and truncated to LLM_INPUT_TOKEN_BUDGET estimated tokens.
+        """
+        return prepare_text(f"{result.title}\n{result.content or ''}", config.LLM_INPUT_TOKEN_BUDGET)
+    
+    def _persist_batch(self, items: List[Tuple[SearchResult, Dict[str, Any]]]) -> int:
+        """
+        Write analyses and mark their results processed, PROCESS_COMMIT_SIZE per transaction.
+        
+        Each group is committed once, with one bulk update of the processed
+        flags and one save of the graph. If a group fails, its results are
+        retried one per transaction so a bad result (or a company another
+        process created first) does not hold back the rest.
+        
+        Args:
+            items: (search result, analysis) pairs
+            
+        Returns:
+            Number of results stored
+        """
+        stored = 0
+        for group in chunked(items, max(1, config.PROCESS_COMMIT_SIZE)):
             try:
-                self._process_single_result(result)
-                self.tavily.mark_as_processed(result.id)
+                self._write_group(group)
+                stored += len(group)
+            except Exception as e:
+                if len(group) == 1:
+                    print(f"Error processing result {group[0][0].id}: {e}")
+                else:
+                    stored += self._persist_batch_singly(group)
+        return stored
+    
+    def _persist_batch_singly(self, items: List[Tuple[SearchResult, Dict[str, Any]]]) -> int:
+        """Write analyses one transaction each, reporting the ones that fail."""
+        stored = 0
+        for result, analysis in items:
+            try:
+                self._write_group([(result, analysis)])
+                stored += 1
             except Exception as e:
                 print(f"Error processing result {result.id}: {e}")
+        return stored
+    
+    def _write_group(self, group: List[Tuple[SearchResult, Dict[str, Any]]]):
+        """Write a group of analyses and their processed flags in one transaction."""
+        company_names = [analysis["entities"].get("company_name") for _, analysis in group]
+        companies = set()
+        with self._company_locks(company_names), self.graph.batch(), self.entities.transaction() as known:
+            with db_service.get_session() as session:
+                # Flag first, so nothing is written for results another processor took over
+                if self.tavily.mark_many_as_processed([result.id for result, _ in group], session=session) < len(group):
+                    raise ClaimLostError("results were processed or claimed by another processor")
+                for result, analysis in group:
+                    company_id = self._write_analysis(session, known, result, analysis)
+                    if company_id is not None:
+                        companies.add(company_id)
+        self._mark_dirty(companies)
+    
+    def _mark_dirty(self, company_ids: Iterable[int]):
+        """Remember companies whose score is out of date."""
+        with self._company_locks_guard:
+            self._dirty_companies.update(company_ids)
+    
+    @contextmanager
+    def _company_locks(self, company_names: List[Optional[str]]):
+        """
+        Hold the write locks of several companies.
+        
+        Writes for the same company are serialized across worker threads;
+        locks are taken in sorted order so workers cannot deadlock.
+        """
+        keys = sorted({normalize_company_name(name) for name in company_names if name})
+        with self._company_locks_guard:
+            locks = [self._company_lock_table.setdefault(key, threading.Lock()) for key in keys]
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
     
-    def _process_single_result(self, result: SearchResult):
-        """Process a single search result."""
-        # Combine title and content for analysis
-        text = f"{result.title}\n{result.content}"
+    def _write_analysis(self, session, known, result: SearchResult, analysis: Dict[str, Any]) -> Optional[int]:
+        """
+        Write the company, opportunity and signal of an analysis.
         
-        # Extract entities
-        entities = self.groq.extract_entities(text)
+        Existing companies, opportunities and signals are found in the
+        run's entity cache; the database is only asked about company names
+        the cache does not know (another process may have added them).
+        
+        Args:
+            session: Active database session
+            known: Staged view of the entity cache for this transaction
+            result: Search result the analysis is about
+            analysis: Dictionary with "entities" and "signals"
+            
+        Returns:
+            Id of the company, or None if the analysis named none
+        """
+        entities = analysis["entities"]
+        signals = analysis["signals"]
         
         company_name = entities.get("company_name")
         if not company_name:
             print(f"No company found in result {result.id}")
-            return
+            return None
+        
+        new_companies = 0
+        new_opportunities = 0
         
         # Get or create company
-        with db_service.get_session() as session:
+        company_id = known.company_id(company_name)
+        if company_id is None:
             company = session.query(Company).filter_by(name=company_name).first()
-            
             if not company:
+                new_companies = 1
                 company = Company(
                     name=company_name,
                     industry=entities.get("industry"),
@@ -61,110 +374,138 @@ class ProcessingService:
                 
                 # Add to graph database
                 self.graph.add_company(company.id, name=company_name)
+            company_id = company.id
+            known.add_company(company_name, company_id)
+        
+        # Check if this is a job posting with no active opportunity of that title yet
+        job_title = entities.get("job_title")
+        if job_title and not known.has_opportunity(company_id, job_title):
+            opportunity = Opportunity(
+                company_id=company_id,
+                title=job_title,
+                role_type=entities.get("role_type"),
+                description=result.content,
+                url=result.url,
+                location=entities.get("location"),
+                is_active=True,
+                discovered_date=datetime.now(timezone.utc)
+            )
+            session.add(opportunity)
+            session.flush()
+            known.add_opportunity(company_id, job_title)
+            new_opportunities = 1
             
-            # Check if this is a job posting
-            job_title = entities.get("job_title")
-            if job_title:
-                # Check if an active opportunity with this title already exists
-                existing_opp = session.query(Opportunity).filter_by(
-                    company_id=company.id,
-                    title=job_title,
-                    is_active=True
-                ).first()
-                
-                if not existing_opp:
-                    opportunity = Opportunity(
-                        company_id=company.id,
-                        title=job_title,
-                        role_type=entities.get("role_type"),
-                        description=result.content,
-                        url=result.url,
-                        location=entities.get("location"),
-                        is_active=True,
-                        discovered_date=datetime.now(timezone.utc)
-                    )
-                    session.add(opportunity)
-                    session.flush()
-                    
-                    # Add to graph database
-                    self.graph.add_opportunity(
-                        opportunity.id,
-                        company.id,
-                        title=job_title,
-                        role_type=entities.get("role_type")
-                    )
-            
-            # Detect hiring signals
-            signals = self.groq.detect_hiring_signals(text, company_name)
-            
-            if signals.get("has_signal") and signals.get("confidence", 0) > 0.5:
-                # Check if signal already exists for this company, type, and source URL
-                existing_signal = session.query(HiringSignal).filter_by(
-                    company_id=company.id,
-                    signal_type=signals.get("signal_type"),
-                    source_url=result.url
-                ).first()
-                
-                if not existing_signal:
-                    signal = HiringSignal(
-                        company_id=company.id,
-                        signal_type=signals.get("signal_type"),
-                        description=signals.get("description"),
-                        source_url=result.url,
-                        confidence=signals.get("confidence", 0.0),
-                        detected_date=datetime.now(timezone.utc)
-                    )
-                    session.add(signal)
-                    session.flush()
-                    
-                    # Add to graph database
-                    self.graph.add_signal(
-                        signal.id,
-                        company.id,
-                        signals.get("signal_type"),
-                        description=signals.get("description")
-                    )
-            
-            # Update company score
-            self._update_company_score(session, company.id)
-    
-    def _update_company_score(self, session, company_id: int):
-        """Update company score based on opportunities and signals."""
-        company = session.query(Company).get(company_id)
-        if not company:
-            return
-        
-        # Count active opportunities
-        active_opps = session.query(Opportunity).filter_by(
-            company_id=company_id,
-            is_active=True
-        ).count()
-        
-        # Get recent signals
-        recent_signals = session.query(HiringSignal).filter_by(
-            company_id=company_id
-        ).filter(
-            HiringSignal.detected_date > datetime.now(timezone.utc) - timedelta(days=90)
-        ).all()
-        
-        # Prepare data for scoring
-        company_data = {
-            "active_opportunities": active_opps,
-            "signals": [
-                {
-                    "confidence": s.confidence,
-                    "type": s.signal_type
-                }
-                for s in recent_signals
-            ],
-            "has_funding": any(s.signal_type == "funding" for s in recent_signals),
-            "has_expansion": any(s.signal_type == "expansion" for s in recent_signals),
-            "recent_activity": len(recent_signals) > 0
-        }
+            # Add to graph database
+            self.graph.add_opportunity(
+                opportunity.id,
+                company_id,
+                title=job_title,
+                role_type=entities.get("role_type")
+            )
+        
+        signal_type = signals.get("signal_type")
+        if signals.get("has_signal") and signals.get("confidence", 0) > 0.5 and (
+            # Skip signals already recorded for this company, type, and source URL
+            not known.has_signal(company_id, signal_type, result.url)
+        ):
+            signal = HiringSignal(
+                company_id=company_id,
+                signal_type=signal_type,
+                description=signals.get("description"),
+                source_url=result.url,
+                confidence=signals.get("confidence", 0.0),
+                detected_date=datetime.now(timezone.utc)
+            )
+            session.add(signal)
+            session.flush()
+            known.add_signal(company_id, signal_type, result.url)
+            
+            # Add to graph database
+            self.graph.add_signal(
+                signal.id,
+                company_id,
+                signal_type,
+                description=signals.get("description")
+            )
+        
+        # Credit the query that found this result
+        QueryPlanner.credit(session, result.query, new_companies, new_opportunities)
+        return company_id
+    
+    def rescore_dirty(self) -> int:
+        """
+        Rescore the companies written to since the last rescore.
+        
+        Returns:
+            Number of companies rescored
+        """
+        with self._company_locks_guard:
+            dirty, self._dirty_companies = self._dirty_companies, set()
+        return self.rescore_companies(dirty) if dirty else 0
+    
+    def rescore_companies(self, company_ids: Iterable[int] = None, updated_before: datetime = None) -> int:
+        """
+        Recompute company scores with set-based queries.
+        
+        The features of up to RESCORE_CHUNK companies come from one GROUP BY
+        query, are scored together with NumPy, and the new scores are
+        written back with one bulk update.
+        
+        Args:
+            company_ids: Companies to rescore (all companies if not provided)
+            updated_before: With ``company_ids`` omitted, only rescore
+                companies last updated before this time
+            
+        Returns:
+            Number of companies rescored
+        """
+        rescored = 0
+        with db_service.get_session() as session:
+            if company_ids is None:
+                query = session.query(Company.id)
+                if updated_before is not None:
+                    query = query.filter(or_(Company.last_updated.is_(None), Company.last_updated < updated_before))
+                company_ids = [company_id for (company_id,) in query]
+            
+            for chunk in chunked(sorted(set(company_ids)), RESCORE_CHUNK):
+                scored_at = datetime.now(timezone.utc)
+                features = FeatureTable.load(session, chunk)
+                scores = [
+                    {"id": int(company_id), "score": float(score), "last_updated": scored_at}
+                    for company_id, score in zip(features.company_ids, score_features(features))
+                ]
+                if scores:
+                    session.execute(update(Company), scores)
+                rescored += len(scores)
+        
+        self._scoring_engine = None
+        return rescored
+    
+    def what_if(self, weights: Dict[str, float], limit: int = 20, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Re-rank all companies under alternative scoring weights.
         
-        # Calculate score
-        company.score = self.groq.score_company(company_data)
-        company.last_updated = datetime.now(timezone.utc)
+        Company features are loaded once and kept in memory until the next
+        rescore, so trying weights does not touch the database or change
+        stored scores.
+        
+        Args:
+            weights: Weights overriding SCORING_WEIGHTS
+            limit: Companies to return from the top of the new ranking
+            refresh: Reload the company features first
+            
+        Returns:
+            Dictionary with the resolved weights, the top companies with their
+            current score and rank, and the number of companies that move
+            
+        Raises:
+            ValueError: If a weight name is unknown
+        """
+        with self._company_locks_guard:
+            if refresh or self._scoring_engine is None:
+                self._scoring_engine = ScoringEngine.load()
+            engine = self._scoring_engine
+        return engine.what_if(weights, limit=limit)
     
     def get_top_companies(self, limit: int = 20) -> List[Dict[str, Any]]:
         """Get top companies by score."""
@@ -211,7 +552,13 @@ class ProcessingService:
             return result
     
     def get_dashboard_summary(self) -> Dict[str, Any]:
-        """Get summary data for dashboard."""
+        """
+        Get summary data for dashboard.
+        
+        The executive summary is the stored copy written by ``refresh_summary``,
+        so serving the dashboard never waits on Groq. ``summary_stale`` is
+        true when the top companies changed since it was generated.
+        """
         with db_service.get_session() as session:
             total_companies = session.query(Company).count()
             total_opportunities = session.query(Opportunity).filter_by(is_active=True).count()
@@ -219,11 +566,15 @@ class ProcessingService:
                 HiringSignal.detected_date > datetime.now(timezone.utc) - timedelta(days=90)
             ).count()
             
-            top_companies = self.get_top_companies(limit=10)
+            top_companies = self.get_top_companies(limit=SUMMARY_COMPANIES)
             recent_opportunities = self.get_active_opportunities(limit=10)
             
-            # Get summary from Groq
-            summary_text = self.groq.summarize_results(top_companies, max_results=10)
+            stored = self._latest_summary()
+            if stored:
+                summary_text = stored["summary"]
+            else:
+                summary_text = (f"Found {total_companies} companies with opportunities. "
+                                f"A summary is generated after the next processing run.")
             
             return {
                 "total_companies": total_companies,
@@ -232,5 +583,83 @@ class ProcessingService:
                 "top_companies": top_companies,
                 "recent_opportunities": recent_opportunities,
                 "summary": summary_text,
+                "summary_version": stored["data_version"] if stored else None,
+                "summary_generated_at": stored["generated_at"] if stored else None,
+                "summary_stale": not stored or stored["data_version"] != self._summary_version(top_companies),
                 "last_updated": datetime.now(timezone.utc).isoformat()
             }
+    
+    def get_llm_usage(self, days: int = 30, run_id: str = None) -> Dict[str, Any]:
+        """
+        Get persisted LLM usage per method and model, and per recent run.
+        
+        Args:
+            days: Only include calls from the last ``days`` days (all calls if None)
+            run_id: Only include calls from this run
+            
+        Returns:
+            Dictionary with "totals", "by_method" and "recent_runs"
+        """
+        return usage_report(days=days, run_id=run_id)
+    
+    def refresh_summary(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Regenerate the stored executive summary if the top companies changed.
+        
+        Args:
+            force: Regenerate even if the data version is unchanged
+            
+        Returns:
+            Dictionary with "summary", "data_version", "generated_at" and
+            "regenerated" (False if the stored copy was still current)
+        """
+        top_companies = self.get_top_companies(limit=SUMMARY_COMPANIES)
+        version = self._summary_version(top_companies)
+        
+        stored = self._latest_summary()
+        if stored and stored["data_version"] == version and not force:
+            return dict(stored, regenerated=False)
+        
+        summary_text = self.groq.summarize_results(top_companies, max_results=SUMMARY_COMPANIES)
+        
+        with db_service.get_session() as session:
+            row = DashboardSummary(data_version=version, summary=summary_text)
+            session.add(row)
+            session.flush()
+            
+            # Only the latest summary is ever served
+            session.query(DashboardSummary).filter(DashboardSummary.id < row.id).delete()
+            stored = self._summary_dict(row)
+        
+        print(f"Executive summary regenerated (data version {version[:12]})")
+        return dict(stored, regenerated=True)
+    
+    def _latest_summary(self) -> Dict[str, Any]:
+        """Get the stored executive summary, or None if there is none."""
+        with db_service.get_session() as session:
+            row = session.query(DashboardSummary).order_by(desc(DashboardSummary.id)).first()
+            return self._summary_dict(row) if row else None
+    
+    @staticmethod
+    def _summary_dict(row: DashboardSummary) -> Dict[str, Any]:
+        """Convert a stored summary to a dictionary."""
+        return {
+            "summary": row.summary,
+            "data_version": row.data_version,
+            "generated_at": row.generated_at.isoformat() if row.generated_at else None,
+        }
+    
+    @staticmethod
+    def _summary_version(top_companies: List[Dict[str, Any]]) -> str:
+        """
+        Stamp the data a summary is based on.
+        
+        Hashes the ids, names, rounded scores and opportunity counts of the
+        top companies, so only changes a summary could mention create a
+        new version.
+        """
+        data = [
+            (c["id"], c["name"], round(c["score"] or 0.0, 1), c["active_opportunities"])
+            for c in top_companies
+        ]
+        return hashlib.sha256(json.dumps(data).encode("utf-8")).hexdigest()
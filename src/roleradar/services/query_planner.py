@@ -0,0 +1,221 @@
+"""Adaptive search query planner driven by novel-yield statistics."""
+
+import math
+import random
+import uuid
+from typing import Any, Dict, List
+from sqlalchemy import desc, func
+from ..config import config
+from ..models import QueryYield
+from ..database import db_service
+
+# A new company or opportunity counts as much as four new URLs
+URL_WEIGHT = 0.25
+
+
+class QueryPlanner:
+    """
+    Decide which search queries to run each slot.
+    
+    Every run records its decisions before searching and, per query, how
+    many new URLs it produced afterwards; processing credits the new
+    companies and opportunities found in those results to the query's
+    latest run. Queries whose recent yield falls below a threshold are only
+    sampled occasionally, and a per-run budget caps the number of searches,
+    spent on new queries first, then a few exploration slots, then the
+    highest-yield queries.
+    """
+    
+    def __init__(
+        self,
+        budget: int = None,
+        exploration_rate: float = None,
+        low_yield_threshold: float = None,
+        min_runs: int = None,
+        history_runs: int = 10,
+        rng: random.Random = None
+    ):
+        """
+        Initialize planner.
+        
+        Args:
+            budget: Maximum queries per run (0 means no cap)
+            exploration_rate: Probability of sampling a low-yield query anyway
+            low_yield_threshold: Mean weighted yield per run below which a query is low-yield
+            min_runs: Runs of history needed before a query can be judged
+            history_runs: Number of recent runs the yield is averaged over
+            rng: Random source (for reproducible plans)
+        """
+        self.budget = config.QUERY_BUDGET if budget is None else budget
+        self.exploration_rate = (
+            config.QUERY_EXPLORATION_RATE if exploration_rate is None else exploration_rate
+        )
+        self.low_yield_threshold = (
+            config.QUERY_LOW_YIELD_THRESHOLD if low_yield_threshold is None else low_yield_threshold
+        )
+        self.min_runs = config.QUERY_MIN_RUNS if min_runs is None else min_runs
+        self.history_runs = history_runs
+        self.rng = rng or random.Random()
+    
+    def plan(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Plan a run.
+        
+        Args:
+            queries: Candidate queries
+        
+        Returns:
+            One decision per query with "query", "action" ("run", "explore"
+            or "skip"), "reason" and "score" (None for queries without history)
+        """
+        history = self._load_history(queries)
+        
+        new, high, explore, low = [], [], [], []
+        for query in dict.fromkeys(queries):
+            runs = history.get(query, [])
+            if len(runs) < self.min_runs:
+                new.append(self._decision(query, "run", "not enough history", None))
+                continue
+            
+            score = sum(self._yield(row) for row in runs) / len(runs)
+            if score >= self.low_yield_threshold:
+                high.append(self._decision(query, "run", "high yield", score))
+            elif self.rng.random() < self.exploration_rate:
+                explore.append(self._decision(query, "explore", "low yield, sampled", score))
+            else:
+                low.append(self._decision(query, "skip", "low yield", score))
+        
+        high.sort(key=lambda decision: decision["score"], reverse=True)
+        if not self.budget:
+            return new + explore + high + low
+        
+        explore_slots = max(1, math.ceil(self.budget * self.exploration_rate)) if explore else 0
+        ordered = new + explore[:explore_slots] + high + explore[explore_slots:]
+        for decision in ordered[self.budget:]:
+            decision["action"] = "skip"
+            decision["reason"] = "over budget"
+        return ordered + low
+    
+    def start_run(self, decisions: List[Dict[str, Any]]) -> str:
+        """
+        Persist a run's decisions before its searches start.
+        
+        The rows exist while results are processed, so credit for new
+        companies and opportunities lands on the current run.
+        
+        Args:
+            decisions: Decisions returned by ``plan``
+        
+        Returns:
+            Run id
+        """
+        run_id = uuid.uuid4().hex[:12]
+        with db_service.get_session() as session:
+            for decision in decisions:
+                session.add(QueryYield(
+                    run_id=run_id,
+                    query=decision["query"],
+                    ran=decision["action"] != "skip",
+                    reason=decision["reason"],
+                    results=0,
+                    new_urls=0,
+                    new_companies=0,
+                    new_opportunities=0
+                ))
+        return run_id
+    
+    def record_run(self, run_id: str, counts: Dict[str, Dict[str, int]]):
+        """
+        Persist the search counts of a started run.
+        
+        Args:
+            run_id: Run id returned by ``start_run``
+            counts: Per-query counts with "results" and "new_urls"
+        """
+        with db_service.get_session() as session:
+            for query, query_counts in counts.items():
+                session.query(QueryYield).filter_by(run_id=run_id, query=query).update({
+                    QueryYield.results: query_counts.get("results", 0),
+                    QueryYield.new_urls: query_counts.get("new_urls", 0),
+                }, synchronize_session=False)
+    
+    @staticmethod
+    def credit(session, query: str, new_companies: int = 0, new_opportunities: int = 0):
+        """
+        Credit new companies and opportunities to a query's latest run.
+        
+        Args:
+            session: Active database session
+            query: Query that produced the processed result
+            new_companies: Companies created from the result
+            new_opportunities: Opportunities created from the result
+        """
+        if not (new_companies or new_opportunities):
+            return
+        
+        latest = session.query(QueryYield).filter_by(
+            query=query,
+            ran=True
+        ).order_by(desc(QueryYield.id)).first()
+        
+        if latest:
+            # Increment in SQL so concurrent writers do not lose each other's credit
+            session.query(QueryYield).filter_by(id=latest.id).update({
+                QueryYield.new_companies: func.coalesce(QueryYield.new_companies, 0) + new_companies,
+                QueryYield.new_opportunities: func.coalesce(QueryYield.new_opportunities, 0) + new_opportunities,
+            }, synchronize_session=False)
+    
+    def _load_history(self, queries: List[str]) -> Dict[str, List[QueryYield]]:
+        """Load the latest ``history_runs`` rows each query actually ran."""
+        history = {}
+        with db_service.get_session() as session:
+            ranked = session.query(
+                QueryYield.id.label("id"),
+                func.row_number().over(
+                    partition_by=QueryYield.query,
+                    order_by=desc(QueryYield.id)
+                ).label("position")
+            ).filter(
+                QueryYield.query.in_(list(set(queries))),
+                QueryYield.ran.is_(True)
+            ).subquery()
+            
+            rows = session.query(QueryYield).join(
+                ranked, ranked.c.id == QueryYield.id
+            ).filter(
+                ranked.c.position <= self.history_runs
+            ).order_by(desc(QueryYield.id)).all()
+            
+            for row in rows:
+                history.setdefault(row.query, []).append(row)
+            
+            session.expunge_all()
+        return history
+    
+    @staticmethod
+    def _yield(row: QueryYield) -> float:
+        """Weighted novel yield of one run."""
+        return (
+            (row.new_urls or 0) * URL_WEIGHT
+            + (row.new_companies or 0)
+            + (row.new_opportunities or 0)
+        )
+    
+    @staticmethod
+    def _decision(query: str, action: str, reason: str, score) -> Dict[str, Any]:
+        """Build a plan decision."""
+        return {"query": query, "action": action, "reason": reason, "score": score}
+
+
+def print_plan(decisions: List[Dict[str, Any]], budget: int):
+    """Print planner decisions for a run report."""
+    ran = sum(1 for d in decisions if d["action"] == "run")
+    explored = sum(1 for d in decisions if d["action"] == "explore")
+    skipped = sum(1 for d in decisions if d["action"] == "skip")
+    
+    print(f"\nQuery plan (budget: {budget or 'unlimited'}): "
+          f"{ran} run, {explored} explored, {skipped} skipped")
+    for decision in decisions:
+        score = decision["score"]
+        score_text = f"{score:5.2f}" if score is not None else "  new"
+        print(f"  {decision['action']:<8} {score_text}  {decision['query']} ({decision['reason']})")
@@ -0,0 +1,198 @@
+"""Rate limiting primitives shared by the API services."""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+    
+    def __init__(self, rate: float, capacity: float = None):
+        """
+        Initialize token bucket.
+        
+        Args:
+            rate: Tokens added per second (0 or less disables limiting)
+            capacity: Maximum burst size (defaults to one second of tokens)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        """Add tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """
+        Seconds until tokens would be available, without taking them.
+        
+        Args:
+            tokens: Number of tokens wanted
+        """
+        if self.rate <= 0:
+            return 0.0
+        
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            return max(0.0, (tokens - self._tokens) / self.rate)
+    
+    def consume(self, tokens: float):
+        """
+        Take tokens unconditionally, going into debt if needed.
+        
+        Negative amounts return tokens. Used to settle an estimate against
+        the actual usage reported after a call.
+        
+        Args:
+            tokens: Number of tokens to take (negative to refund)
+        """
+        if self.rate <= 0:
+            return
+        
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - tokens)
+    
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens if available without blocking.
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds until they will be available
+        """
+        if self.rate <= 0:
+            return 0.0
+        
+        # Requests larger than the bucket can never be satisfied in one go
+        tokens = min(tokens, self.capacity)
+        
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+    
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until tokens are available and take them.
+        
+        Args:
+            tokens: Number of tokens to take
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+
+class DualTokenBucket:
+    """
+    Admission control against a requests-per-minute and a tokens-per-minute limit.
+    
+    A call is admitted only when both buckets can pay for it, so neither
+    limit is exceeded. Each bucket bursts up to ten seconds' worth of its
+    limit. Token estimates are settled against actual usage after the call,
+    and a provider 429 pauses all callers until its retry-after has passed.
+    """
+    
+    BURST_SECONDS = 10.0
+    
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """
+        Initialize admission control.
+        
+        Args:
+            requests_per_minute: Request limit (0 or less disables it)
+            tokens_per_minute: Token limit (0 or less disables it)
+        """
+        self.requests = self._bucket(requests_per_minute)
+        self.tokens = self._bucket(tokens_per_minute)
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def _bucket(cls, per_minute: float) -> TokenBucket:
+        """Build a bucket for a per-minute limit."""
+        rate = per_minute / 60.0
+        return TokenBucket(rate, capacity=max(1.0, rate * cls.BURST_SECONDS))
+    
+    def try_acquire(self, tokens: float) -> float:
+        """
+        Admit one request of ``tokens`` estimated tokens if both limits allow it.
+        
+        Returns:
+            0.0 if admitted, otherwise seconds to wait before trying again
+        """
+        with self._lock:
+            delay = max(
+                self._blocked_until - time.monotonic(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(tokens)
+            )
+            if delay > 0:
+                return delay
+            self.requests.consume(1)
+            self.tokens.consume(min(tokens, self.tokens.capacity))
+            return 0.0
+    
+    def acquire(self, tokens: float) -> float:
+        """
+        Block until a request is admitted.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+    
+    async def acquire_async(self, tokens: float) -> float:
+        """
+        Wait without blocking the event loop until a request is admitted.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            delay = self.try_acquire(tokens)
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+    
+    def settle(self, estimated: float, actual: float):
+        """
+        Correct the token bucket once actual usage is known.
+        
+        Args:
+            estimated: Tokens charged on admission
+            actual: Tokens the provider reported
+        """
+        self.tokens.consume(actual - min(estimated, self.tokens.capacity))
+    
+    def pause(self, seconds: float):
+        """Hold back all requests for ``seconds`` (e.g. after a 429)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
@@ -0,0 +1,155 @@
+"""Keyword-based relevance filter applied to search results before any LLM call."""
+
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+from ..config import config
+from ..utils import KeywordMatcher
+
+# Generic vocabulary of the roles RoleRadar tracks, on top of SEARCH_ROLES
+DOMAIN_TERMS = [
+    "security", "cybersecurity", "cyber security", "infosec", "information security",
+    "compliance", "grc", "risk and compliance", "risk management", "privacy",
+    "data protection", "ciso", "cso", "dpo", "soc 2", "iso 27001", "gdpr", "hipaa",
+]
+
+# Evidence that a page is about a specific opening or an employer's hiring needs
+HIRING_TERMS = [
+    "hiring", "we're hiring", "we are hiring", "now hiring", "is hiring", "job opening",
+    "job openings", "open position", "open role", "vacancy", "apply now", "apply today",
+    "join our team", "join us", "we are looking for", "we're looking for", "careers",
+    "recruiting", "full-time", "full time", "remote", "job description", "responsibilities",
+    "requirements", "qualifications", "appointed", "appoints", "names new", "hires",
+]
+
+# Hiring signals the LLM looks for (funding, growth, incidents, regulation)
+SIGNAL_TERMS = [
+    "raises", "raised", "funding", "series a", "series b", "series c", "series d",
+    "seed round", "acquires", "acquired", "acquisition", "expansion", "expands",
+    "new office", "headcount", "ipo", "data breach", "breach", "ransomware",
+    "cyberattack", "incident", "fined", "regulation", "regulatory", "launches",
+]
+
+# Typical of listicles, salary surveys and career-advice pages
+NOISE_TERMS = [
+    "salary survey", "salary guide", "average salary", "salary range", "how to become",
+    "career path", "career guide", "career advice", "interview questions", "certification",
+    "certifications", "course", "courses", "bootcamp", "top 10", "top 5", "best jobs",
+    "highest paying", "skills you need", "what does a", "what is a", "job outlook",
+]
+
+CATEGORY_WEIGHTS = {
+    "role": 2.0,
+    "domain": 1.0,
+    "hiring": 1.0,
+    "signal": 1.0,
+    "noise": -1.5,
+}
+
+# Distinct matches counted per category, so repetition cannot dominate the score
+CATEGORY_CAPS = {
+    "role": 2,
+    "domain": 2,
+    "hiring": 2,
+    "signal": 2,
+    "noise": 3,
+}
+
+_ABBREVIATION_RE = re.compile(r"\(([^)]+)\)")
+
+
+def role_keywords(roles: Iterable[str]) -> List[str]:
+    """
+    Turn configured search roles into matcher keywords.
+    
+    "Chief Information Security Officer (CISO)" yields both the full
+    title and the abbreviation.
+    """
+    keywords = []
+    for role in roles:
+        keywords.extend(_ABBREVIATION_RE.findall(role))
+        keywords.append(_ABBREVIATION_RE.sub("", role))
+    return [" ".join(keyword.split()) for keyword in keywords if keyword.strip()]
+
+
+class RelevanceFilter:
+    """
+    Score search results locally and drop the obviously irrelevant ones.
+    
+    All vocabularies are compiled into one ``KeywordMatcher`` so a result
+    is scored in a single pass over its text. The score adds weights for
+    distinct role, domain, hiring and signal terms and subtracts them for
+    listicle/salary-survey noise. The filter errs towards keeping results:
+    it only has to catch pages that are clearly not worth an LLM call.
+    """
+    
+    def __init__(self, roles: List[str] = None, threshold: float = None):
+        """
+        Initialize relevance filter.
+        
+        Args:
+            roles: Role titles to match (uses SEARCH_ROLES if not provided)
+            threshold: Minimum score to keep a result (uses RELEVANCE_THRESHOLD if not provided)
+        """
+        self.threshold = config.RELEVANCE_THRESHOLD if threshold is None else threshold
+        self.enabled = config.RELEVANCE_FILTER
+        
+        vocabularies = [
+            ("noise", NOISE_TERMS),
+            ("signal", SIGNAL_TERMS),
+            ("hiring", HIRING_TERMS),
+            ("domain", DOMAIN_TERMS),
+            ("role", role_keywords(roles if roles is not None else config.SEARCH_ROLES)),
+        ]
+        # Later vocabularies win when a keyword appears in more than one
+        self._categories = {}
+        for category, keywords in vocabularies:
+            for keyword in keywords:
+                self._categories[" ".join(keyword.lower().split())] = category
+        self._matcher = KeywordMatcher(self._categories)
+    
+    def score(self, text: str) -> Tuple[float, Dict[str, List[str]]]:
+        """
+        Score a text.
+        
+        Args:
+            text: Title and content of a search result
+        
+        Returns:
+            Tuple of (score, matched keywords per category)
+        """
+        matched = {}
+        for keyword in sorted(self._matcher.find_unique(text)):
+            matched.setdefault(self._categories[keyword], []).append(keyword)
+        
+        score = sum(
+            CATEGORY_WEIGHTS[category] * min(len(keywords), CATEGORY_CAPS[category])
+            for category, keywords in matched.items()
+        )
+        return score, matched
+    
+    def is_relevant(self, text: str) -> bool:
+        """Check whether a text is worth an LLM call."""
+        return not self.enabled or self.score(text)[0] >= self.threshold
+    
+    def split(self, items: Iterable[Tuple[Any, str]]) -> Tuple[List[Any], Dict[Any, float]]:
+        """
+        Split items into relevant and irrelevant ones.
+        
+        Args:
+            items: (id, text) pairs
+        
+        Returns:
+            Tuple of (relevant ids, score of each irrelevant id)
+        """
+        relevant = []
+        irrelevant = {}
+        for item_id, text in items:
+            if not self.enabled:
+                relevant.append(item_id)
+                continue
+            score, _ = self.score(text)
+            if score >= self.threshold:
+                relevant.append(item_id)
+            else:
+                irrelevant[item_id] = score
+        return relevant, irrelevant
@@ -0,0 +1,258 @@
+"""Vectorized company scoring over a per-company feature table."""
+
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import numpy as np
+from sqlalchemy import case, func
+from ..config import config
+from ..database import db_service
+from ..models import Company, HiringSignal, Opportunity
+
+# Signals younger than this count towards a company's score
+SIGNAL_WINDOW_DAYS = 90
+
+# Companies per aggregate query when loading features
+FEATURE_CHUNK = 500
+
+
+class FeatureTable:
+    """
+    Scoring inputs of many companies, one array element per company.
+    
+    Columns are NumPy arrays aligned by position: company ids and names,
+    active opportunity counts, the count and average confidence of signals
+    in the last SIGNAL_WINDOW_DAYS days, funding/expansion flags and the
+    age in days of the latest signal (NaN if there is none).
+    """
+    
+    def __init__(
+        self,
+        company_ids,
+        names,
+        active_opportunities,
+        signal_count,
+        average_confidence,
+        has_funding,
+        has_expansion,
+        days_since_signal
+    ):
+        """Build a table from column sequences of equal length."""
+        self.company_ids = np.asarray(company_ids, dtype=np.int64)
+        self.names = np.asarray(names, dtype=object)
+        self.active_opportunities = np.asarray(active_opportunities, dtype=np.int64)
+        self.signal_count = np.asarray(signal_count, dtype=np.int64)
+        self.average_confidence = np.asarray(average_confidence, dtype=np.float64)
+        self.has_funding = np.asarray(has_funding, dtype=bool)
+        self.has_expansion = np.asarray(has_expansion, dtype=bool)
+        self.days_since_signal = np.asarray(days_since_signal, dtype=np.float64)
+    
+    def __len__(self) -> int:
+        return len(self.company_ids)
+    
+    @property
+    def recent_activity(self) -> np.ndarray:
+        """Whether each company has a signal inside the scoring window."""
+        return self.signal_count > 0
+    
+    @classmethod
+    def load(cls, session, company_ids: List[int] = None) -> "FeatureTable":
+        """
+        Aggregate the features of companies with GROUP BY queries.
+        
+        Args:
+            session: Active database session
+            company_ids: Companies to load (all companies if not provided)
+        
+        Returns:
+            Feature table ordered by company id
+        """
+        if company_ids is None:
+            company_ids = [company_id for (company_id,) in session.query(Company.id).order_by(Company.id)]
+        company_ids = sorted(set(company_ids))
+        
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(days=SIGNAL_WINDOW_DAYS)
+        rows = []
+        for start in range(0, len(company_ids), FEATURE_CHUNK):
+            rows.extend(cls._query(session, company_ids[start:start + FEATURE_CHUNK], since))
+        rows.sort(key=lambda row: row[0])
+        
+        return cls(
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] or 0 for row in rows],
+            [row[3] or 0 for row in rows],
+            [row[4] if row[3] else 0.0 for row in rows],
+            [bool(row[5]) for row in rows],
+            [bool(row[6]) for row in rows],
+            [_age_in_days(row[7], now) for row in rows],
+        )
+    
+    @staticmethod
+    def _query(session, company_ids: List[int], since: datetime):
+        """One aggregate query over a chunk of companies."""
+        opportunities = session.query(
+            Opportunity.company_id.label("company_id"),
+            func.count(Opportunity.id).label("active")
+        ).filter(
+            Opportunity.company_id.in_(company_ids),
+            Opportunity.is_active.is_(True)
+        ).group_by(Opportunity.company_id).subquery()
+        
+        signals = session.query(
+            HiringSignal.company_id.label("company_id"),
+            func.count(HiringSignal.id).label("count"),
+            func.avg(func.coalesce(HiringSignal.confidence, 0.0)).label("confidence"),
+            func.max(case((HiringSignal.signal_type == "funding", 1), else_=0)).label("funding"),
+            func.max(case((HiringSignal.signal_type == "expansion", 1), else_=0)).label("expansion"),
+            func.max(HiringSignal.detected_date).label("latest")
+        ).filter(
+            HiringSignal.company_id.in_(company_ids),
+            HiringSignal.detected_date > since
+        ).group_by(HiringSignal.company_id).subquery()
+        
+        return session.query(
+            Company.id,
+            Company.name,
+            opportunities.c.active,
+            signals.c.count,
+            signals.c.confidence,
+            signals.c.funding,
+            signals.c.expansion,
+            signals.c.latest
+        ).outerjoin(
+            opportunities, opportunities.c.company_id == Company.id
+        ).outerjoin(
+            signals, signals.c.company_id == Company.id
+        ).filter(Company.id.in_(company_ids)).all()
+
+
+def _age_in_days(moment: Optional[datetime], now: datetime) -> float:
+    """Days between ``moment`` and ``now`` (NaN if there is no moment)."""
+    if moment is None:
+        return float("nan")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (now - moment).total_seconds() / 86400
+
+
+def resolve_weights(weights: Dict[str, float] = None) -> Dict[str, float]:
+    """
+    Overlay alternative weights on SCORING_WEIGHTS.
+    
+    Raises:
+        ValueError: If a weight name is unknown or a value is not a finite number
+    """
+    resolved = dict(config.SCORING_WEIGHTS)
+    for name, value in (weights or {}).items():
+        if name not in resolved:
+            raise ValueError(f"Unknown scoring weight '{name}', expected one of {', '.join(resolved)}")
+        try:
+            weight = float(value)
+        except (TypeError, ValueError):
+            weight = None
+        # NaN or infinite weights would put non-JSON scores in the ranking
+        if weight is None or not math.isfinite(weight):
+            raise ValueError(f"Scoring weight '{name}' must be a finite number, got {value!r}")
+        resolved[name] = weight
+    return resolved
+
+
+def score_features(features: FeatureTable, weights: Dict[str, float] = None) -> np.ndarray:
+    """
+    Score every company in a feature table at once.
+    
+    Applies the same formula as ``GroqAnalysisService.score_company``.
+    
+    Args:
+        features: Feature table
+        weights: Weights overriding SCORING_WEIGHTS
+    
+    Returns:
+        Scores between 0 and 100, aligned with the table
+    """
+    weights = resolve_weights(weights)
+    growth = features.has_funding | features.has_expansion
+    
+    score = np.minimum(features.active_opportunities * 10, 40) * weights["explicit_job_posting"]
+    score = score + features.average_confidence * 100 * weights["hiring_signals"]
+    score = score + np.where(growth, 50 * weights["company_growth"], 0.0)
+    score = score + np.where(features.recent_activity, 100 * weights["recent_activity"], 0.0)
+    return np.minimum(score, 100.0)
+
+
+class ScoringEngine:
+    """
+    In-memory scoring of every company for interactive weight tuning.
+    
+    The feature table is loaded once; re-ranking all companies under
+    alternative weights is pure array arithmetic and never touches the
+    database.
+    """
+    
+    def __init__(self, features: FeatureTable):
+        """
+        Initialize engine.
+        
+        Args:
+            features: Feature table of the companies to rank
+        """
+        self.features = features
+        self.loaded_at = datetime.now(timezone.utc)
+        self.baseline_scores = score_features(features)
+        self.baseline_ranks = _ranks(self.baseline_scores)
+    
+    @classmethod
+    def load(cls) -> "ScoringEngine":
+        """Load the features of all companies from the database."""
+        with db_service.get_session() as session:
+            return cls(FeatureTable.load(session))
+    
+    def what_if(self, weights: Dict[str, float], limit: int = 20) -> Dict[str, Any]:
+        """
+        Re-rank all companies under alternative weights.
+        
+        Args:
+            weights: Weights overriding SCORING_WEIGHTS
+            limit: Companies to return from the top of the new ranking
+        
+        Returns:
+            Dictionary with the resolved "weights", the top "companies" (with
+            their current score and rank for comparison), "moved" (companies
+            whose rank changes) and "elapsed_ms"
+        """
+        start = time.perf_counter()
+        resolved = resolve_weights(weights)
+        scores = score_features(self.features, resolved)
+        ranks = _ranks(scores)
+        top = np.argsort(ranks)[:max(0, limit)]
+        
+        companies = [
+            {
+                "id": int(self.features.company_ids[i]),
+                "name": self.features.names[i],
+                "score": round(float(scores[i]), 2),
+                "rank": int(ranks[i]),
+                "current_score": round(float(self.baseline_scores[i]), 2),
+                "current_rank": int(self.baseline_ranks[i]),
+            }
+            for i in top
+        ]
+        return {
+            "weights": resolved,
+            "companies": companies,
+            "total_companies": len(self.features),
+            "moved": int(np.count_nonzero(ranks != self.baseline_ranks)),
+            "loaded_at": self.loaded_at.isoformat(),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """1-based rank of each score, highest first (ties keep table order)."""
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.arange(1, len(scores) + 1)
+    return ranks
@@ -0,0 +1,498 @@
+"""Record/replay harness and local stand-ins for the Tavily and Groq clients.
+
+The stand-ins implement the small slice of each SDK RoleRadar uses
+(``TavilyClient.search`` and ``Groq.chat.completions.create``) so the
+services can be benchmarked and load-tested without spending API quota.
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+API_MODES = ("live", "record", "replay", "synthetic")
+
+
+class SimulatedAPIError(Exception):
+    """Error raised by a stand-in client, shaped like an SDK status error."""
+    
+    def __init__(self, message: str, status_code: int = 500, retry_after: float = None):
+        """
+        Initialize error.
+        
+        Args:
+            message: Error message
+            status_code: HTTP status the real API would have returned
+            retry_after: Seconds the caller should wait before retrying
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class SimulatedRateLimitError(SimulatedAPIError):
+    """HTTP 429 raised by a stand-in client."""
+    
+    def __init__(self, message: str = "Rate limit exceeded", retry_after: float = 1.0):
+        """Initialize a 429 error that asks the caller to wait ``retry_after`` seconds."""
+        super().__init__(message, status_code=429, retry_after=retry_after)
+
+
+class FaultInjector:
+    """Adds latency, random errors and an RPM limit to stand-in calls."""
+    
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rpm: int = 0,
+        seed: int = None
+    ):
+        """
+        Initialize fault injector.
+        
+        Args:
+            latency: Base seconds added to every call
+            jitter: Extra uniformly random seconds (0..jitter)
+            error_rate: Probability of a simulated 500 error
+            rate_limit_rpm: Calls per rolling minute before 429s (0 disables)
+            seed: Random seed for reproducible runs
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rpm = rate_limit_rpm
+        self._rng = random.Random(seed)
+        self._calls = deque()
+        self._lock = threading.Lock()
+    
+    def before_call(self):
+        """Apply rate limiting, latency and random errors."""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate_limit_rpm:
+                while self._calls and now - self._calls[0] > 60:
+                    self._calls.popleft()
+                if len(self._calls) >= self.rate_limit_rpm:
+                    raise SimulatedRateLimitError(retry_after=60 - (now - self._calls[0]))
+                self._calls.append(now)
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self._rng.random() < self.error_rate
+        
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise SimulatedAPIError("Simulated server error", status_code=500)
+
+
+def _request_key(payload: Dict[str, Any]) -> str:
+    """Hash a request payload into a replay key."""
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _load_recordings(path: str) -> Dict[str, List[Any]]:
+    """Load JSONL recordings grouped by request key."""
+    recordings = {}
+    if not os.path.exists(path):
+        return recordings
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                recordings.setdefault(entry["key"], []).append(entry["response"])
+    return recordings
+
+
+class _Recorder:
+    """Appends request/response pairs to a JSONL file."""
+    
+    def __init__(self, path: str):
+        """Initialize recorder appending to the JSONL file at ``path``."""
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    
+    def write(self, request: Dict[str, Any], response: Any):
+        """Append one request/response pair, keyed by the request hash."""
+        entry = {"key": _request_key(request), "request": request, "response": response}
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, default=str) + "\n")
+
+
+# ---------------------------------------------------------------------------
+# Tavily
+# ---------------------------------------------------------------------------
+
+class RecordingTavilyClient:
+    """Wraps a real Tavily client and records every search to disk."""
+    
+    def __init__(self, client, path: str):
+        """
+        Initialize recording client.
+        
+        Args:
+            client: Real ``TavilyClient``
+            path: JSONL file the searches are appended to
+        """
+        self.client = client
+        self._recorder = _Recorder(path)
+    
+    def search(self, **kwargs) -> Dict[str, Any]:
+        """Run a real search and record it."""
+        response = self.client.search(**kwargs)
+        self._recorder.write(kwargs, response)
+        return response
+
+
+class SyntheticTavilyClient:
+    """Generates plausible job-search results locally."""
+    
+    COMPANIES = [
+        "Acme Security", "Northwind Health", "Globex Financial", "Initech",
+        "Umbrella Cloud", "Stark Analytics", "Wayne Fintech", "Hooli",
+        "Vandelay Logistics", "Soylent Labs", "Cyberdyne Systems", "Tyrell Data",
+    ]
+    LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "Boston, MA", "Seattle, WA"]
+    
+    def __init__(self, faults: FaultInjector = None, seed: int = None):
+        """
+        Initialize synthetic client.
+        
+        Args:
+            faults: Latency, errors and rate limits to simulate (none if not provided)
+            seed: Random seed for reproducible results
+        """
+        self.faults = faults or FaultInjector()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def search(self, query: str, max_results: int = 10, **kwargs) -> Dict[str, Any]:
+        """Generate ``max_results`` postings for the role named in ``query``."""
+        self.faults.before_call()
+        role = re.sub(r"\s+(job openings|hiring)$", "", query).strip() or "security engineer"
+        
+        results = []
+        with self._lock:
+            for _ in range(max_results):
+                company = self._rng.choice(self.COMPANIES)
+                location = self._rng.choice(self.LOCATIONS)
+                posting_id = self._rng.randrange(1, 5000)
+                title = f"{role.title()} at {company}"
+                content = (
+                    f"{company} is hiring a {role} in {location}. The role owns security "
+                    f"and compliance programs, works with engineering on risk management, "
+                    f"and reports to the CISO. {company} recently announced new funding "
+                    f"and plans to expand its team. Posting #{posting_id}."
+                )
+                results.append({
+                    "title": title,
+                    "url": f"https://jobs.example.com/{company.lower().replace(' ', '-')}/{posting_id}",
+                    "content": content,
+                    "score": round(self._rng.uniform(0.5, 1.0), 3),
+                    "published_date": "",
+                })
+        return {"query": query, "results": results}
+
+
+class ReplayTavilyClient:
+    """Replays recorded Tavily searches, falling back to synthetic results."""
+    
+    def __init__(self, path: str, faults: FaultInjector = None, fallback=None):
+        """
+        Initialize replay client.
+        
+        Args:
+            path: JSONL file written by ``RecordingTavilyClient``
+            faults: Latency, errors and rate limits to simulate (none if not provided)
+            fallback: Client answering searches without a recording (404 if not provided)
+        """
+        self.faults = faults or FaultInjector()
+        self.fallback = fallback
+        self._recordings = _load_recordings(path)
+        self._positions = {}
+        self._lock = threading.Lock()
+    
+    def search(self, **kwargs) -> Dict[str, Any]:
+        """Return the next recorded response for these search arguments."""
+        self.faults.before_call()
+        response = _next_recording(self._recordings, self._positions, self._lock, kwargs)
+        if response is None:
+            if self.fallback is None:
+                raise SimulatedAPIError(f"No recording for search {kwargs.get('query')!r}", 404)
+            return self.fallback.search(**kwargs)
+        return response
+
+
+# ---------------------------------------------------------------------------
+# Groq
+# ---------------------------------------------------------------------------
+
+def _completion(content: str, model: str, prompt_tokens: int, completion_tokens: int):
+    """Build an object shaped like a Groq chat completion."""
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(message=SimpleNamespace(role="assistant", content=content))],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+    )
+
+
+def _completion_to_dict(response) -> Dict[str, Any]:
+    """Serialize a chat completion for recording."""
+    usage = getattr(response, "usage", None)
+    return {
+        "model": getattr(response, "model", None),
+        "content": response.choices[0].message.content,
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+def _completion_from_dict(data: Dict[str, Any]):
+    """Rebuild a chat completion from a recording."""
+    return _completion(data["content"], data.get("model"), data["prompt_tokens"], data["completion_tokens"])
+
+
+def _chat_request(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce chat completion arguments to the parts that determine the answer."""
+    return {"model": kwargs.get("model"), "messages": kwargs.get("messages")}
+
+
+class _ChatNamespace:
+    """Provides the ``client.chat.completions.create`` attribute path."""
+    
+    def __init__(self, create):
+        """Expose ``create`` as ``completions.create``."""
+        self.completions = SimpleNamespace(create=create)
+
+
+class RecordingGroqClient:
+    """Wraps a real Groq client and records every chat completion to disk."""
+    
+    def __init__(self, client, path: str):
+        """
+        Initialize recording client.
+        
+        Args:
+            client: Real ``Groq`` client
+            path: JSONL file the chat completions are appended to
+        """
+        self.client = client
+        self._recorder = _Recorder(path)
+        self.chat = _ChatNamespace(self._create)
+    
+    def _create(self, **kwargs):
+        """Send a real chat completion and record it."""
+        response = self.client.chat.completions.create(**kwargs)
+        self._recorder.write(_chat_request(kwargs), _completion_to_dict(response))
+        return response
+
+
+class SyntheticGroqClient:
+    """Answers RoleRadar's prompts locally with well-formed JSON."""
+    
+    def __init__(self, faults: FaultInjector = None):
+        """Initialize synthetic client with optional simulated faults."""
+        self.faults = faults or FaultInjector()
+        self.chat = _ChatNamespace(self._create)
+    
+    def _create(self, messages: List[Dict[str, str]], model: str = None, **kwargs):
+        """Answer the last message of a chat completion request."""
+        self.faults.before_call()
+        prompt = messages[-1]["content"]
+        content = self._answer(prompt)
+        return _completion(content, model, max(1, len(prompt) // 4), max(1, len(content) // 4))
+    
+    def _answer(self, prompt: str) -> str:
+        """Produce a plausible response for a prompt."""
+        if "executive summary" in prompt:
+            return "Synthetic summary: several companies are actively hiring for security roles."
+        
+        if "Documents:" in prompt:
+            documents = re.split(r"\[id=([^\]]+)\]\n", prompt.split("Documents:", 1)[1])[1:]
+            return json.dumps([
+                {"id": item_id, **self._analysis(text)}
+                for item_id, text in zip(documents[0::2], documents[1::2])
+            ])
+        
+        text = prompt.split("Text:", 1)[-1]
+        analysis = self._analysis(text)
+        entities, signals = analysis["entities"], analysis["signals"]
+        
+        if '"entities"' in prompt and '"signals"' in prompt:
+            return json.dumps(analysis)
+        if "hiring signals" in prompt and "Extract:" not in prompt:
+            return json.dumps(signals)
+        return json.dumps(entities)
+    
+    @staticmethod
+    def _analysis(text: str) -> Dict[str, Any]:
+        """Derive entities and signals from a document with simple patterns."""
+        company = re.search(r"\bat ([A-Z][\w&.-]*(?: [A-Z][\w&.-]*)*)", text)
+        title = re.search(r"hiring an? ([\w ()-]+?) in ", text)
+        location = re.search(r" in ([A-Z][\w ,]+?)\.", text)
+        
+        entities = {
+            "company_name": company.group(1) if company else None,
+            "job_title": title.group(1).title() if title else None,
+            "role_type": "security",
+            "location": location.group(1) if location else None,
+            "keywords": ["security", "compliance"],
+        }
+        signals = {
+            "has_signal": "funding" in text,
+            "signal_type": "funding" if "funding" in text else "none",
+            "confidence": 0.8 if "funding" in text else 0.0,
+            "description": "Recent funding announcement" if "funding" in text else "",
+        }
+        
+        return {"entities": entities, "signals": signals}
+
+
+class ReplayGroqClient:
+    """Replays recorded chat completions, falling back to synthetic answers."""
+    
+    def __init__(self, path: str, faults: FaultInjector = None, fallback=None):
+        """
+        Initialize replay client.
+        
+        Args:
+            path: JSONL file written by ``RecordingGroqClient``
+            faults: Latency, errors and rate limits to simulate (none if not provided)
+            fallback: Client answering requests without a recording (404 if not provided)
+        """
+        self.faults = faults or FaultInjector()
+        self.fallback = fallback
+        self._recordings = _load_recordings(path)
+        self._positions = {}
+        self._lock = threading.Lock()
+        self.chat = _ChatNamespace(self._create)
+    
+    def _create(self, **kwargs):
+        """Return the next recorded completion for this model and messages."""
+        self.faults.before_call()
+        data = _next_recording(self._recordings, self._positions, self._lock, _chat_request(kwargs))
+        if data is None:
+            if self.fallback is None:
+                raise SimulatedAPIError("No recording for chat completion", 404)
+            return self.fallback.chat.completions.create(**kwargs)
+        return _completion_from_dict(data)
+
+
+def _next_recording(recordings, positions, lock, request: Dict[str, Any]) -> Optional[Any]:
+    """Return the next recorded response for a request, cycling through repeats."""
+    key = _request_key(request)
+    responses = recordings.get(key)
+    if not responses:
+        return None
+    with lock:
+        position = positions.get(key, 0)
+        positions[key] = position + 1
+    return responses[position % len(responses)]
+
+
+# ---------------------------------------------------------------------------
+# Factories
+# ---------------------------------------------------------------------------
+
+def create_api_clients(
+    mode: str,
+    recordings_dir: str,
+    latency: float = 0.0,
+    error_rate: float = 0.0,
+    rate_limit_rpm: int = 0,
+    seed: int = None
+):
+    """
+    Build (tavily_client, groq_client) for an API mode.
+    
+    Args:
+        mode: "live", "record", "replay" or "synthetic"
+        recordings_dir: Directory holding tavily.jsonl and groq.jsonl
+        latency: Simulated per-call latency in seconds (replay/synthetic)
+        error_rate: Simulated 500 error probability (replay/synthetic)
+        rate_limit_rpm: Simulated requests-per-minute limit (replay/synthetic)
+        seed: Random seed for reproducible runs
+    
+    Returns:
+        Tuple of clients, or (None, None) in live mode so the services
+        build real clients themselves
+    """
+    if mode not in API_MODES:
+        raise ValueError(f"Unknown API mode '{mode}', expected one of {', '.join(API_MODES)}")
+    
+    if mode == "live":
+        return None, None
+    
+    tavily_path = os.path.join(recordings_dir, "tavily.jsonl")
+    groq_path = os.path.join(recordings_dir, "groq.jsonl")
+    
+    if mode == "record":
+        from tavily import TavilyClient
+        from groq import Groq
+        from ..config import config
+        
+        return (
+            RecordingTavilyClient(TavilyClient(api_key=config.TAVILY_API_KEY), tavily_path),
+            RecordingGroqClient(Groq(api_key=config.GROQ_API_KEY, max_retries=0), groq_path),
+        )
+    
+    def faults():
+        """Fresh fault injector with the requested settings."""
+        return FaultInjector(
+            latency=latency,
+            jitter=latency / 2,
+            error_rate=error_rate,
+            rate_limit_rpm=rate_limit_rpm,
+            seed=seed
+        )
+    
+    if mode == "synthetic":
+        return SyntheticTavilyClient(faults=faults(), seed=seed), SyntheticGroqClient(faults=faults())
+    
+    # Faults are applied once by the replay client, not again by its fallback
+    return (
+        ReplayTavilyClient(tavily_path, faults=faults(), fallback=SyntheticTavilyClient(seed=seed)),
+        ReplayGroqClient(groq_path, faults=faults(), fallback=SyntheticGroqClient()),
+    )
+
+
+def create_services():
+    """
+    Build (TavilySearchService, GroqAnalysisService) for the configured API mode.
+    
+    Reads API_MODE, API_RECORDINGS_DIR and the SIM_* settings from config.
+    With ANALYSIS_BACKEND set to "local" the analysis service is the
+    rule-based ``LocalAnalysisService`` instead.
+    """
+    from ..config import config
+    from .groq_service import GroqAnalysisService
+    from .local_extractor import LocalAnalysisService
+    from .tavily_service import TavilySearchService
+    
+    tavily_client, groq_client = create_api_clients(
+        config.API_MODE,
+        config.API_RECORDINGS_DIR,
+        latency=config.SIM_LATENCY,
+        error_rate=config.SIM_ERROR_RATE,
+        rate_limit_rpm=config.SIM_RATE_LIMIT_RPM
+    )
+    if config.API_MODE != "live":
+        print(f"Using {config.API_MODE} API clients ({config.API_RECORDINGS_DIR})")
+    if config.ANALYSIS_BACKEND == "local":
+        print("Using local rule-based extraction (no LLM calls)")
+        return TavilySearchService(client=tavily_client), LocalAnalysisService()
+    if config.ANALYSIS_BACKEND != "groq":
+        raise ValueError(f"Unknown analysis backend '{config.ANALYSIS_BACKEND}', expected groq or local")
+    return TavilySearchService(client=tavily_client), GroqAnalysisService(client=groq_client)
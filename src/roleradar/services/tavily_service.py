@@ -1,32 +1,96 @@
 """Tavily search service for discovering opportunities."""
 
-from typing import List, Dict, Any
-from datetime import datetime, timezone
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Any, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_, update
+from sqlalchemy.orm import undefer
 from tavily import TavilyClient
 from ..config import config
 from ..models import SearchResult
 from ..database import db_service
+from ..utils import chunked, normalize_url
+from .cache import DiskCache, make_cache_key
+from .dedup import NearDuplicateIndex
+from .query_planner import QueryPlanner, print_plan
+from .rate_limiter import TokenBucket
+from .watermarks import QueryWatermarkTracker
+
+
+class ClaimLostError(Exception):
+    """Another processor took over a result after this processor's lease expired."""
 
 
 class TavilySearchService:
     """Service for performing targeted searches using Tavily API."""
     
-    def __init__(self, api_key=None):
-        """Initialize Tavily search service."""
+    # Keep IN lists well below SQLite's bound-parameter limit
+    LOOKUP_CHUNK_SIZE = 500
+    
+    def __init__(self, api_key=None, client=None):
+        """
+        Initialize Tavily search service.
+        
+        Args:
+            api_key: Tavily API key (uses config if not provided)
+            client: Object with a ``search`` method to use instead of a real
+                ``TavilyClient`` (e.g. a recording or simulated client)
+        """
         self.api_key = api_key or config.TAVILY_API_KEY
-        if not self.api_key:
+        if client is not None:
+            self.client = client
+        elif not self.api_key:
             print("Warning: Tavily API key not configured. Search functionality will be limited.")
             self.client = None
         else:
             self.client = TavilyClient(api_key=self.api_key)
+        
+        # Shared across all search threads so concurrency never exceeds the API rate
+        self.rate_limiter = TokenBucket(config.SEARCH_RATE_LIMIT, config.SEARCH_RATE_BURST)
+        self.dedup_index = NearDuplicateIndex(max_distance=config.DEDUP_MAX_DISTANCE)
+        self.watermarks = (
+            QueryWatermarkTracker(recent_urls=config.WATERMARK_RECENT_URLS)
+            if config.INCREMENTAL_SEARCH else None
+        )
+        self.planner = QueryPlanner() if config.QUERY_PLANNER else None
+        # Recorded, replayed and synthetic runs neither read nor fill the live cache
+        self.cache = DiskCache(
+            config.CACHE_PATH,
+            namespace="tavily",
+            ttl_seconds=config.SEARCH_CACHE_TTL if config.API_MODE == "live" else 0,
+            max_entries=config.SEARCH_CACHE_MAX_ENTRIES
+        )
+        self.last_run_report: Dict[str, Any] = {}
+        
+        # Owner recorded on claimed search results, unique per process
+        self.worker_id = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
     
-    def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        max_results: int = 10,
+        search_depth: str = "advanced",
+        include_domains: List[str] = None,
+        exclude_domains: List[str] = None,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
         """
         Perform a search using Tavily.
         
+        Responses are served from the on-disk TTL cache when an identical
+        search ran recently.
+        
         Args:
             query: Search query string
             max_results: Maximum number of results to return
+            search_depth: Tavily search depth ("basic" or "advanced")
+            include_domains: Only return results from these domains
+            exclude_domains: Never return results from these domains
+            use_cache: Whether to read from and write to the response cache
             
         Returns:
             List of search results
@@ -35,82 +99,430 @@ class TavilySearchService:
             print("Error: Tavily client not initialized. Please configure TAVILY_API_KEY.")
             return []
         
+        include_domains = sorted(include_domains or [])
+        exclude_domains = sorted(exclude_domains or [])
+        cache_key = make_cache_key(query, max_results, search_depth, include_domains, exclude_domains)
+        
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
+            self.rate_limiter.acquire()
+            start = time.perf_counter()
             response = self.client.search(
                 query=query,
                 max_results=max_results,
-                search_depth="advanced",
-                include_domains=[],
-                exclude_domains=[]
+                search_depth=search_depth,
+                include_domains=include_domains,
+                exclude_domains=exclude_domains
             )
             
             results = response.get("results", [])
+            if use_cache:
+                self.cache.set(cache_key, results, cost=time.perf_counter() - start)
             return results
         except Exception as e:
             print(f"Error performing search for '{query}': {e}")
             return []
     
-    def daily_search(self, queries: List[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    def daily_search(
+        self,
+        queries: List[str] = None,
+        concurrency: int = None,
+        on_stored: Callable[[List[int]], None] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Perform daily targeted searches for security, compliance, and GRC opportunities.
         
+        Queries run on a thread pool capped at ``concurrency`` and share one
+        token-bucket rate limiter. Results are stored from the calling thread
+        so database writes stay serialized. With incremental search enabled,
+        results a query has already produced are dropped before storage.
+        
         Args:
-            queries: List of search queries (uses default if not provided)
+            queries: List of search queries (uses the planned default queries if not provided)
+            concurrency: Maximum in-flight searches (uses SEARCH_CONCURRENCY if not provided)
+            on_stored: Called with the ids of newly stored results awaiting
+                processing, as soon as each query's results are stored
             
         Returns:
-            Dictionary mapping queries to their results
+            Dictionary mapping queries to their new results
         """
+        plan = run_id = None
         if queries is None:
             queries = config.SEARCH_QUERIES
+            if self.planner:
+                plan = self.planner.plan(queries)
+                queries = [decision["query"] for decision in plan if decision["action"] != "skip"]
+                run_id = self.planner.start_run(plan)
+        if concurrency is None:
+            concurrency = config.SEARCH_CONCURRENCY
         
         all_results = {}
+        timings = {}
+        stored = {"inserted": 0, "skipped": 0, "near_duplicates": 0, "below_watermark": 0}
+        query_counts = {}
+        run_start = time.perf_counter()
         
-        for query in queries:
-            print(f"Searching: {query}")
-            results = self.search(query, max_results=10)
-            all_results[query] = results
+        if concurrency <= 1:
+            for query in queries:
+                results, elapsed = self._timed_search(query)
+                all_results[query] = self._ingest(query, results, stored, on_stored, query_counts)
+                timings[query] = elapsed
+        else:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = {
+                    executor.submit(self._timed_search, query): query
+                    for query in dict.fromkeys(queries)
+                }
+                for future in as_completed(futures):
+                    query = futures[future]
+                    results, elapsed = future.result()
+                    all_results[query] = self._ingest(query, results, stored, on_stored, query_counts)
+                    timings[query] = elapsed
             
-            # Store raw results in database
-            self._store_search_results(query, results)
+            # Keep the caller's query order
+            all_results = {query: all_results[query] for query in queries}
+        
+        self.last_run_report = {
+            "wall_time": time.perf_counter() - run_start,
+            "concurrency": max(concurrency, 1),
+            "query_timings": timings,
+            "cache": self.cache.stats()["run"],
+            "plan": plan,
+            **stored,
+        }
+        if plan is not None:
+            self.planner.record_run(run_id, query_counts)
+            print_plan(plan, self.planner.budget)
+        self._print_timing_report()
         
         return all_results
     
-    def _store_search_results(self, query: str, results: List[Dict[str, Any]]):
-        """Store search results in database."""
+    def _ingest(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        stored: Dict[str, int],
+        on_stored: Callable[[List[int]], None] = None,
+        query_counts: Dict[str, Dict[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Filter results against the query watermark, store them and advance the watermark."""
+        new_results = results
+        if self.watermarks:
+            new_results, dropped = self.watermarks.filter_new(query, results)
+            stored["below_watermark"] += dropped
+        
+        # Store raw results in database
+        counts = self._store_search_results(query, new_results)
+        pending_ids = counts.pop("pending_ids")
+        self._add_counts(stored, counts)
+        if query_counts is not None:
+            query_counts[query] = {
+                "results": len(results),
+                "new_urls": counts["inserted"] - counts["near_duplicates"],
+            }
+        if on_stored and pending_ids:
+            on_stored(pending_ids)
+        
+        if self.watermarks:
+            self.watermarks.advance(query, results)
+        
+        return new_results
+    
+    @staticmethod
+    def _add_counts(totals: Dict[str, int], counts: Dict[str, int]):
+        """Add per-batch counts into running totals."""
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+    
+    def _timed_search(self, query: str) -> Tuple[List[Dict[str, Any]], float]:
+        """Run one search and return its results with the elapsed time."""
+        print(f"Searching: {query}")
+        start = time.perf_counter()
+        results = self.search(query, max_results=10)
+        return results, time.perf_counter() - start
+    
+    def _print_timing_report(self):
+        """Print per-query timing for the last daily search run."""
+        report = self.last_run_report
+        timings = report.get("query_timings", {})
+        if not timings:
+            return
+        
+        total_latency = sum(timings.values())
+        print(f"\nSearch timing (concurrency={report['concurrency']}):")
+        for query, elapsed in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+            print(f"  {elapsed:6.2f}s  {query}")
+        print(f"  Wall time: {report['wall_time']:.2f}s "
+              f"(sum of query latencies: {total_latency:.2f}s)")
+        if self.watermarks:
+            print(f"  Dropped {report['below_watermark']} results already seen by their query")
+        print(f"  Stored {report['inserted']} new results "
+              f"({report['near_duplicates']} near-duplicates), "
+              f"skipped {report['skipped']} duplicate URLs")
+        
+        cache = report["cache"]
+        if self.cache.enabled:
+            print(f"  Cache: {cache['hits']} hits, {cache['misses']} misses "
+                  f"({cache['hit_rate']:.0%} hit rate, ~{cache['saved_seconds']:.1f}s of API time saved)")
+    
+    def _store_search_results(self, query: str, results: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Store search results in database.
+        
+        Results are deduplicated by canonical URL, both within the batch and
+        against the table, with one ``IN`` lookup per chunk and a single bulk
+        insert that skips URLs a concurrent ingest stored meanwhile. New rows
+        whose content is a near-duplicate of an earlier result are stored
+        already marked as processed.
+        
+        Returns:
+            Dictionary with counts of inserted, skipped and near-duplicate rows,
+            plus the ids of inserted rows awaiting processing
+        """
+        rows = {}
+        skipped = 0
+        retrieved_date = datetime.now(timezone.utc)
+        
+        for result in results:
+            url = (result.get("url") or "")[:512]
+            url_key = normalize_url(url)
+            if not url_key or url_key in rows:
+                skipped += 1
+                continue
+            
+            rows[url_key] = {
+                "query": query,
+                "title": (result.get("title") or "")[:512],
+                "content": result.get("content", ""),
+                "url": url,
+                "url_key": url_key,
+                "score": result.get("score", 0.0),
+                "published_date": result.get("published_date", ""),
+                "retrieved_date": retrieved_date,
+                "processed": False,
+            }
+        
+        if not rows:
+            return {"inserted": 0, "skipped": skipped, "near_duplicates": 0, "pending_ids": []}
+        
         with db_service.get_session() as session:
-            for result in results:
-                # Check if result already exists by URL
-                existing = session.query(SearchResult).filter_by(
-                    url=result.get("url")
-                ).first()
-                
-                if not existing:
-                    search_result = SearchResult(
-                        query=query,
-                        title=result.get("title", "")[:512],
-                        content=result.get("content", ""),
-                        url=result.get("url", "")[:512],
-                        score=result.get("score", 0.0),
-                        published_date=result.get("published_date", ""),
-                        retrieved_date=datetime.now(timezone.utc),
-                        processed=False
+            existing = set()
+            for keys in chunked(rows.keys(), self.LOOKUP_CHUNK_SIZE):
+                existing.update(
+                    key for (key,) in session.query(SearchResult.url_key).filter(
+                        SearchResult.url_key.in_(keys)
                     )
-                    session.add(search_result)
+                )
+            
+            new_rows = [row for key, row in rows.items() if key not in existing]
+            # A concurrent ingest may store some of these URLs after the lookup
+            pending_ids, near_duplicates, conflicts = (
+                self.dedup_index.insert_rows(session, new_rows) if new_rows else ([], 0, 0)
+            )
+        
+        return {
+            "inserted": len(new_rows) - conflicts,
+            "skipped": skipped + len(existing) + conflicts,
+            "near_duplicates": near_duplicates,
+            "pending_ids": pending_ids,
+        }
     
     def get_unprocessed_results(self, limit: int = 50) -> List[SearchResult]:
-        """Get unprocessed search results from database."""
+        """
+        Claim up to ``limit`` unprocessed search results for this processor.
+        
+        Results claimed by another processor are left alone until their
+        lease (PROCESS_LEASE_SECONDS) expires, so concurrent runs never
+        analyze the same result.
+        """
+        with db_service.get_session() as session:
+            candidates = [
+                result_id for (result_id,) in session.query(SearchResult.id).filter(
+                    SearchResult.processed.is_(False),
+                    self._claimable()
+                ).order_by(SearchResult.id).limit(limit)
+            ]
+        return self.claim_results(candidates)
+    
+    def claim_results(self, result_ids: List[int]) -> List[SearchResult]:
+        """
+        Atomically claim search results for this processor.
+        
+        A conditional ``UPDATE`` takes the results that are still
+        unprocessed and unclaimed (or whose lease expired, or that this
+        processor already holds); the claimed rows are then read back by
+        owner.
+        
+        Args:
+            result_ids: Ids of the results to claim
+            
+        Returns:
+            The results now held by this processor, detached from the session
+        """
+        if not result_ids:
+            return []
+        with db_service.get_session() as session:
+            for batch in chunked(list(result_ids), self.LOOKUP_CHUNK_SIZE):
+                session.execute(
+                    update(SearchResult)
+                    .where(
+                        SearchResult.id.in_(batch),
+                        SearchResult.processed.is_(False),
+                        self._claimable()
+                    )
+                    .values(claimed_by=self.worker_id, claimed_at=datetime.now(timezone.utc))
+                    .execution_options(synchronize_session=False)
+                )
+        
+        results = []
         with db_service.get_session() as session:
-            results = session.query(SearchResult).filter_by(
-                processed=False
-            ).limit(limit).all()
+            for batch in chunked(list(result_ids), self.LOOKUP_CHUNK_SIZE):
+                results.extend(
+                    session.query(SearchResult).options(
+                        undefer(SearchResult.content)
+                    ).filter(
+                        SearchResult.id.in_(batch),
+                        SearchResult.claimed_by == self.worker_id,
+                        SearchResult.processed.is_(False)
+                    ).all()
+                )
             
             # Detach from session
             session.expunge_all()
-            return results
+        results.sort(key=lambda result: result.id)
+        return results
+    
+    def renew_claims(self, result_ids: List[int]) -> List[int]:
+        """
+        Restart the lease on results this processor holds.
+        
+        Returns:
+            Ids of the results still held; the others were processed or,
+            after the lease expired, claimed by another processor
+        """
+        self._update_claims(result_ids, claimed_at=datetime.now(timezone.utc))
+        held = []
+        with db_service.get_session() as session:
+            for batch in chunked(list(result_ids), self.LOOKUP_CHUNK_SIZE):
+                held.extend(
+                    result_id for (result_id,) in session.query(SearchResult.id).filter(
+                        SearchResult.id.in_(batch),
+                        SearchResult.claimed_by == self.worker_id,
+                        SearchResult.processed.is_(False)
+                    )
+                )
+        return held
+    
+    def release_claims(self, result_ids: List[int]):
+        """
+        Give up this processor's claim on results it did not finish.
+        
+        Processed results and results claimed by another processor are
+        left untouched; released results can be claimed again at once.
+        """
+        self._update_claims(result_ids, claimed_by=None, claimed_at=None)
+    
+    def _update_claims(self, result_ids: List[int], **values):
+        """Update the claim columns of unprocessed results this processor holds."""
+        if not result_ids:
+            return
+        with db_service.get_session() as session:
+            for batch in chunked(list(result_ids), self.LOOKUP_CHUNK_SIZE):
+                session.execute(
+                    update(SearchResult)
+                    .where(
+                        SearchResult.id.in_(batch),
+                        SearchResult.claimed_by == self.worker_id,
+                        SearchResult.processed.is_(False)
+                    )
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+    
+    def _claimable(self):
+        """Condition matching results this processor may claim."""
+        expired = datetime.now(timezone.utc) - timedelta(seconds=config.PROCESS_LEASE_SECONDS)
+        return or_(
+            SearchResult.claimed_at.is_(None),
+            SearchResult.claimed_at < expired,
+            SearchResult.claimed_by == self.worker_id
+        )
+    
+    def _held_or_unclaimed(self):
+        """Condition matching results no other processor holds."""
+        return or_(
+            SearchResult.claimed_by.is_(None),
+            SearchResult.claimed_by == self.worker_id
+        )
     
     def mark_as_processed(self, result_id: int):
         """Mark a search result as processed."""
+        self.mark_many_as_processed([result_id])
+    
+    def mark_many_as_processed(self, result_ids: List[int], session=None) -> int:
+        """
+        Mark search results as processed with bulk ``UPDATE ... WHERE id IN`` statements.
+        
+        Results claimed by another processor are left untouched.
+        
+        Args:
+            result_ids: Ids of the processed results
+            session: Session to run in, so the flags commit with the caller's
+                writes (a new session is used if not provided)
+                
+        Returns:
+            Number of results marked
+        """
+        if not result_ids:
+            return 0
+        if session is None:
+            with db_service.get_session() as session:
+                return self.mark_many_as_processed(result_ids, session=session)
+        marked = 0
+        for batch in chunked(list(result_ids), 500):
+            marked += session.execute(
+                update(SearchResult)
+                .where(
+                    SearchResult.id.in_(batch),
+                    SearchResult.processed.is_(False),
+                    self._held_or_unclaimed()
+                )
+                .values(processed=True, claimed_by=None, claimed_at=None)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        return marked
+    
+    def mark_as_skipped(self, scores: Dict[int, float], reason: str = "irrelevant"):
+        """
+        Mark search results as processed without analyzing them.
+        
+        Results claimed by another processor are left untouched.
+        
+        Args:
+            scores: Relevance score of each skipped result, by id
+            reason: Why the results were skipped
+        """
+        if not scores:
+            return
+        statement = (
+            update(SearchResult)
+            .where(self._held_or_unclaimed())
+            .execution_options(synchronize_session=None)
+        )
         with db_service.get_session() as session:
-            result = session.query(SearchResult).get(result_id)
-            if result:
-                result.processed = True
+            for batch in chunked(list(scores.items()), 500):
+                session.execute(statement, [
+                    {
+                        "id": result_id,
+                        "processed": True,
+                        "skip_reason": reason,
+                        "relevance_score": score,
+                        "claimed_by": None,
+                        "claimed_at": None
+                    }
+                    for result_id, score in batch
+                ])
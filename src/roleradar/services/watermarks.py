@@ -0,0 +1,95 @@
+"""Per-query watermarks for incremental searching."""
+
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+from ..models import QueryWatermark
+from ..database import db_service
+from ..utils import normalize_url, parse_published_date, to_naive_utc
+
+
+class QueryWatermarkTracker:
+    """
+    Track what each query has already returned.
+    
+    A watermark holds the newest ``published_date`` seen for a query and a
+    bounded list of recently seen URLs. Results at or below the watermark,
+    or with a recently seen URL, are dropped before storage so re-ingest
+    work scales with what is new.
+    """
+    
+    def __init__(self, recent_urls: int = 500):
+        """
+        Initialize tracker.
+        
+        Args:
+            recent_urls: Number of recently seen URLs remembered per query
+        """
+        self.recent_urls = recent_urls
+    
+    def filter_new(self, query: str, results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Drop results the query has already produced.
+        
+        Args:
+            query: Search query
+            results: Raw search results
+            
+        Returns:
+            Tuple of (new results, number of dropped results)
+        """
+        with db_service.get_session() as session:
+            watermark = session.query(QueryWatermark).filter_by(query=query).first()
+            if not watermark:
+                return results, 0
+            
+            latest = to_naive_utc(watermark.latest_published_date)
+            seen = set(json.loads(watermark.recent_url_keys or "[]"))
+        
+        new_results = []
+        for result in results:
+            if normalize_url(result.get("url")) in seen:
+                continue
+            
+            published = parse_published_date(result.get("published_date"))
+            if latest and published and published <= latest:
+                continue
+            
+            new_results.append(result)
+        
+        return new_results, len(results) - len(new_results)
+    
+    def advance(self, query: str, results: List[Dict[str, Any]]):
+        """
+        Move a query's watermark past the results of a run.
+        
+        Pass every result the query returned, not just the new ones, so URLs
+        that keep reappearing stay in the recent set.
+        
+        Args:
+            query: Search query
+            results: Raw search results from this run
+        """
+        now = datetime.now(timezone.utc)
+        
+        with db_service.get_session() as session:
+            watermark = session.query(QueryWatermark).filter_by(query=query).first()
+            if not watermark:
+                watermark = QueryWatermark(query=query, run_count=0, first_run_at=now)
+                session.add(watermark)
+            
+            url_keys = [normalize_url(result.get("url")) for result in results]
+            recent = json.loads(watermark.recent_url_keys or "[]")
+            merged = list(dict.fromkeys([key for key in url_keys if key] + recent))
+            watermark.recent_url_keys = json.dumps(merged[:self.recent_urls])
+            
+            published_dates = [
+                date for date in (parse_published_date(r.get("published_date")) for r in results)
+                if date is not None
+            ]
+            latest = to_naive_utc(watermark.latest_published_date)
+            if published_dates and (latest is None or max(published_dates) > latest):
+                watermark.latest_published_date = max(published_dates)
+            
+            watermark.last_run_at = now
+            watermark.run_count = (watermark.run_count or 0) + 1
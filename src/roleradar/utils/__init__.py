@@ -0,0 +1,12 @@
+"""Initialize utils package."""
+
+from .batching import chunked
+from .dates import parse_published_date, to_naive_utc
+from .keywords import KeywordMatcher
+from .text import estimate_tokens, prepare_text
+from .urls import normalize_url
+
+__all__ = [
+    "chunked", "parse_published_date", "to_naive_utc", "normalize_url", "KeywordMatcher",
+    "estimate_tokens", "prepare_text",
+]
@@ -0,0 +1,26 @@
+"""Helpers for working with data in fixed-size batches."""
+
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split an iterable into lists of at most ``size`` items.
+    
+    Args:
+        items: Items to split
+        size: Maximum batch size
+        
+    Yields:
+        Consecutive batches of items
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,40 @@
+"""Date parsing helpers."""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_published_date(value: str) -> Optional[datetime]:
+    """
+    Parse a published date as returned by search APIs.
+    
+    Accepts ISO 8601 and RFC 2822 ("Wed, 10 Jan 2024 15:00:00 GMT") strings.
+    
+    Args:
+        value: Date string
+        
+    Returns:
+        Naive UTC datetime, or None if the value cannot be parsed
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    
+    parsed = None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    
+    return to_naive_utc(parsed)
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert a datetime to naive UTC, as stored by SQLite."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
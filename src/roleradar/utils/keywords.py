@@ -0,0 +1,96 @@
+"""Multi-keyword matching with an Aho-Corasick automaton."""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """
+    Find many keywords in a text in a single pass.
+    
+    Keywords are compiled once into an Aho-Corasick automaton, so matching
+    costs time proportional to the text length regardless of how many
+    keywords there are. Matching is case-insensitive and only counts whole
+    words or phrases (a keyword must not be glued to letters or digits);
+    runs of whitespace in keywords and text are treated as one space.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile keywords.
+        
+        Args:
+            keywords: Words or phrases to look for
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        
+        for keyword in keywords:
+            keyword = " ".join(keyword.lower().split())
+            if keyword:
+                self._add(keyword)
+        self._build_failure_links()
+    
+    def _add(self, keyword: str):
+        """Add one keyword to the trie."""
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+        if keyword not in self._output[node]:
+            self._output[node].append(keyword)
+    
+    def _build_failure_links(self):
+        """Link each node to its longest proper suffix that is also in the trie."""
+        pending = deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self._goto[node].items():
+                pending.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                if self._fail[child] == child:
+                    self._fail[child] = 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+    
+    def find(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Find all whole-word keyword occurrences.
+        
+        Args:
+            text: Text to search
+            
+        Returns:
+            (start offset, keyword) pairs in order of their end position;
+            offsets refer to the text with whitespace runs collapsed
+        """
+        text = " ".join((text or "").lower().split())
+        matches = []
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for keyword in self._output[node]:
+                start = end - len(keyword) + 1
+                if _is_boundary(text, start - 1) and _is_boundary(text, end + 1):
+                    matches.append((start, keyword))
+        return matches
+    
+    def find_unique(self, text: str) -> set:
+        """Get the distinct keywords that occur in a text."""
+        return {keyword for _, keyword in self.find(text)}
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Check that the character at ``index`` does not continue a word."""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
@@ -0,0 +1,176 @@
+"""Text preparation helpers for LLM prompts."""
+
+import re
+from typing import List, Set
+
+# Words, numbers and single punctuation marks, roughly how BPE tokenizers split text
+_PIECE_RE = re.compile(r"[^\W\d_]+|\d+|[^\w\s]")
+
+# Lines that are page chrome rather than content; only whole lines match, so
+# titles such as "Privacy Policy Counsel" or "Cookie Compliance Engineer" stay
+_BOILERPLATE_RE = re.compile(
+    r"^\W*("
+    r"accept (all )?cookies|(we|this (site|website)) uses? cookies\b.*|cookie (policy|settings|preferences)|"
+    r"privacy policy|terms of (use|service)|terms (and|&) conditions|.*\ball rights reserved|"
+    r"©.*|copyright (©\s*)?\d{4}\b.*|"
+    r"sign in|log ?in|sign up|register|subscribe|menu|home|search|share|print|"
+    r"back to top|skip to (main )?content|follow us( on .*)?|related (jobs|articles|posts)|"
+    r"read more|load more|show more|advertisement|sponsored|"
+    r"share (this|on) .*|subscribe to (our|the) newsletter"
+    r")\W*$",
+    re.IGNORECASE
+)
+# Separator between links of a navigation bar ("Home | Jobs | About | Contact")
+_NAV_SEPARATOR_RE = re.compile(r"\s[|»›>•·/]\s")
+# Navigation bars have at least this many links, each of a few words
+_NAV_MIN_LINKS = 4
+_NAV_MAX_LINK_WORDS = 2
+_MARKDOWN_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_URL_RE = re.compile(r"https?://\S+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_SENTENCE_KEY_RE = re.compile(r"[^a-z0-9]+")
+
+TRUNCATION_MARKER = " ..."
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens a text costs without a tokenizer.
+    
+    Counts words, numbers and punctuation marks, adding a token for every
+    further six letters of long words and three digits of long numbers,
+    which tracks the Llama tokenizer closely enough for budgeting.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        Estimated token count (at least 1)
+    """
+    tokens = 0
+    for piece in _PIECE_RE.findall(text or ""):
+        if piece[0].isdigit():
+            tokens += 1 + (len(piece) - 1) // 3
+        elif piece[0].isalpha():
+            tokens += 1 + (len(piece) - 1) // 6
+        else:
+            tokens += 1
+    return max(tokens, 1)
+
+
+def strip_boilerplate(text: str) -> str:
+    """
+    Remove navigation, cookie banners and other page chrome from extracted text.
+    
+    Drops lines that consist entirely of a boilerplate phrase and
+    navigation bars of short separator-joined links ("Home | Jobs | About
+    | Contact"), and unwraps Markdown links and bare URLs. The first line
+    is the page title and is always kept.
+    
+    Args:
+        text: Page text, one block per line, title first
+        
+    Returns:
+        Text with boilerplate lines removed
+    """
+    lines = []
+    for number, line in enumerate((text or "").splitlines()):
+        line = _URL_RE.sub("", _MARKDOWN_LINK_RE.sub(r"\1", line)).strip()
+        if not line:
+            continue
+        if number and (_BOILERPLATE_RE.match(line) or _is_navigation(line)):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _is_navigation(line: str) -> bool:
+    """Check whether a line is a bar of short links joined by separators."""
+    links = _NAV_SEPARATOR_RE.split(line)
+    return len(links) >= _NAV_MIN_LINKS and all(len(link.split()) <= _NAV_MAX_LINK_WORDS for link in links)
+
+
+def dedupe_sentences(sentences: List[str], seen: Set[str] = None) -> List[str]:
+    """
+    Drop sentences that repeat an earlier one (ignoring case and punctuation).
+    
+    Args:
+        sentences: Sentences in document order
+        seen: Keys of sentences already kept, shared across calls (updated in place)
+    """
+    seen = set() if seen is None else seen
+    unique = []
+    for sentence in sentences:
+        key = _SENTENCE_KEY_RE.sub(" ", sentence.lower()).strip()
+        if key and key in seen:
+            continue
+        seen.add(key)
+        unique.append(sentence)
+    return unique
+
+
+def truncate_to_tokens(lines: List[List[str]], max_tokens: int) -> str:
+    """
+    Join lines of sentences up to an estimated token budget.
+    
+    Whole sentences are kept while they fit; a first sentence that is
+    longer than the budget is cut at a word boundary. Sentences of a line
+    are joined with spaces and lines with newlines.
+    
+    Args:
+        lines: Sentences of each line, in document order
+        max_tokens: Estimated token budget (0 or less means no limit)
+        
+    Returns:
+        Joined text, ending in a truncation marker if anything was cut
+    """
+    kept = []
+    used = 0
+    for sentences in lines:
+        kept_line = []
+        kept.append(kept_line)
+        for sentence in sentences:
+            tokens = estimate_tokens(sentence)
+            if max_tokens > 0 and used + tokens > max_tokens:
+                if used == 0:
+                    words = []
+                    for word in sentence.split():
+                        used += estimate_tokens(word)
+                        if used > max_tokens:
+                            break
+                        words.append(word)
+                    kept_line.append(" ".join(words))
+                return _join_lines(kept) + TRUNCATION_MARKER
+            kept_line.append(sentence)
+            used += tokens
+    return _join_lines(kept)
+
+
+def _join_lines(lines: List[List[str]]) -> str:
+    """Join sentences with spaces and non-empty lines with newlines."""
+    return "\n".join(" ".join(sentences) for sentences in lines if sentences)
+
+
+def prepare_text(text: str, max_tokens: int = 0) -> str:
+    """
+    Compact page text before it is sent to an LLM.
+    
+    Strips boilerplate, collapses whitespace within lines, drops repeated
+    sentences and truncates to ``max_tokens`` estimated tokens. Line
+    breaks are kept, so the title stays on a line of its own.
+    
+    Args:
+        text: Raw text, title first
+        max_tokens: Estimated token budget (0 or less means no limit)
+        
+    Returns:
+        Prepared text
+    """
+    seen = set()
+    lines = []
+    for line in strip_boilerplate(text).splitlines():
+        sentences = [sentence for sentence in _SENTENCE_SPLIT_RE.split(" ".join(line.split())) if sentence]
+        sentences = dedupe_sentences(sentences, seen)
+        if sentences:
+            lines.append(sentences)
+    return truncate_to_tokens(lines, max_tokens)
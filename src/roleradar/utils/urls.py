@@ -0,0 +1,61 @@
+"""URL normalization helpers."""
+
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "referrer", "source", "src", "trk", "trkid",
+    "tracking", "campaign", "cmp", "_hsenc", "_hsmi", "sc_cid", "gh_src",
+}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share one key.
+    
+    Lowercases the scheme and host, strips a leading ``www.``, drops
+    default ports, fragments, trailing slashes and tracking parameters
+    (``utm_*``, ``gclid``, ``ref`` ...), and sorts the remaining query
+    parameters.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Normalized URL, or an empty string if the URL is blank
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url[:512]
+    
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    
+    path = parts.path.rstrip("/")
+    params = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ]
+    query = urlencode(sorted(params))
+    
+    return urlunsplit((scheme, host, path, query, ""))[:512]
+
+
+def _is_tracking_param(name: str) -> bool:
+    """Check whether a query parameter only carries click tracking."""
+    name = name.lower()
+    return name.startswith("utm_") or name in _TRACKING_PARAMS
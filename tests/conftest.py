@@ -0,0 +1,31 @@
+"""Shared test setup: an isolated database and cache for the whole session."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Configuration and the database service are created at import time, so
+# point them at a scratch directory before anything imports them
+_SCRATCH = tempfile.mkdtemp(prefix="roleradar-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_SCRATCH, 'roleradar.db')}"
+os.environ["CACHE_PATH"] = os.path.join(_SCRATCH, "cache.db")
+os.environ["GROQ_API_KEY"] = ""
+os.environ["TAVILY_API_KEY"] = ""
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """Empty tables in the scratch database (run from the scratch directory)."""
+    from src.roleradar.database import db_service
+    
+    # The relationship graph is pickled to the working directory
+    monkeypatch.chdir(_SCRATCH)
+    
+    db_service.drop_tables()
+    db_service.create_tables()
+    return db_service
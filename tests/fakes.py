@@ -0,0 +1,50 @@
+"""Stand-ins for the Groq client used by the tests."""
+
+import json
+import re
+from types import SimpleNamespace
+
+from src.roleradar.services.cache import DiskCache
+from src.roleradar.services.groq_service import GroqAnalysisService
+from src.roleradar.services.rate_limiter import DualTokenBucket
+
+
+class FakeAPIError(Exception):
+    """Error shaped like the Groq SDK's status errors."""
+    
+    def __init__(self, status_code):
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+
+
+class FakeClient:
+    """Chat client answering every document, except those it is told to fail."""
+    
+    def __init__(self, fail=lambda prompt: None):
+        self.fail = fail
+        self.prompts = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+    
+    def create(self, messages, **kwargs):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        status = self.fail(prompt)
+        if status:
+            raise FakeAPIError(status)
+        
+        ids = re.findall(r"\[id=(\w+)\]", prompt)
+        analysis = {
+            "entities": {"company_name": "Hooli", "job_title": "Security Engineer"},
+            "signals": {"has_signal": False, "signal_type": "none", "confidence": 0.0},
+        }
+        answer = [dict(analysis, id=item_id) for item_id in ids] if ids else analysis
+        message = SimpleNamespace(content=json.dumps(answer))
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def fake_groq(client):
+    """Groq service using ``client``, without caching or admission limits."""
+    groq = GroqAnalysisService(client=client)
+    groq.cache = DiskCache(":memory:", namespace="llm", ttl_seconds=0, max_entries=0)
+    groq.limiter = DualTokenBucket(0, 0)
+    return groq
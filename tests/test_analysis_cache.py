@@ -0,0 +1,49 @@
+"""Tests for caching Groq analyses by model, prompt version and text."""
+
+import pytest
+
+from src.roleradar.services import groq_service
+from src.roleradar.services.cache import DiskCache
+from .fakes import FakeClient, fake_groq
+
+DOCUMENTS = [(1, "Security Engineer at Hooli"), (2, "CISO at Umbrella")]
+
+
+@pytest.fixture
+def groq(tmp_path):
+    groq = fake_groq(FakeClient())
+    groq.cache = DiskCache(str(tmp_path / "cache.db"), "llm", ttl_seconds=3600, max_entries=100)
+    return groq
+
+
+def test_repeated_documents_are_served_from_the_cache(groq):
+    first = groq.analyze_batch(DOCUMENTS)
+    calls = len(groq.client.prompts)
+    
+    assert groq.analyze_batch(DOCUMENTS) == first
+    assert groq.analyze_result("Security Engineer at Hooli") == first[1]
+    assert len(groq.client.prompts) == calls
+    assert groq.cache.stats()["run"]["hits"] == 3
+
+
+def test_changed_text_misses_the_cache(groq):
+    groq.analyze_batch(DOCUMENTS)
+    calls = len(groq.client.prompts)
+    
+    groq.analyze_batch([(1, "Security Engineer at Hooli (remote)")])
+    
+    assert len(groq.client.prompts) == calls + 1
+
+
+def test_new_prompt_version_or_model_invalidates_the_cache(groq, monkeypatch):
+    groq.analyze_batch(DOCUMENTS)
+    calls = len(groq.client.prompts)
+    
+    monkeypatch.setattr(groq_service, "ANALYSIS_PROMPT_VERSION", "analysis-test")
+    groq.analyze_batch(DOCUMENTS)
+    assert len(groq.client.prompts) > calls
+    
+    calls = len(groq.client.prompts)
+    groq.model = "another-model"
+    groq.analyze_batch(DOCUMENTS)
+    assert len(groq.client.prompts) > calls
@@ -0,0 +1,101 @@
+"""Tests for the on-disk TTL response cache."""
+
+import pytest
+
+from src.roleradar.services import cache as cache_module
+from src.roleradar.services.cache import DiskCache, make_cache_key
+
+
+class Clock:
+    """Wall clock the tests advance by hand."""
+    
+    def __init__(self):
+        self.now = 1_700_000_000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "time", clock)
+    return clock
+
+
+def _cache(tmp_path, namespace="tavily", ttl_seconds=60, max_entries=3):
+    return DiskCache(str(tmp_path / "cache.db"), namespace, ttl_seconds, max_entries)
+
+
+def test_entries_expire_after_their_ttl(tmp_path, clock):
+    cache = _cache(tmp_path)
+    cache.set("query", {"results": [1, 2]}, cost=1.5)
+    
+    clock.now += 59
+    assert cache.get("query") == {"results": [1, 2]}
+    clock.now += 2
+    assert cache.get("query") is None
+    
+    stats = cache.stats()
+    assert stats["entries"] == 0
+    assert (stats["run"]["hits"], stats["run"]["misses"], stats["run"]["saved_seconds"]) == (1, 1, 1.5)
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = _cache(tmp_path, max_entries=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+        clock.now += 1
+    
+    assert cache.get("a") == "a"  # a is now the most recently used
+    clock.now += 1
+    cache.set("d", "d")
+    
+    assert [cache.get(key) for key in ("a", "b", "c", "d")] == ["a", None, "c", "d"]
+
+
+def test_namespaces_share_a_file_without_mixing(tmp_path, clock):
+    search, llm = _cache(tmp_path, "tavily"), _cache(tmp_path, "llm")
+    search.set("key", "search result")
+    
+    assert llm.get("key") is None
+    assert search.get("key") == "search result"
+    assert _cache(tmp_path, "tavily").stats()["total"]["hits"] == 1
+
+
+def test_zero_ttl_disables_the_cache(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_seconds=0)
+    cache.set("key", "value")
+    
+    assert not cache.enabled
+    assert cache.get("key") is None
+
+
+def test_cache_keys_depend_on_every_part():
+    assert make_cache_key("q", {"depth": "advanced", "max": 10}) == make_cache_key("q", {"max": 10, "depth": "advanced"})
+    assert make_cache_key("q", 10) != make_cache_key("q", 11)
+
+
+class CountingSearchClient:
+    """Tavily stand-in counting the searches that reach it."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def search(self, query, **kwargs):
+        self.calls += 1
+        return {"results": [{"url": f"https://example.com/{self.calls}", "title": query}]}
+
+
+def test_repeated_searches_are_served_from_the_cache(tmp_path, clock):
+    from src.roleradar.services.tavily_service import TavilySearchService
+    
+    client = CountingSearchClient()
+    tavily = TavilySearchService(client=client)
+    tavily.cache = _cache(tmp_path)
+    
+    first = tavily.search("grc analyst")
+    assert tavily.search("grc analyst") == first
+    assert tavily.search("grc analyst", use_cache=False) != first
+    assert tavily.search("grc analyst", max_results=5) != first
+    assert client.calls == 3
@@ -0,0 +1,97 @@
+"""Tests for processors sharing the backlog through claims with a lease."""
+
+import pytest
+
+from src.roleradar.config import config
+from src.roleradar.models import Company, SearchResult
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.tavily_service import TavilySearchService
+from .fakes import FakeClient, fake_groq
+
+
+@pytest.fixture
+def workers(database):
+    """Two processors over three unprocessed search results."""
+    first, second = TavilySearchService(), TavilySearchService()
+    first._store_search_results("grc analyst hiring", [
+        {"url": f"https://example.com/jobs/{name}", "title": f"GRC Analyst at {name}",
+         "content": f"{name} is hiring a GRC analyst to run its SOC 2 program."}
+        for name in ("Hooli", "Initech", "Umbrella")
+    ])
+    return first, second
+
+
+def _ids(results):
+    return [result.id for result in results]
+
+
+def test_claimed_results_are_not_handed_to_another_worker(workers):
+    first, second = workers
+    
+    claimed = _ids(first.get_unprocessed_results(limit=2))
+    
+    assert len(claimed) == 2
+    assert second.claim_results(claimed) == []
+    assert _ids(second.get_unprocessed_results(limit=10)) == [max(claimed) + 1]
+
+
+def test_released_results_can_be_claimed_at_once(workers):
+    first, second = workers
+    claimed = _ids(first.get_unprocessed_results(limit=10))
+    
+    first.release_claims(claimed)
+    
+    assert _ids(second.get_unprocessed_results(limit=10)) == claimed
+
+
+def test_renewal_only_keeps_results_still_held(workers, monkeypatch):
+    first, second = workers
+    claimed = _ids(first.get_unprocessed_results(limit=10))
+    assert first.renew_claims(claimed) == claimed
+    
+    monkeypatch.setattr(config, "PROCESS_LEASE_SECONDS", 0)
+    taken = _ids(second.claim_results(claimed[:1]))
+    
+    assert taken == claimed[:1]
+    assert first.renew_claims(claimed) == claimed[1:]
+    assert second.renew_claims(claimed) == taken
+
+
+def test_expired_claim_cannot_mark_results_processed(workers, monkeypatch):
+    first, second = workers
+    claimed = _ids(first.get_unprocessed_results(limit=10))
+    monkeypatch.setattr(config, "PROCESS_LEASE_SECONDS", 0)
+    second.claim_results(claimed)
+    
+    assert first.mark_many_as_processed(claimed) == 0
+    assert second.mark_many_as_processed(claimed) == len(claimed)
+
+
+def test_processor_skips_results_it_no_longer_holds(database, workers, monkeypatch):
+    first, second = workers
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    client = FakeClient()
+    processor = ProcessingService(tavily=first, groq=fake_groq(client))
+    chunk = first.get_unprocessed_results(limit=10)
+    monkeypatch.setattr(config, "PROCESS_LEASE_SECONDS", 0)
+    second.claim_results(_ids(chunk))
+    
+    assert processor._process_chunk(chunk, batch_size=3) == (0, 0)
+    assert client.prompts == []
+    with database.get_session() as session:
+        assert all(row.claimed_by == second.worker_id and not row.processed
+                   for row in session.query(SearchResult))
+
+
+def test_analyses_are_not_written_after_losing_the_claim(database, workers, monkeypatch):
+    first, second = workers
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    processor = ProcessingService(tavily=first, groq=fake_groq(FakeClient()))
+    ready, _ = processor.analyze_chunk(first.get_unprocessed_results(limit=10), batch_size=3)
+    monkeypatch.setattr(config, "PROCESS_LEASE_SECONDS", 0)
+    second.claim_results([result.id for result, _ in ready])
+    
+    assert processor._persist_batch(ready) == 0
+    with database.get_session() as session:
+        assert session.query(Company).count() == 0
+        assert session.query(SearchResult).filter_by(processed=True).count() == 0
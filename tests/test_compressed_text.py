@@ -0,0 +1,67 @@
+"""Tests for compressed, deferred text columns."""
+
+import pytest
+from sqlalchemy import text
+
+from src.roleradar.models import SearchResult
+from src.roleradar.models.types import COMPRESSED_PREFIX, compress_text, decompress_text, is_compressed
+
+PAGE = "Hooli is hiring a security engineer to run SOC 2 and ISO 27001 programs. " * 40
+
+
+@pytest.mark.parametrize("value", [None, "", "short text", PAGE, COMPRESSED_PREFIX + "legacy page text"])
+def test_values_round_trip(value):
+    assert decompress_text(compress_text(value)) == value
+
+
+def test_only_long_values_are_compressed():
+    assert compress_text("short text") == "short text"
+    assert is_compressed(compress_text(PAGE))
+    assert len(compress_text(PAGE)) < len(PAGE)
+
+
+def test_legacy_text_starting_with_the_prefix_reads_back_unchanged():
+    legacy = COMPRESSED_PREFIX + " notes copied from a compression library README"
+    
+    assert not is_compressed(legacy)
+    assert decompress_text(legacy) == legacy
+
+
+def _insert_raw(session, url, content):
+    session.execute(text(
+        "INSERT INTO search_results (query, title, url, url_key, content, processed)"
+        " VALUES ('q', 't', :url, :url, :content, 0)"
+    ), {"url": url, "content": content})
+
+
+def _raw_contents(session):
+    return [value for (value,) in session.execute(text("SELECT content FROM search_results ORDER BY id"))]
+
+
+def test_column_compresses_on_write_and_defers_loading(database):
+    with database.get_session() as session:
+        session.add(SearchResult(query="q", title="t", url="https://example.com/a",
+                                 url_key="https://example.com/a", content=PAGE))
+    
+    with database.get_session() as session:
+        assert is_compressed(_raw_contents(session)[0])
+        result = session.query(SearchResult).one()
+        assert "content" not in result.__dict__
+        assert result.content == PAGE
+
+
+def test_compaction_compresses_legacy_rows(database):
+    legacy = COMPRESSED_PREFIX + " pasted from a config file"
+    originals = [PAGE, legacy, "short text", compress_text(PAGE + "!")]
+    with database.get_session() as session:
+        for index, content in enumerate(originals):
+            _insert_raw(session, f"https://example.com/{index}", content)
+    
+    report = database.compact_text_columns()
+    
+    assert report["rewritten"]["search_results.content"] == 2
+    with database.get_session() as session:
+        stored = _raw_contents(session)
+        assert [is_compressed(value) for value in stored] == [True, True, False, True]
+        contents = [result.content for result in session.query(SearchResult).order_by(SearchResult.id)]
+    assert contents == [PAGE, legacy, "short text", PAGE + "!"]
@@ -0,0 +1,69 @@
+"""Tests for typed configuration loading."""
+
+from src.roleradar.config import Config
+
+
+class FakeStore:
+    """Secure store stand-in holding raw values as saved."""
+    
+    def __init__(self, values):
+        self.values = values
+    
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+
+def _load_from_store(values):
+    config = Config.__new__(Config)
+    config._secure_store = FakeStore(values)
+    config._load_tuning(config._get_store_value)
+    return config
+
+
+def test_store_booleans_can_be_turned_off():
+    config = _load_from_store({
+        "INCREMENTAL_SEARCH": "false",
+        "QUERY_PLANNER": "0",
+        "PIPELINE_MODE": "no",
+        "RELEVANCE_FILTER": False,
+        "MODEL_CASCADE": "off",
+    })
+    
+    assert config.INCREMENTAL_SEARCH is False
+    assert config.QUERY_PLANNER is False
+    assert config.PIPELINE_MODE is False
+    assert config.RELEVANCE_FILTER is False
+    assert config.MODEL_CASCADE is False
+
+
+def test_store_booleans_can_be_turned_on():
+    config = _load_from_store({"PIPELINE_MODE": "true", "MODEL_CASCADE": True})
+    
+    assert config.PIPELINE_MODE is True
+    assert config.MODEL_CASCADE is True
+
+
+def test_store_numbers_are_converted():
+    config = _load_from_store({"GROQ_RPM": "60", "SEARCH_RATE_LIMIT": "0.5", "PROCESS_WORKERS": 3})
+    
+    assert config.GROQ_RPM == 60
+    assert config.SEARCH_RATE_LIMIT == 0.5
+    assert config.PROCESS_WORKERS == 3
+
+
+def test_invalid_and_missing_values_fall_back_to_defaults():
+    config = _load_from_store({"GROQ_RPM": "fast", "QUERY_BUDGET": ""})
+    
+    assert config.GROQ_RPM == 30
+    assert config.QUERY_BUDGET == 0
+    assert config.QUERY_PLANNER is True
+
+
+def test_environment_values_use_the_same_conversion(monkeypatch):
+    monkeypatch.setenv("QUERY_PLANNER", "False")
+    monkeypatch.setenv("LLM_BATCH_SIZE", "4")
+    config = Config.__new__(Config)
+    config._load_tuning(config._get_env_value)
+    
+    assert config.QUERY_PLANNER is False
+    assert config.LLM_BATCH_SIZE == 4
@@ -0,0 +1,34 @@
+"""Tests for dashboard API input validation."""
+
+import pytest
+
+from src.roleradar.dashboard.app import create_app
+
+
+@pytest.fixture
+def client(database):
+    return create_app().test_client()
+
+
+@pytest.mark.parametrize("url", [
+    "/api/llm-usage?days=abc",
+    "/api/llm-usage?days=-1",
+    "/api/companies?limit=ten",
+    "/api/opportunities?limit=1.5",
+    "/api/what-if?limit=x",
+    "/api/what-if?unknown_weight=1",
+    "/api/what-if?hiring_signals=abc",
+    "/api/what-if?hiring_signals=nan",
+    "/api/what-if?recent_activity=inf",
+    "/api/what-if?company_growth=-Infinity",
+])
+def test_bad_query_parameters_are_rejected(client, url):
+    response = client.get(url)
+    
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+@pytest.mark.parametrize("url", ["/api/llm-usage", "/api/llm-usage?days=7", "/api/llm-usage?days=all"])
+def test_llm_usage_accepts_days(client, url):
+    assert client.get(url).status_code == 200
@@ -0,0 +1,51 @@
+"""Tests for SimHash near-duplicate detection of search results."""
+
+from src.roleradar.models import SearchResult
+from src.roleradar.services.dedup import fingerprint_bands, hamming_distance, simhash
+from src.roleradar.services.tavily_service import TavilySearchService
+
+POSTING = ("Hooli is hiring a senior security engineer to own cloud security, incident "
+           "response and SOC 2 compliance for its payments platform in Austin, Texas.")
+
+
+def _result(url, content):
+    return {"url": url, "title": "Senior Security Engineer at Hooli", "content": content}
+
+
+def test_simhash_is_stable_and_skips_short_texts():
+    assert simhash(POSTING) == simhash(POSTING.upper())
+    assert simhash("Security engineer wanted") is None
+
+
+def test_similar_texts_are_closer_than_unrelated_ones():
+    edited = POSTING.replace("Austin, Texas", "Austin, TX")
+    unrelated = ("Initech announced a new data protection officer role after closing its "
+                 "Series B round to expand privacy operations across Europe next year.")
+    
+    assert hamming_distance(simhash(POSTING), simhash(edited)) < hamming_distance(simhash(POSTING), simhash(unrelated))
+    assert hamming_distance(simhash(POSTING), simhash(POSTING)) == 0
+
+
+def test_fingerprint_bands_rebuild_the_fingerprint():
+    fingerprint = simhash(POSTING)
+    bands = fingerprint_bands(fingerprint)
+    
+    assert len(bands) == 4
+    assert sum(value << (16 * band) for band, value in enumerate(bands)) == fingerprint
+
+
+def test_near_duplicates_are_stored_processed_and_linked(database):
+    tavily = TavilySearchService()
+    
+    first = tavily._store_search_results("q", [
+        _result("https://example.com/jobs/1", POSTING),
+        _result("https://mirror.example.org/hooli-security-engineer", POSTING),
+    ])
+    second = tavily._store_search_results("q", [_result("https://jobs.example.net/hooli/42", POSTING)])
+    
+    assert (first["inserted"], first["near_duplicates"], len(first["pending_ids"])) == (2, 1, 1)
+    assert (second["inserted"], second["near_duplicates"], second["pending_ids"]) == (1, 1, [])
+    with database.get_session() as session:
+        original, *copies = session.query(SearchResult).order_by(SearchResult.id).all()
+        assert original.duplicate_of_id is None and not original.processed
+        assert all(copy.duplicate_of_id == original.id and copy.processed for copy in copies)
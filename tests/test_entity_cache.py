@@ -0,0 +1,78 @@
+"""Tests for the run-scoped entity cache used by processing."""
+
+import pytest
+
+from src.roleradar.config import config
+from src.roleradar.models import Company, HiringSignal, Opportunity
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.entity_cache import EntityCache
+from src.roleradar.services.tavily_service import TavilySearchService
+from .fakes import FakeClient, fake_groq
+
+
+@pytest.fixture
+def hooli(database):
+    """Id of a stored company with one opportunity and one signal."""
+    with database.get_session() as session:
+        company = Company(name="Hooli")
+        session.add(company)
+        session.flush()
+        session.add(Opportunity(company_id=company.id, title="Security Engineer", is_active=True))
+        session.add(HiringSignal(company_id=company.id, signal_type="funding", source_url="https://example.com/a"))
+        return company.id
+
+
+def test_loaded_entities_hit_and_unknown_ones_miss(hooli):
+    cache = EntityCache()
+    cache.load()
+    
+    with cache.transaction() as known:
+        assert known.company_id("  HOOLI ") == hooli
+        assert known.company_id("Initech") is None
+        assert known.has_opportunity(hooli, "Security Engineer")
+        assert not known.has_opportunity(hooli, "CISO")
+        assert known.has_signal(hooli, "funding", "https://example.com/a")
+        assert not known.has_signal(hooli, "funding", "https://example.com/b")
+
+
+def test_staged_entries_are_kept_on_commit_and_dropped_on_error(hooli):
+    cache = EntityCache()
+    
+    with cache.transaction() as known:
+        known.add_company("Initech", 99)
+        assert known.company_id("initech") == 99
+    with pytest.raises(RuntimeError):
+        with cache.transaction() as known:
+            known.add_company("Umbrella", 100)
+            known.add_opportunity(hooli, "CISO")
+            raise RuntimeError("rolled back")
+    
+    with cache.transaction() as known:
+        assert known.company_id("Initech") == 99
+        assert known.company_id("Umbrella") is None
+        assert not known.has_opportunity(hooli, "CISO")
+
+
+def test_company_inserted_by_another_process_is_reused(database, monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    tavily = TavilySearchService()
+    tavily._store_search_results("q", [
+        {"url": "https://example.com/jobs/hooli", "title": "Security Engineer at Hooli",
+         "content": "Hooli is hiring a security engineer to lead SOC 2 compliance work in Austin."}
+    ])
+    processor = ProcessingService(tavily=tavily, groq=fake_groq(FakeClient()))
+    chunk = tavily.get_unprocessed_results(limit=10)
+    processor.entities.load()
+    
+    # Another process creates the company after this run loaded its cache
+    with database.get_session() as session:
+        session.add(Company(name="Hooli"))
+    
+    assert processor._process_chunk(chunk, batch_size=5) == (1, 0)
+    
+    with database.get_session() as session:
+        company_id, = session.query(Company.id).filter_by(name="Hooli").one()
+        assert session.query(Company).count() == 1
+        assert session.query(Opportunity).filter_by(company_id=company_id).count() == 1
+    with processor.entities.transaction() as known:
+        assert known.company_id("Hooli") == company_id
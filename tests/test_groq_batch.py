@@ -0,0 +1,52 @@
+"""Tests for batched Groq analysis."""
+
+import warnings
+
+from src.roleradar.services.groq_service import GroqAnalysisService, empty_entities
+from .fakes import FakeClient, fake_groq
+
+
+def test_analyze_batch_without_client_returns_empty_analyses():
+    groq = GroqAnalysisService()
+    assert groq.client is None
+    
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        analyses = groq.analyze_batch([(1, "Security Engineer at Hooli"), (2, "CISO at Umbrella")])
+    
+    assert set(analyses) == {1, 2}
+    assert analyses[1]["entities"] == empty_entities()
+
+
+def test_rejected_batch_falls_back_to_single_calls():
+    def fail(prompt):
+        # Packed prompts and the poisoned document are rejected
+        if "[id=" in prompt or "poison" in prompt:
+            return 400
+    groq = fake_groq(FakeClient(fail))
+    rejected = {}
+    
+    analyses = groq.analyze_batch(
+        [(1, "Security Engineer at Hooli"), (2, "poison"), (3, "CISO at Umbrella")],
+        batch_size=3,
+        rejected=rejected
+    )
+    
+    assert set(analyses) == {1, 3}
+    assert set(rejected) == {2}
+    assert groq.call_stats["fallbacks"] == 3
+
+
+def test_failing_batch_keeps_other_batches_answers():
+    groq = fake_groq(FakeClient(lambda prompt: 401 if "Umbrella" in prompt else None))
+    rejected = {}
+    
+    analyses = groq.analyze_batch(
+        [(1, "Security Engineer at Hooli"), (2, "GRC Analyst at Initech"),
+         (3, "CISO at Umbrella"), (4, "DPO at Umbrella")],
+        batch_size=2,
+        rejected=rejected
+    )
+    
+    assert set(analyses) == {1, 2}
+    assert rejected == {}
@@ -0,0 +1,65 @@
+"""Tests for storing search results: URL dedup and concurrent inserts."""
+
+from sqlalchemy import text
+
+from src.roleradar.database.migrations import migrate_search_result_url_key
+from src.roleradar.models import SearchResult
+from src.roleradar.services.dedup import NearDuplicateIndex
+from src.roleradar.services.tavily_service import TavilySearchService
+
+
+def _result(url, title):
+    return {
+        "url": url,
+        "title": title,
+        "content": f"{title} is hiring across security, compliance and governance teams this quarter.",
+    }
+
+
+def test_store_skips_known_and_repeated_urls(database):
+    tavily = TavilySearchService()
+    
+    first = tavily._store_search_results("q", [
+        _result("https://example.com/jobs/1", "Security Engineer at Hooli"),
+        _result("https://example.com/jobs/1?utm_source=feed", "Security Engineer at Hooli"),
+    ])
+    second = tavily._store_search_results("q", [_result("https://example.com/jobs/1", "Security Engineer at Hooli")])
+    
+    assert first["inserted"] == 1 and first["skipped"] == 1
+    assert second["inserted"] == 0 and second["skipped"] == 1
+
+
+def test_insert_skips_urls_stored_by_a_concurrent_ingest(database):
+    tavily = TavilySearchService()
+    tavily._store_search_results("q", [_result("https://example.com/a", "GRC Analyst at Initech")])
+    
+    # Rows that passed the IN lookup before the other ingest committed
+    rows = [
+        {"query": "q", "title": "GRC Analyst at Initech", "content": "", "url": "https://example.com/a",
+         "url_key": "https://example.com/a", "processed": False},
+        {"query": "q", "title": "CISO at Umbrella", "content": "", "url": "https://example.com/b",
+         "url_key": "https://example.com/b", "processed": False},
+    ]
+    with database.get_session() as session:
+        pending_ids, near_duplicates, conflicts = NearDuplicateIndex().insert_rows(session, rows)
+    
+    assert conflicts == 1
+    assert len(pending_ids) == 1
+    with database.get_session() as session:
+        assert session.query(SearchResult).count() == 2
+
+
+def test_url_key_migration_backfills_only_missing_keys(database):
+    with database.engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO search_results (query, url, processed) VALUES "
+            "('q', 'https://example.com/x?utm_medium=a', 0), ('q', 'https://example.com/x', 0)"
+        ))
+        conn.execute(text("UPDATE search_results SET url_key = NULL"))
+    
+    migrate_search_result_url_key(database.engine)
+    migrate_search_result_url_key(database.engine)
+    
+    with database.engine.connect() as conn:
+        keys = [row[0] for row in conn.execute(text("SELECT url_key FROM search_results ORDER BY id"))]
+    assert keys == ["https://example.com/x", None]
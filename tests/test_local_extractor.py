@@ -0,0 +1,19 @@
+"""Tests for the rule-based analysis backend."""
+
+from src.roleradar.services.groq_service import GroqAnalysisService
+from src.roleradar.services.local_extractor import LocalAnalysisService
+from src.roleradar.utils import prepare_text
+
+
+def test_local_service_has_every_groq_service_attribute(database):
+    local = LocalAnalysisService()
+    
+    assert set(vars(GroqAnalysisService())) <= set(vars(local))
+    assert local.client is None
+
+
+def test_company_is_not_doubled_by_the_title_line(database):
+    local = LocalAnalysisService()
+    text = prepare_text("Security Engineer at Hooli\nHooli is hiring a security engineer in Austin, TX.")
+    
+    assert local.analyze_result(text)["entities"]["company_name"] == "Hooli"
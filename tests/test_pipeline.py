@@ -0,0 +1,88 @@
+"""Tests for the streaming search -> analysis -> storage pipeline."""
+
+import re
+import threading
+
+from src.roleradar.config import config
+from src.roleradar.models import SearchResult
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.pipeline import SearchProcessPipeline
+from src.roleradar.services.tavily_service import TavilySearchService
+from .fakes import FakeClient, fake_groq
+
+
+class StubSearch(TavilySearchService):
+    """Search service that stores fixed results instead of calling Tavily."""
+    
+    names = ("Hooli", "Initech", "Umbrella", "Poison")
+    one_by_one = False
+    
+    def daily_search(self, queries=None, concurrency=None, on_stored=None):
+        results = [
+            {"url": f"https://example.com/jobs/{name}", "title": f"Security Engineer at {name}",
+             "content": f"{name} is hiring a security engineer to lead compliance work in Austin."}
+            for name in self.names
+        ]
+        stored = dict.fromkeys(("inserted", "skipped", "near_duplicates", "below_watermark"), 0)
+        for batch in ([[result] for result in results] if self.one_by_one else [results]):
+            self._ingest("security engineer hiring", batch, stored, on_stored, {})
+        return {"security engineer hiring": results}
+
+
+class FlakyProcessor(ProcessingService):
+    """Processor whose first analysis and first write raise."""
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failures = {"analyze": 1, "persist": 1}
+    
+    def _fail_once(self, stage):
+        if self.failures[stage]:
+            self.failures[stage] -= 1
+            raise RuntimeError(f"{stage} failed")
+    
+    def analyze_chunk(self, chunk, batch_size=None, max_in_flight=None):
+        self._fail_once("analyze")
+        return super().analyze_chunk(chunk, batch_size, max_in_flight)
+    
+    def _persist_batch(self, items):
+        self._fail_once("persist")
+        return super()._persist_batch(items)
+
+
+def test_pipeline_analyzes_micro_batches_through_packed_calls(database, monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    client = FakeClient(lambda prompt: 400 if "Poison" in prompt else None)
+    tavily = StubSearch()
+    processor = ProcessingService(tavily=tavily, groq=fake_groq(client))
+    
+    report = SearchProcessPipeline(processor=processor, workers=1, batch_size=4).run(backlog_limit=0)
+    
+    assert report["processed"] == 3
+    assert report["errors"] == 1
+    assert any(len(re.findall(r"\[id=\d+\]", prompt)) == 4 for prompt in client.prompts)
+    with database.get_session() as session:
+        rows = {row.title: row for row in session.query(SearchResult)}
+        assert all(row.processed and row.claimed_by is None for row in rows.values())
+        assert rows["Security Engineer at Poison"].skip_reason == "analysis_rejected"
+
+
+def test_pipeline_keeps_draining_after_a_stage_raises(database, monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    tavily = StubSearch()
+    tavily.names = tuple(f"Company{index}" for index in range(12))
+    tavily.one_by_one = True
+    processor = FlakyProcessor(tavily=tavily, groq=fake_groq(FakeClient()))
+    pipeline = SearchProcessPipeline(processor=processor, workers=1, queue_size=1, batch_size=1)
+    
+    outcome = {}
+    runner = threading.Thread(target=lambda: outcome.update(pipeline.run(backlog_limit=0)), daemon=True)
+    runner.start()
+    runner.join(timeout=30)
+    
+    assert not runner.is_alive(), "pipeline hung after a failing batch"
+    assert processor.failures == {"analyze": 0, "persist": 0}
+    assert outcome["processed"] + outcome["errors"] == 12
+    assert outcome["errors"] >= 2
+    with database.get_session() as session:
+        assert session.query(SearchResult).filter_by(processed=False, claimed_by=None).count() == outcome["errors"]
@@ -0,0 +1,83 @@
+"""Tests for processing stored search results."""
+
+import pytest
+
+from src.roleradar.config import config
+from src.roleradar.models import SearchResult
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.tavily_service import TavilySearchService
+from .fakes import FakeClient, fake_groq
+
+
+@pytest.fixture
+def stored_results(database):
+    """Three unprocessed search results."""
+    tavily = TavilySearchService()
+    tavily._store_search_results("security engineer hiring", [
+        {"url": f"https://example.com/jobs/{name}", "title": f"Security Engineer at {name}",
+         "content": f"{name} is hiring a security engineer to lead {name} compliance work in Austin."}
+        for name in ("Hooli", "Initech", "Poison")
+    ])
+    return tavily
+
+
+def test_rejected_results_are_marked_failed_not_retried(database, stored_results, monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    groq = fake_groq(FakeClient(lambda prompt: 400 if "Poison" in prompt else None))
+    processor = ProcessingService(tavily=stored_results, groq=groq)
+    
+    processor.process_unprocessed_results(limit=10, batch_size=3)
+    
+    with database.get_session() as session:
+        rows = {row.title: row for row in session.query(SearchResult)}
+        assert all(row.processed for row in rows.values())
+        assert rows["Security Engineer at Poison"].skip_reason == "analysis_rejected"
+        assert rows["Security Engineer at Hooli"].skip_reason is None
+    assert stored_results.get_unprocessed_results(limit=10) == []
+
+
+
+def _store(tavily, names):
+    tavily._store_search_results("grc analyst hiring", [
+        {"url": f"https://example.com/grc/{name}", "title": f"GRC Analyst at {name}",
+         "content": f"{name} is hiring a GRC analyst to run its SOC 2 and ISO 27001 programs."}
+        for name in names
+    ])
+
+
+def test_results_are_committed_in_groups_with_bulk_flags(database, monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    monkeypatch.setattr(config, "PROCESS_COMMIT_SIZE", 2)
+    tavily = TavilySearchService()
+    _store(tavily, ["Hooli", "Initech", "Umbrella", "Globex", "Stark"])
+    flagged = []
+    mark = tavily.mark_many_as_processed
+    monkeypatch.setattr(tavily, "mark_many_as_processed",
+                        lambda ids, session=None: flagged.append(len(ids)) or mark(ids, session=session))
+    
+    ProcessingService(tavily=tavily, groq=fake_groq(FakeClient())).process_unprocessed_results(limit=10)
+    
+    assert flagged == [2, 2, 1]
+    with database.get_session() as session:
+        assert session.query(SearchResult).filter_by(processed=True).count() == 5
+
+
+def test_a_failing_result_does_not_hold_back_its_group(database, monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    monkeypatch.setattr(config, "PROCESS_COMMIT_SIZE", 10)
+    tavily = TavilySearchService()
+    _store(tavily, ["Hooli", "Poison", "Umbrella"])
+    processor = ProcessingService(tavily=tavily, groq=fake_groq(FakeClient()))
+    write = processor._write_analysis
+    
+    def write_analysis(session, known, result, analysis):
+        if "Poison" in result.title:
+            raise ValueError("bad row")
+        return write(session, known, result, analysis)
+    monkeypatch.setattr(processor, "_write_analysis", write_analysis)
+    
+    processor.process_unprocessed_results(limit=10)
+    
+    with database.get_session() as session:
+        processed = {row.title: row.processed for row in session.query(SearchResult)}
+    assert processed == {"GRC Analyst at Hooli": True, "GRC Analyst at Poison": False, "GRC Analyst at Umbrella": True}
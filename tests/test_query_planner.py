@@ -0,0 +1,58 @@
+"""Tests for the adaptive query planner."""
+
+from src.roleradar.models import QueryYield
+from src.roleradar.services.query_planner import QueryPlanner
+
+
+def _planner(**kwargs):
+    options = dict(budget=0, exploration_rate=0.0, low_yield_threshold=1.0, min_runs=3)
+    options.update(kwargs)
+    return QueryPlanner(**options)
+
+
+def _run(planner, query, action="run", new_urls=0):
+    decision = {"query": query, "action": action, "reason": "test", "score": None}
+    run_id = planner.start_run([decision])
+    planner.record_run(run_id, {query: {"results": new_urls, "new_urls": new_urls}})
+    return run_id
+
+
+def test_credit_lands_on_the_run_being_processed(database):
+    planner = _planner()
+    _run(planner, "grc jobs", new_urls=1)
+    
+    run_id = planner.start_run([{"query": "grc jobs", "action": "run", "reason": "test", "score": None}])
+    with database.get_session() as session:
+        QueryPlanner.credit(session, "grc jobs", new_companies=2)
+    planner.record_run(run_id, {"grc jobs": {"results": 5, "new_urls": 3}})
+    
+    with database.get_session() as session:
+        current = session.query(QueryYield).filter_by(run_id=run_id).one()
+        assert (current.results, current.new_urls, current.new_companies) == (5, 3, 2)
+        assert session.query(QueryYield).filter(QueryYield.run_id != run_id).one().new_companies == 0
+
+
+def test_skipped_runs_do_not_push_out_history(database):
+    planner = _planner(history_runs=3)
+    for _ in range(3):
+        _run(planner, "soc2 auditor", new_urls=8)
+    for _ in range(12):
+        _run(planner, "soc2 auditor", action="skip")
+    
+    history = planner._load_history(["soc2 auditor"])
+    assert len(history["soc2 auditor"]) == 3
+    assert all(row.ran for row in history["soc2 auditor"])
+    
+    decision, = planner.plan(["soc2 auditor"])
+    assert (decision["action"], decision["reason"]) == ("run", "high yield")
+
+
+def test_history_keeps_the_latest_runs_per_query(database):
+    planner = _planner(history_runs=2)
+    for new_urls in (40, 0, 0):
+        _run(planner, "ciso hiring", new_urls=new_urls)
+    _run(planner, "iso 27001 lead", new_urls=4)
+    
+    history = planner._load_history(["ciso hiring", "iso 27001 lead"])
+    assert [row.new_urls for row in history["ciso hiring"]] == [0, 0]
+    assert [row.new_urls for row in history["iso 27001 lead"]] == [4]
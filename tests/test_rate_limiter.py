@@ -0,0 +1,82 @@
+"""Tests for the token-bucket rate limiters."""
+
+import pytest
+
+from src.roleradar.services import rate_limiter
+from src.roleradar.services.rate_limiter import DualTokenBucket, TokenBucket
+
+
+class Clock:
+    """Monotonic clock the tests advance by hand."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_bursts_to_capacity_then_refills_at_rate(clock):
+    bucket = TokenBucket(rate=2.0, capacity=4.0)
+    
+    assert [bucket.try_acquire() for _ in range(4)] == [0.0] * 4
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    
+    clock.now += 0.5
+    assert bucket.try_acquire() == 0.0
+    clock.now += 60
+    assert bucket.wait_time(4) == 0.0
+    assert bucket.wait_time(5) == 0.0  # capped at capacity
+
+
+def test_consume_goes_into_debt_and_refunds(clock):
+    bucket = TokenBucket(rate=1.0, capacity=2.0)
+    
+    bucket.consume(5)
+    assert bucket.wait_time(1) == pytest.approx(4.0)
+    bucket.consume(-3)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+
+def test_zero_rate_disables_limiting(clock):
+    bucket = TokenBucket(rate=0)
+    
+    assert all(bucket.try_acquire(1000) == 0.0 for _ in range(10))
+
+
+def test_dual_bucket_needs_both_limits(clock):
+    limiter = DualTokenBucket(requests_per_minute=60, tokens_per_minute=600)
+    
+    # Ten seconds of burst: 10 requests, 100 tokens
+    assert limiter.try_acquire(100) == 0.0
+    assert limiter.try_acquire(10) == pytest.approx(1.0)
+    clock.now += 1
+    assert limiter.try_acquire(10) == 0.0
+    
+    limiter = DualTokenBucket(requests_per_minute=60, tokens_per_minute=0)
+    assert [limiter.try_acquire(10_000) for _ in range(10)] == [0.0] * 10
+    assert limiter.try_acquire(1) == pytest.approx(1.0)
+
+
+def test_settle_charges_actual_usage(clock):
+    limiter = DualTokenBucket(requests_per_minute=0, tokens_per_minute=600)
+    
+    assert limiter.try_acquire(10) == 0.0
+    limiter.settle(estimated=10, actual=100)
+    assert limiter.try_acquire(1) == pytest.approx(0.1)
+
+
+def test_pause_holds_back_every_request(clock):
+    limiter = DualTokenBucket(requests_per_minute=600, tokens_per_minute=0)
+    
+    limiter.pause(5)
+    assert limiter.try_acquire(1) == pytest.approx(5.0)
+    clock.now += 5
+    assert limiter.try_acquire(1) == 0.0
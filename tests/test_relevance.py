@@ -0,0 +1,54 @@
+"""Tests for the keyword relevance filter."""
+
+from src.roleradar.config import config
+from src.roleradar.models import SearchResult
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.relevance import RelevanceFilter, role_keywords
+from src.roleradar.services.tavily_service import TavilySearchService
+from .fakes import FakeClient, fake_groq
+
+POSTING = ("Security Engineer at Hooli. Hooli is hiring a security engineer to run SOC 2 "
+           "compliance. Apply now to join our team.")
+LISTICLE = ("Top 10 highest paying jobs of the year: a career guide with salary survey data, "
+            "interview questions and the certifications you need.")
+
+
+def test_role_keywords_include_abbreviations():
+    assert role_keywords(["Chief Information Security Officer (CISO)"]) == [
+        "CISO", "Chief Information Security Officer"
+    ]
+
+
+def test_postings_score_above_listicles():
+    relevance = RelevanceFilter(roles=["Security Engineer"], threshold=2.0)
+    
+    score, matched = relevance.score(POSTING)
+    assert score >= 2.0 and "role" in matched and "hiring" in matched
+    assert relevance.score(LISTICLE)[0] < 0
+    assert relevance.split([(1, POSTING), (2, LISTICLE)]) == ([1], {2: relevance.score(LISTICLE)[0]})
+
+
+def test_disabled_filter_keeps_everything(monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", False)
+    
+    assert RelevanceFilter().split([(1, LISTICLE)]) == ([1], {})
+
+
+def test_irrelevant_results_are_marked_skipped_without_llm_calls(database, monkeypatch):
+    monkeypatch.setattr(config, "RELEVANCE_FILTER", True)
+    tavily = TavilySearchService()
+    tavily._store_search_results("security engineer hiring", [
+        {"url": "https://example.com/jobs/hooli", "title": "Security Engineer at Hooli", "content": POSTING},
+        {"url": "https://example.com/blog/top-10", "title": "Top 10 jobs", "content": LISTICLE},
+    ])
+    client = FakeClient()
+    
+    ProcessingService(tavily=tavily, groq=fake_groq(client)).process_unprocessed_results(limit=10)
+    
+    assert not any("Top 10" in prompt for prompt in client.prompts)
+    with database.get_session() as session:
+        rows = {row.title: row for row in session.query(SearchResult)}
+        listicle = rows["Top 10 jobs"]
+        assert listicle.processed and listicle.skip_reason == "irrelevant"
+        assert listicle.relevance_score < config.RELEVANCE_THRESHOLD
+        assert rows["Security Engineer at Hooli"].skip_reason is None
@@ -0,0 +1,131 @@
+"""Tests for company scoring and rescoring."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.roleradar.models import Company, HiringSignal, Opportunity
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.scoring import FeatureTable, ScoringEngine, score_features
+from src.roleradar.services.tavily_service import TavilySearchService
+from .fakes import FakeClient, fake_groq
+
+
+def _add_company(session, name, opportunities=0, signals=()):
+    """Store a company with active opportunities and (signal_type, confidence, age in days) signals."""
+    company = Company(name=name, score=0.0)
+    session.add(company)
+    session.flush()
+    for index in range(opportunities):
+        session.add(Opportunity(company_id=company.id, title=f"Role {index}", is_active=True))
+    for signal_type, confidence, age in signals:
+        session.add(HiringSignal(
+            company_id=company.id,
+            signal_type=signal_type,
+            confidence=confidence,
+            detected_date=datetime.now(timezone.utc) - timedelta(days=age)
+        ))
+    return company.id
+
+
+@pytest.fixture
+def processor(database):
+    return ProcessingService(tavily=TavilySearchService(), groq=fake_groq(FakeClient()))
+
+
+def _scores(database):
+    with database.get_session() as session:
+        return {name: score for name, score in session.query(Company.name, Company.score)}
+
+
+def test_only_dirty_companies_are_rescored(database, processor):
+    with database.get_session() as session:
+        hooli = _add_company(session, "Hooli", opportunities=2)
+        _add_company(session, "Initech", opportunities=3)
+    
+    processor._mark_dirty([hooli])
+    
+    assert processor.rescore_dirty() == 1
+    assert _scores(database) == {"Hooli": pytest.approx(8.0), "Initech": 0.0}
+    assert processor.rescore_dirty() == 0
+
+
+def test_rescoring_all_companies_can_skip_recently_scored_ones(database, processor):
+    with database.get_session() as session:
+        _add_company(session, "Hooli", opportunities=1)
+        _add_company(session, "Initech", opportunities=1)
+    
+    assert processor.rescore_companies() == 2
+    assert processor.rescore_companies(updated_before=datetime.now(timezone.utc) - timedelta(days=1)) == 0
+
+
+def _scalar_score(groq, session, company_id):
+    """Score one company the way processing did before the feature table."""
+    since = datetime.now(timezone.utc) - timedelta(days=90)
+    active = session.query(Opportunity).filter_by(company_id=company_id, is_active=True).count()
+    recent = session.query(HiringSignal).filter_by(company_id=company_id).filter(
+        HiringSignal.detected_date > since
+    ).all()
+    return groq.score_company({
+        "active_opportunities": active,
+        "signals": [{"confidence": s.confidence, "type": s.signal_type} for s in recent],
+        "has_funding": any(s.signal_type == "funding" for s in recent),
+        "has_expansion": any(s.signal_type == "expansion" for s in recent),
+        "recent_activity": len(recent) > 0,
+    })
+
+
+def test_vectorized_scores_match_the_scalar_formula(database, processor):
+    companies = [
+        ("Hooli", 0, ()),
+        ("Initech", 2, ()),
+        ("Umbrella", 7, (("funding", 0.9, 3),)),
+        ("Globex", 1, (("expansion", 0.4, 10), ("breach", 0.7, 30))),
+        ("Stark", 0, (("funding", 0.8, 200),)),
+        ("Wayne", 5, (("compliance_news", 0.2, 89), ("funding", 0.6, 120))),
+    ]
+    with database.get_session() as session:
+        ids = [_add_company(session, *company) for company in companies]
+    
+    with database.get_session() as session:
+        features = FeatureTable.load(session)
+        expected = [_scalar_score(processor.groq, session, company_id) for company_id in ids]
+    
+    assert list(features.company_ids) == ids
+    assert list(score_features(features)) == pytest.approx(expected)
+
+
+def _engine():
+    return ScoringEngine(FeatureTable(
+        company_ids=[1, 2, 3],
+        names=["Hooli", "Initech", "Umbrella"],
+        active_opportunities=[4, 1, 0],
+        signal_count=[0, 2, 1],
+        average_confidence=[0.0, 0.9, 0.5],
+        has_funding=[False, True, False],
+        has_expansion=[False, False, False],
+        days_since_signal=[float("nan"), 5.0, 40.0],
+    ))
+
+
+def test_what_if_reranks_without_changing_the_baseline():
+    engine = _engine()
+    
+    current = engine.what_if({})
+    postings_only = engine.what_if({"hiring_signals": 0, "company_growth": 0, "recent_activity": 0,
+                                    "explicit_job_posting": 1}, limit=2)
+    
+    assert [company["name"] for company in current["companies"]] == ["Initech", "Umbrella", "Hooli"]
+    assert current["moved"] == 0
+    assert [company["name"] for company in postings_only["companies"]] == ["Hooli", "Initech"]
+    assert postings_only["companies"][0] == {
+        "id": 1, "name": "Hooli", "score": pytest.approx(40.0), "rank": 1,
+        "current_score": pytest.approx(16.0), "current_rank": 3,
+    }
+    assert postings_only["moved"] == 3
+    assert postings_only["total_companies"] == 3
+
+
+def test_what_if_rejects_unknown_weights():
+    with pytest.raises(ValueError):
+        _engine().what_if({"headcount": 1})
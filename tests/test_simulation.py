@@ -0,0 +1,80 @@
+"""Tests for the record/replay harness and simulated API clients."""
+
+import pytest
+
+from src.roleradar.config import config
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.cache import DiskCache
+from src.roleradar.services.simulation import (
+    RecordingGroqClient,
+    RecordingTavilyClient,
+    ReplayGroqClient,
+    ReplayTavilyClient,
+    SimulatedAPIError,
+    SyntheticGroqClient,
+    SyntheticTavilyClient,
+    create_api_clients,
+    create_services,
+)
+
+
+def _live_entries():
+    return {
+        namespace: DiskCache(config.CACHE_PATH, namespace=namespace, ttl_seconds=60, max_entries=100).stats()["entries"]
+        for namespace in ("tavily", "llm")
+    }
+
+
+def test_synthetic_run_leaves_the_live_cache_unchanged(database, monkeypatch):
+    monkeypatch.setattr(config, "API_MODE", "synthetic")
+    monkeypatch.setattr(config, "ANALYSIS_BACKEND", "groq")
+    monkeypatch.setattr(config, "QUERY_PLANNER", False)
+    monkeypatch.setattr(config, "GROQ_TPM", 0)
+    before = _live_entries()
+    
+    tavily, groq = create_services()
+    tavily.daily_search(queries=["security engineer hiring", "GRC analyst hiring"])
+    ProcessingService(tavily=tavily, groq=groq).process_unprocessed_results(limit=50)
+    
+    assert not tavily.cache.enabled and not groq.cache.enabled
+    assert groq.call_stats["calls"] > 0
+    assert _live_entries() == before
+
+
+def _chat(client, content, model="llama-3.1-8b-instant"):
+    messages = [{"role": "system", "content": "Return JSON."}, {"role": "user", "content": content}]
+    return client.chat.completions.create(model=model, messages=messages, temperature=0.1)
+
+
+def test_recorded_searches_replay_in_order(tmp_path):
+    path = str(tmp_path / "tavily.jsonl")
+    recorder = RecordingTavilyClient(SyntheticTavilyClient(seed=7), path)
+    recorded = [recorder.search(query="GRC analyst hiring", max_results=3) for _ in range(2)]
+    
+    replay = ReplayTavilyClient(path)
+    
+    assert recorded[0] != recorded[1]
+    assert [replay.search(query="GRC analyst hiring", max_results=3) for _ in range(3)] == recorded + recorded[:1]
+    with pytest.raises(SimulatedAPIError) as error:
+        replay.search(query="GRC analyst hiring", max_results=5)
+    assert error.value.status_code == 404
+
+
+def test_recorded_completions_replay_with_usage(tmp_path):
+    path = str(tmp_path / "groq.jsonl")
+    recorder = RecordingGroqClient(SyntheticGroqClient(), path)
+    recorded = _chat(recorder, "Extract:\nText: Security Engineer at Hooli is hiring a security engineer in Austin.")
+    
+    replayed = _chat(ReplayGroqClient(path), "Extract:\nText: Security Engineer at Hooli is hiring a security engineer in Austin.")
+    
+    assert replayed.choices[0].message.content == recorded.choices[0].message.content
+    assert replayed.usage.prompt_tokens == recorded.usage.prompt_tokens
+    with pytest.raises(SimulatedAPIError):
+        _chat(ReplayGroqClient(path), "Extract:\nText: something never recorded")
+
+
+def test_replay_mode_falls_back_to_synthetic_answers(tmp_path):
+    tavily, groq = create_api_clients("replay", str(tmp_path), seed=1)
+    
+    assert len(tavily.search(query="CISO hiring", max_results=2)["results"]) == 2
+    assert _chat(groq, "Extract:\nText: anything").choices[0].message.content
@@ -0,0 +1,56 @@
+"""Tests for the precomputed executive summary."""
+
+import pytest
+
+from src.roleradar.models import Company, DashboardSummary
+from src.roleradar.services import ProcessingService
+from src.roleradar.services.tavily_service import TavilySearchService
+from .fakes import FakeClient, fake_groq
+
+
+@pytest.fixture
+def processor(database):
+    with database.get_session() as session:
+        session.add_all([Company(name="Hooli", score=80.0), Company(name="Initech", score=40.0)])
+    return ProcessingService(tavily=TavilySearchService(), groq=fake_groq(FakeClient()))
+
+
+def _set_score(database, name, score):
+    with database.get_session() as session:
+        session.query(Company).filter_by(name=name).update({Company.score: score})
+
+
+def test_dashboard_never_calls_the_llm(processor):
+    summary = processor.get_dashboard_summary()
+    
+    assert summary["summary_stale"] and summary["summary_version"] is None
+    assert "Found 2 companies" in summary["summary"]
+    assert processor.groq.client.prompts == []
+
+
+def test_summary_is_only_regenerated_when_top_companies_change(database, processor):
+    first = processor.refresh_summary()
+    served = processor.get_dashboard_summary()
+    
+    assert first["regenerated"] and len(processor.groq.client.prompts) == 1
+    assert served["summary"] == first["summary"] and not served["summary_stale"]
+    assert not processor.refresh_summary()["regenerated"]
+    assert len(processor.groq.client.prompts) == 1
+    
+    _set_score(database, "Initech", 90.0)
+    stale = processor.get_dashboard_summary()
+    assert stale["summary_stale"] and stale["summary_version"] == first["data_version"]
+    
+    second = processor.refresh_summary()
+    assert second["regenerated"] and second["data_version"] != first["data_version"]
+    assert not processor.get_dashboard_summary()["summary_stale"]
+    with database.get_session() as session:
+        assert session.query(DashboardSummary).count() == 1
+
+
+def test_small_score_changes_keep_the_summary_current(database, processor):
+    processor.refresh_summary()
+    _set_score(database, "Hooli", 80.01)
+    
+    assert not processor.get_dashboard_summary()["summary_stale"]
+    assert processor.refresh_summary(force=True)["regenerated"]
@@ -0,0 +1,51 @@
+"""Tests for preparing page text before analysis."""
+
+import pytest
+
+from src.roleradar.utils.text import prepare_text, strip_boilerplate
+
+
+@pytest.mark.parametrize("title", [
+    "Privacy Policy Counsel - Acme Corp",
+    "Cookie Compliance Engineer at Stripe",
+    "Copyright and Compliance Officer, Sony Music",
+    "Head of Security | Acme | Remote",
+])
+def test_title_line_is_always_kept(title):
+    assert prepare_text(f"{title}\nThe team is growing.").splitlines()[0] == title
+
+
+def test_title_stays_on_its_own_line():
+    text = prepare_text("Security Engineer at Hooli\nHooli is hiring a security engineer in Austin.")
+    
+    assert text == "Security Engineer at Hooli\nHooli is hiring a security engineer in Austin."
+
+
+def test_whole_line_boilerplate_is_removed():
+    text = strip_boilerplate(
+        "GRC Analyst at Initech\n"
+        "Home | Jobs | About | Contact\n"
+        "Accept all cookies\n"
+        "Privacy Policy\n"
+        "© 2024 Initech. All rights reserved.\n"
+        "Initech is hiring a GRC analyst.\n"
+        "Cookie Compliance Engineer roles are also open."
+    )
+    
+    assert text.splitlines() == [
+        "GRC Analyst at Initech",
+        "Initech is hiring a GRC analyst.",
+        "Cookie Compliance Engineer roles are also open.",
+    ]
+
+
+def test_repeated_sentences_are_dropped_across_lines():
+    text = prepare_text("CISO at Umbrella\nUmbrella raised a Series B. Umbrella raised a Series B!\nUmbrella raised a series B.")
+    
+    assert text == "CISO at Umbrella\nUmbrella raised a Series B."
+
+
+def test_truncation_keeps_whole_sentences():
+    text = prepare_text("Title\nOne two three. Four five six seven eight nine ten.", max_tokens=6)
+    
+    assert text == "Title\nOne two three. ..."